@@ -0,0 +1,101 @@
+from typing import Optional
+
+
+class _CountBucket:
+    def __init__(self, count: int):
+        self.count = count
+        self.keys: dict[str, None] = {}  # insertion ordered set: earlier arrivals rank first on ties
+        self.higher: Optional["_CountBucket"] = None
+        self.lower: Optional["_CountBucket"] = None
+
+
+class FrequencyChart:
+    """
+    Count per key, with keys grouped into buckets of equal count linked from the highest count to the lowest
+    (the Stream-Summary layout). Changing a count by one is O(1) and top(k) only walks the first k keys,
+    so a chart query never scans every key or the play history.
+    """
+
+    def __init__(self):
+        self.counts: dict[str, int] = {}
+        self.buckets: dict[int, _CountBucket] = {}
+        self.highest: Optional[_CountBucket] = None
+        self.lowest: Optional[_CountBucket] = None
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def get(self, key: str) -> int:
+        return self.counts.get(key, 0)
+
+    def add(self, key: str, delta: int = 1) -> None:
+        old_count = self.counts.get(key, 0)
+        new_count = old_count + delta
+        if new_count < 0:
+            raise ValueError(f"Count of {key} cannot go below zero")
+        if delta == 0:
+            return
+
+        old_bucket = self.buckets.get(old_count) if old_count else None
+        if new_count:
+            # The new bucket is found by walking from the old one, which is adjacent for +/-1 changes
+            bucket = self.buckets.get(new_count) or self._create_bucket(new_count, old_bucket or self.lowest)
+            bucket.keys[key] = None
+            self.counts[key] = new_count
+        else:
+            del self.counts[key]
+
+        if old_bucket is not None:
+            del old_bucket.keys[key]
+            if not old_bucket.keys:
+                self._unlink(old_bucket)
+
+    def top(self, k: int) -> list[tuple[str, int]]:
+        result: list[tuple[str, int]] = []
+        bucket = self.highest
+        while bucket is not None and len(result) < k:
+            for key in bucket.keys:
+                result.append((key, bucket.count))
+                if len(result) == k:
+                    break
+            bucket = bucket.lower
+        return result
+
+    def _create_bucket(self, count: int, start: Optional[_CountBucket]) -> _CountBucket:
+        bucket = self.buckets[count] = _CountBucket(count)
+        if start is None:
+            self.highest = self.lowest = bucket
+            return bucket
+
+        node = start
+        if node.count < count:
+            while node.higher is not None and node.higher.count < count:
+                node = node.higher
+            # Insert above node
+            bucket.lower, bucket.higher = node, node.higher
+        else:
+            while node.lower is not None and node.lower.count > count:
+                node = node.lower
+            # Insert below node
+            bucket.lower, bucket.higher = node.lower, node
+
+        if bucket.higher is not None:
+            bucket.higher.lower = bucket
+        else:
+            self.highest = bucket
+        if bucket.lower is not None:
+            bucket.lower.higher = bucket
+        else:
+            self.lowest = bucket
+        return bucket
+
+    def _unlink(self, bucket: _CountBucket) -> None:
+        del self.buckets[bucket.count]
+        if bucket.higher is not None:
+            bucket.higher.lower = bucket.lower
+        else:
+            self.highest = bucket.lower
+        if bucket.lower is not None:
+            bucket.lower.higher = bucket.higher
+        else:
+            self.lowest = bucket.higher
@@ -0,0 +1,49 @@
+from hashlib import blake2b
+from math import log
+
+
+class HyperLogLog:
+    """
+    Approximate distinct count in 2^precision one-byte registers
+    At the default precision that is 1 KB per sketch with about 3% standard error, however many listeners
+    """
+
+    DEFAULT_PRECISION = 10
+    HASH_BITS = 64
+
+    def __init__(self, precision: int = DEFAULT_PRECISION):
+        if not 4 <= precision <= 16:
+            raise ValueError("Precision must be between 4 and 16")
+        self.precision = precision
+        self.register_count = 1 << precision
+        self.registers = bytearray(self.register_count)
+        self.alpha = 0.7213 / (1 + 1.079 / self.register_count)
+
+    @staticmethod
+    def hash(item: str) -> int:
+        # Stable across processes, unlike the builtin hash of a str
+        return int.from_bytes(blake2b(item.encode(), digest_size=8).digest(), "big")
+
+    def add(self, item: str) -> None:
+        self.add_hash(self.hash(item))
+
+    def add_hash(self, hashed: int) -> None:
+        # The first `precision` bits pick the register, the rest give the rank (position of the first 1 bit)
+        remaining_bits = self.HASH_BITS - self.precision
+        index = hashed >> remaining_bits
+        rank = remaining_bits - (hashed & ((1 << remaining_bits) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self) -> int:
+        estimate = self.alpha * self.register_count * self.register_count / sum(2.0 ** -register for register in self.registers)
+        empty_registers = self.registers.count(0)
+        if estimate <= 2.5 * self.register_count and empty_registers:
+            # Linear counting is more accurate while many registers are still empty
+            return round(self.register_count * log(self.register_count / empty_registers))
+        return round(estimate)
+
+    def merge(self, other: "HyperLogLog") -> None:
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge sketches of different precision")
+        self.registers = bytearray(max(mine, theirs) for mine, theirs in zip(self.registers, other.registers))
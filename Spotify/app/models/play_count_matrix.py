@@ -0,0 +1,49 @@
+from math import log, sqrt
+
+
+class PlayCountMatrix:
+    """
+    Sparse user x song play-count matrix, kept both row-wise (user -> songs) and column-wise (song -> users)
+    so that a user's history and a song's listeners are both a single dict lookup.
+
+    Cells store implicit-feedback weights 1 + log(plays): repeat plays still count, but a song looped
+    a hundred times does not drown out everything else the user listened to.
+    """
+
+    def __init__(self):
+        self.play_counts: dict[tuple[str, str], int] = {}  # (user id, song id) -> plays
+        self.rows: dict[str, dict[str, float]] = {}  # user id -> {song id: weight}
+        self.columns: dict[str, dict[str, float]] = {}  # song id -> {user id: weight}
+        self.column_norms_sq: dict[str, float] = {}  # song id -> sum of squared weights
+        self.song_totals: dict[str, int] = {}  # song id -> plays by all users
+
+    @staticmethod
+    def weight(play_count: int) -> float:
+        return 1.0 + log(play_count)
+
+    def add_play(self, user_id: str, song_id: str) -> None:
+        key = (user_id, song_id)
+        play_count = self.play_counts.get(key, 0) + 1
+        self.play_counts[key] = play_count
+        self.song_totals[song_id] = self.song_totals.get(song_id, 0) + 1
+
+        old_weight = self.weight(play_count - 1) if play_count > 1 else 0.0
+        new_weight = self.weight(play_count)
+        self.rows.setdefault(user_id, {})[song_id] = new_weight
+        self.columns.setdefault(song_id, {})[user_id] = new_weight
+        self.column_norms_sq[song_id] = self.column_norms_sq.get(song_id, 0.0) - old_weight * old_weight + new_weight * new_weight
+
+    def get_row(self, user_id: str) -> dict[str, float]:
+        return self.rows.get(user_id, {})
+
+    def get_column(self, song_id: str) -> dict[str, float]:
+        return self.columns.get(song_id, {})
+
+    def get_column_norm(self, song_id: str) -> float:
+        return sqrt(self.column_norms_sq.get(song_id, 0.0))
+
+    def get_play_count(self, user_id: str, song_id: str) -> int:
+        return self.play_counts.get((user_id, song_id), 0)
+
+    def get_song_ids(self) -> list[str]:
+        return list(self.columns)
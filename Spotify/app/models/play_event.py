@@ -0,0 +1,10 @@
+class PlayEvent:
+    def __init__(self, user_id: str, song_id: str, artist_id: str, timestamp: float, listened_seconds: float):
+        self.user_id = user_id
+        self.song_id = song_id
+        self.artist_id = artist_id
+        self.timestamp = timestamp  # when the play started (epoch seconds)
+        self.listened_seconds = listened_seconds
+
+    def __repr__(self):
+        return f"PlayEvent(user='{self.user_id}', song='{self.song_id}', listened={self.listened_seconds:.1f}s)"
@@ -0,0 +1,91 @@
+from array import array
+from itertools import islice
+from threading import Lock
+from typing import Iterator
+from app.models.play_event import PlayEvent
+
+
+class _Interner:
+    # Maps string ids to dense ints so the event columns can be typed arrays
+    def __init__(self):
+        self.ids: list[str] = []
+        self.indexes: dict[str, int] = {}
+
+    def intern(self, id: str) -> int:
+        index = self.indexes.get(id)
+        if index is None:
+            index = self.indexes[id] = len(self.ids)
+            self.ids.append(id)
+        return index
+
+
+class PlayEventRingBuffer:
+    """
+    Fixed-capacity columnar log of the most recent play events
+    Every field is a column in a typed array (24 bytes per event in total) instead of one Python object
+    per event; user, song and artist ids are interned to ints. Once full, the oldest event is overwritten.
+    """
+
+    DEFAULT_CAPACITY = 1_000_000
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        if capacity <= 0:
+            raise ValueError("Capacity must be positive")
+        self.capacity = capacity
+        self.lock = Lock()
+        self.user_indexes = array("I", [0]) * capacity
+        self.song_indexes = array("I", [0]) * capacity
+        self.artist_indexes = array("I", [0]) * capacity
+        self.timestamps = array("d", [0.0]) * capacity
+        self.listened_seconds = array("f", [0.0]) * capacity
+        self.users = _Interner()
+        self.songs = _Interner()
+        self.artists = _Interner()
+        self.next_position = 0
+        self.size = 0
+        self.total_appended = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(self, event: PlayEvent) -> None:
+        with self.lock:
+            position = self.next_position
+            self.user_indexes[position] = self.users.intern(event.user_id)
+            self.song_indexes[position] = self.songs.intern(event.song_id)
+            self.artist_indexes[position] = self.artists.intern(event.artist_id)
+            self.timestamps[position] = event.timestamp
+            self.listened_seconds[position] = event.listened_seconds
+            self.next_position = (position + 1) % self.capacity
+            self.size = min(self.size + 1, self.capacity)
+            self.total_appended += 1
+
+    def get_total_appended(self) -> int:
+        return self.total_appended
+
+    def recent(self, count: int) -> list[PlayEvent]:
+        """The newest `count` events, newest first"""
+        with self.lock:
+            return list(islice(self._newest_first(), count))
+
+    def since(self, timestamp: float) -> list[PlayEvent]:
+        """Events that started at or after `timestamp`, most recently appended first"""
+        # Events are appended when a play ends but carry its start time, so a long play can sit after shorter,
+        # later ones: the whole window is checked, and only matching events are built
+        with self.lock:
+            timestamps = self.timestamps
+            positions = ((self.next_position - offset) % self.capacity for offset in range(1, self.size + 1))
+            return [self._event_at(position) for position in positions if timestamps[position] >= timestamp]
+
+    def _newest_first(self) -> Iterator[PlayEvent]:
+        for offset in range(1, self.size + 1):
+            yield self._event_at((self.next_position - offset) % self.capacity)
+
+    def _event_at(self, position: int) -> PlayEvent:
+        return PlayEvent(
+            self.users.ids[self.user_indexes[position]],
+            self.songs.ids[self.song_indexes[position]],
+            self.artists.ids[self.artist_indexes[position]],
+            self.timestamps[position],
+            self.listened_seconds[position],
+        )
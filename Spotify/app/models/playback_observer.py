@@ -0,0 +1,15 @@
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from app.models.user import User
+    from app.models.playable import Song
+
+
+class PlaybackObserver:
+    # Default implementation ignores plays, concrete observers override what they need
+    def on_song_played(self, user: "User", song: "Song"):
+        pass
+
+    # Called once the play ends (next song, stop, new queue or end of session)
+    def on_play_finished(self, user: "User", song: "Song", started_at: float, listened_seconds: float):
+        pass
@@ -1,13 +1,14 @@
 from abc import ABC, abstractmethod
 from app.models.enums import UserSubscription
-import time
 from app.models.playable import Song
 from app.models.player import Player
+from app.services.ad_scheduler import AdScheduler
 
 
 class PlaybackStrategy(ABC):
     @abstractmethod
-    def play(self, song: Song, player: Player):
+    def play(self, song: Song, player: Player) -> bool:
+        """Returns True if the song starts now, False if it starts when an ad break ends"""
         raise NotImplementedError("Subclasses must implement play method")
 
     @staticmethod
@@ -21,20 +22,31 @@ class PlaybackStrategy(ABC):
 
 
 class FreePlaybackStrategy(PlaybackStrategy):
+    AD_FREQUENCY = 3  # an ad break before every third song
+    AD_DURATION_SECONDS = 1.0
+
     def __init__(self, song_played: int = 0):
         self.song_played = song_played
 
-    def play(self, song: Song, player: Player):
+    def play(self, song: Song, player: Player) -> bool:
         print("Playing with free strategy")
+        # A song asked for during an ad waits for it, replacing any song already waiting
+        if player.play_after_ad_break(song):
+            print(f"Ad in progress, {song.title} starts when it ends")
+            return False
         self.song_played += 1
-        if self.song_played % 3 == 0:
-            # show ad for 1 sec, Simulating by time.sleep
-            print("Showing ad for 1 sec. For ad-free try considering premium plan")
-            time.sleep(1)
+        if self.song_played % self.AD_FREQUENCY == 0:
+            # The ad break is ended by the scheduler thread, the caller is never blocked
+            print(f"Showing ad for {self.AD_DURATION_SECONDS:g} sec. For ad-free try considering premium plan")
+            generation = player.start_ad_break(song)
+            AdScheduler.get_instance().schedule(self.AD_DURATION_SECONDS, lambda: player.end_ad_break(generation))
+            return False
         player.set_current_song(song)
+        return True
 
 
 class PremiumPlaybackStrategy(PlaybackStrategy):
-    def play(self, song: Song, player: Player):
+    def play(self, song: Song, player: Player) -> bool:
         print("Playing with premium strategy")
         player.set_current_song(song)
+        return True
@@ -1,6 +1,9 @@
 from app.models.player_states import PlayerState, StoppedState
 from app.models.enums import PlayerStatus
 from app.models.playable import Song
+from app.models.playback_observer import PlaybackObserver
+from threading import Lock
+from time import monotonic, time
 from typing import Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -9,17 +12,36 @@ if TYPE_CHECKING:
 
 
 class Player:
-    def __init__(self):
+    def __init__(self, user: Optional["User"] = None, observers: Optional[list[PlaybackObserver]] = None):
         self.state = StoppedState()
         self.status = PlayerStatus.STOPPED
         self.queue: list[Song] = []
+        self.queue_positions: dict[str, int] = {}  # song id -> first position in queue
         self.current_song: Optional[Song] = None
         self.current_index: int = -1
-        self.current_user: Optional["User"] = None
+        self.current_user: Optional["User"] = user
+        self.ad_break_active = False
+        # Bumped by every ad break, so the timer of an earlier break cannot end a later one
+        self.ad_break_generation = 0
+        self.song_after_ad_break: Optional[Song] = None
+        self.ad_break_lock = Lock()
+        # Shared with the other sessions, so a player costs no extra list
+        self.observers: list[PlaybackObserver] = observers if observers is not None else []
+        # The play in progress: listened time excludes pauses and is reported when the play ends
+        self.playing_song: Optional[Song] = None
+        self.play_started_at: float = 0.0
+        self.listened_seconds: float = 0.0
+        self.segment_started_at: Optional[float] = None
 
     def load(self, user: "User", playable: "Playable"):
+        # A break started for the old queue must not start a song in the new one
+        self.cancel_ad_break()
+        self.finish_current_play()
         self.current_user = user
         self.queue = playable.get_tracks()
+        self.queue_positions = {}
+        for index, song in enumerate(self.queue):
+            self.queue_positions.setdefault(song.id, index)
         self.current_song = None
         self.current_index = -1
         self.status = PlayerStatus.STOPPED
@@ -29,20 +51,70 @@ class Player:
         self.state = state
 
     def set_status(self, status: PlayerStatus):
+        if self.playing_song is not None:
+            if status == PlayerStatus.PLAYING and self.segment_started_at is None:
+                self.segment_started_at = monotonic()
+            elif status != PlayerStatus.PLAYING and self.segment_started_at is not None:
+                self.listened_seconds += monotonic() - self.segment_started_at
+                self.segment_started_at = None
         self.status = status
+        if status != PlayerStatus.PLAYING:
+            # Pausing or stopping during an ad drops the song waiting for it
+            self.cancel_ad_break()
+        if status == PlayerStatus.STOPPED:
+            self.finish_current_play()
 
     def set_current_song(self, song: Song):
-        for i, s in enumerate(self.queue):
-            if s.id == song.id:
-                self.current_index = i
-                break
-
-        if self.current_index == -1:
+        index = self.queue_positions.get(song.id)
+        if index is None:
             print(f"Song :{song.title} doesn't exist in current queue.")
             return
 
+        self.current_index = index
         self.current_song = song
 
+    def start_ad_break(self, song: Song) -> int:
+        """Starts an ad break after which `song` plays; returns the generation to pass to end_ad_break"""
+        with self.ad_break_lock:
+            self.ad_break_generation += 1
+            self.ad_break_active = True
+            self.song_after_ad_break = song
+            return self.ad_break_generation
+
+    def play_after_ad_break(self, song: Song) -> bool:
+        """Makes `song` the one to play once the running ad break ends; False if no ad break is running"""
+        with self.ad_break_lock:
+            if not self.ad_break_active:
+                return False
+            self.song_after_ad_break = song
+            return True
+
+    def cancel_ad_break(self):
+        with self.ad_break_lock:
+            if self.ad_break_active:
+                self.ad_break_generation += 1
+                self.ad_break_active = False
+                self.song_after_ad_break = None
+
+    def end_ad_break(self, generation: int):
+        # Called from the ad scheduler thread once the ad has finished
+        with self.ad_break_lock:
+            if generation != self.ad_break_generation or not self.ad_break_active:
+                return
+            self.ad_break_active = False
+            song, self.song_after_ad_break = self.song_after_ad_break, None
+            # Only start the song if the player still means to play it from this queue
+            index = self.queue_positions.get(song.id) if song is not None else None
+            if index is None or self.status != PlayerStatus.PLAYING:
+                return
+            self.current_index = index
+            self.current_song = song
+        print(f"Ad finished, playing: {song.title}")
+        self.start_play(song)
+
+    def is_in_ad_break(self) -> bool:
+        return self.ad_break_active
+
     def click_play(self):
         self.state.play(self)
 
@@ -78,7 +150,28 @@ class Player:
         print(f"Playing song at index: {self.current_index+1}")
         # Play the current song in the queue
         if self.current_song:
-            self.current_user.get_playback_strategy().play(self.current_song, self)
-            print(f"Playing song: {self.current_song.title} by artist: {self.current_song.artist.name}")
+            # During an ad break the song starts when the ad ends
+            if self.current_user.get_playback_strategy().play(self.current_song, self):
+                print(f"Playing song: {self.current_song.title} by artist: {self.current_song.artist.name}")
+                self.start_play(self.current_song)
         else:
             print("No song is currently loaded.")
+
+    def start_play(self, song: Song):
+        self.finish_current_play()
+        self.playing_song = song
+        self.play_started_at = time()
+        self.listened_seconds = 0.0
+        self.segment_started_at = monotonic()
+        for observer in self.observers:
+            observer.on_song_played(self.current_user, song)
+
+    def finish_current_play(self):
+        # Reports the play in progress (if any) with how long it was actually listened to
+        if self.playing_song is None:
+            return
+        if self.segment_started_at is not None:
+            self.listened_seconds += monotonic() - self.segment_started_at
+        song, self.playing_song, self.segment_started_at = self.playing_song, None, None
+        for observer in self.observers:
+            observer.on_play_finished(self.current_user, song, self.play_started_at, self.listened_seconds)
@@ -1,18 +1,210 @@
 from abc import ABC, abstractmethod
+from heapq import nlargest
+from itertools import islice
+from itertools import chain
+from threading import Lock, Thread
+from time import monotonic
+from typing import Collection, Optional, TYPE_CHECKING
 from app.models.playable import Song
+from app.models.play_count_matrix import PlayCountMatrix
+
+if TYPE_CHECKING:
+    from app.models.user import User
 
 
 class RecommendationStrategy(ABC):
+    DEFAULT_COUNT = 3
+
     @abstractmethod
-    def recommend(self, all_songs: list[Song]) -> list[Song]:
+    def recommend(self, all_songs: Collection[Song], user: Optional["User"] = None, count: int = DEFAULT_COUNT) -> list[Song]:
         raise NotImplementedError("Subclasses must implement recommend method")
 
+    # Stateless strategies ignore plays and removals and have nothing to precompute
+    def record_play(self, user: "User", song: Song):
+        pass
+
+    def remove_song(self, song: Song):
+        pass
+
+    def refresh(self):
+        pass
+
 
 class GenreBasedRecommendationStrategy(RecommendationStrategy):
-    def recommend(self, all_songs: list[Song]) -> list[Song]:
+    """
+    Content-based: songs of the genres the user plays most, that they have not played yet
+    Users without plays get songs of the catalog's first genre.
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.genre_plays: dict[str, dict] = {}  # user id -> {genre: plays}
+        self.played: dict[str, set[str]] = {}  # user id -> song ids
+
+    def record_play(self, user: "User", song: Song):
+        with self.lock:
+            genre_plays = self.genre_plays.setdefault(user.id, {})
+            genre_plays[song.genre] = genre_plays.get(song.genre, 0) + 1
+            self.played.setdefault(user.id, set()).add(song.id)
+
+    def recommend(self, all_songs: Collection[Song], user: Optional["User"] = None, count: int = RecommendationStrategy.DEFAULT_COUNT) -> list[Song]:
         print("Generating genre-based recommendations...")
-        # For simplicity, let's just return all songs in the same genre
-        genre = all_songs[0].genre if all_songs else None
-        return [song for song in all_songs if song.genre == genre][
-            :3
-        ]  # Return top 3 songs
+        with self.lock:
+            genre_plays = dict(self.genre_plays.get(user.id, {})) if user else {}
+            played = set(self.played.get(user.id, ())) if user else set()
+        if not genre_plays:
+            genre = next(iter(all_songs)).genre if all_songs else None
+            # Stop scanning as soon as enough songs are found
+            return list(islice((song for song in all_songs if song.genre == genre), count))
+
+        genres = sorted(genre_plays, key=genre_plays.get, reverse=True)
+        picks: dict = {genre: [] for genre in genres}
+        for song in all_songs:
+            genre_picks = picks.get(song.genre)
+            if genre_picks is not None and len(genre_picks) < count and song.id not in played:
+                genre_picks.append(song)
+                # The favorite genre alone fills the list: no need to scan further
+                if len(picks[genres[0]]) == count:
+                    break
+        return list(islice(chain.from_iterable(picks[genre] for genre in genres), count))
+
+
+class ItemBasedCollaborativeStrategy(RecommendationStrategy):
+    """
+    Item-item collaborative filtering over the user x song play-count matrix
+
+    - record_play updates the sparse matrix and marks the user and the song as stale: O(1)
+    - refresh is the offline job: recomputes cosine similarities of stale songs in batches, keeping the
+      NEIGHBORS most similar songs each, then precomputes the top-N list of every affected user
+    - recommend serves the precomputed list; a user who played since the last refresh gets their list
+      recomputed on first read from the neighbor lists computed so far
+    - A read starts refresh on a background thread when songs are stale and the last refresh is at least
+      REFRESH_INTERVAL_SECONDS old, so new songs get neighbors without anyone calling refresh
+    Users without plays get the most played songs, and short lists are topped up with them. Songs removed
+    from the catalog are never recommended.
+    """
+
+    NEIGHBORS = 50
+    TOP_N = 50
+    BATCH_SIZE = 500
+    REFRESH_INTERVAL_SECONDS = 60.0
+
+    def __init__(self):
+        self.lock = Lock()
+        self.matrix = PlayCountMatrix()
+        self.songs: dict[str, Song] = {}
+        self.neighbors: dict[str, dict[str, float]] = {}  # song id -> {similar song id: cosine similarity}
+        self.top_songs: dict[str, list[str]] = {}  # user id -> cached recommended song ids, best first
+        self.popular: list[str] = []
+        self.stale_songs: set[str] = set()
+        self.dirty_users: set[str] = set()
+        self.refresh_thread: Optional[Thread] = None
+        self.last_refresh = float("-inf")
+
+    def record_play(self, user: "User", song: Song):
+        with self.lock:
+            self.songs[song.id] = song
+            self.matrix.add_play(user.id, song.id)
+            self.stale_songs.add(song.id)
+            self.dirty_users.add(user.id)
+
+    def recommend(self, all_songs: Collection[Song], user: Optional["User"] = None, count: int = RecommendationStrategy.DEFAULT_COUNT) -> list[Song]:
+        with self.lock:
+            if user is None or not self.matrix.get_row(user.id):
+                song_ids = self._popular_ids()
+            else:
+                if user.id in self.dirty_users or user.id not in self.top_songs:
+                    self._update_user(user.id)
+                song_ids = self.top_songs[user.id]
+            self._schedule_refresh()
+            # Removed songs may still be in lists computed before the removal
+            return list(islice((self.songs[song_id] for song_id in song_ids if song_id in self.songs), count))
+
+    def remove_song(self, song: Song):
+        with self.lock:
+            self.songs.pop(song.id, None)
+
+    def _schedule_refresh(self):
+        # Callers hold self.lock
+        if self.refresh_thread is None and self.stale_songs and monotonic() - self.last_refresh >= self.REFRESH_INTERVAL_SECONDS:
+            self.refresh_thread = Thread(target=self._background_refresh, name="recommendation-refresh", daemon=True)
+            self.refresh_thread.start()
+
+    def _background_refresh(self):
+        try:
+            self.refresh()
+        finally:
+            with self.lock:
+                self.refresh_thread = None
+
+    def refresh(self):
+        """Offline job: stale similarities first, then the top-N lists of affected users, batch by batch"""
+        with self.lock:
+            self.last_refresh = monotonic()
+            stale_songs = list(self.stale_songs)
+            self.stale_songs.clear()
+
+        for start in range(0, len(stale_songs), self.BATCH_SIZE):
+            # The lock is released between batches so plays and reads keep flowing during a refresh
+            with self.lock:
+                for song_id in stale_songs[start : start + self.BATCH_SIZE]:
+                    self._update_neighbors(song_id)
+                    # Everyone who played this song may now get different recommendations
+                    self.dirty_users.update(self.matrix.get_column(song_id))
+
+        with self.lock:
+            dirty_users = list(self.dirty_users)
+            self.popular = nlargest(self.TOP_N, self.matrix.song_totals, key=self.matrix.song_totals.get)
+
+        for start in range(0, len(dirty_users), self.BATCH_SIZE):
+            with self.lock:
+                for user_id in dirty_users[start : start + self.BATCH_SIZE]:
+                    if user_id in self.dirty_users:
+                        self._update_user(user_id)
+
+    def rebuild(self):
+        """Recomputes every similarity from scratch, dropping drift left by incremental refreshes"""
+        with self.lock:
+            self.neighbors.clear()
+            self.stale_songs.update(self.matrix.get_song_ids())
+        self.refresh()
+
+    def _update_neighbors(self, song_id: str):
+        # Sparse column dot products: only songs that share at least one listener are touched
+        dots: dict[str, float] = {}
+        for user_id, weight in self.matrix.get_column(song_id).items():
+            for other_id, other_weight in self.matrix.get_row(user_id).items():
+                if other_id != song_id:
+                    dots[other_id] = dots.get(other_id, 0.0) + weight * other_weight
+
+        norm = self.matrix.get_column_norm(song_id)
+        similarities = {other_id: dot / (norm * self.matrix.get_column_norm(other_id)) for other_id, dot in dots.items()}
+        top = dict(nlargest(self.NEIGHBORS, similarities.items(), key=lambda item: item[1]))
+        self.neighbors[song_id] = top
+
+        # Similarity is symmetric: refresh this song's entry in its neighbors' lists too
+        for other_id, similarity in top.items():
+            other_neighbors = self.neighbors.setdefault(other_id, {})
+            other_neighbors[song_id] = similarity
+            if len(other_neighbors) > self.NEIGHBORS:
+                del other_neighbors[min(other_neighbors, key=other_neighbors.get)]
+
+    def _popular_ids(self) -> list[str]:
+        # Callers hold self.lock; before the first refresh the ranking is computed on the fly
+        return self.popular or nlargest(self.TOP_N, self.matrix.song_totals, key=self.matrix.song_totals.get)
+
+    def _update_user(self, user_id: str):
+        # Songs without neighbors yet wait for the (background) refresh; popular songs fill the gap meanwhile
+        history = self.matrix.get_row(user_id)
+        scores: dict[str, float] = {}
+        for song_id, weight in history.items():
+            for other_id, similarity in self.neighbors.get(song_id, {}).items():
+                if other_id not in history and other_id in self.songs:
+                    scores[other_id] = scores.get(other_id, 0.0) + weight * similarity
+        top = nlargest(self.TOP_N, scores, key=scores.get)
+        # Neighbors may all be songs the user already played: top up with popular songs they have not heard
+        if len(top) < self.TOP_N:
+            chosen = set(top)
+            top.extend(islice((song_id for song_id in self._popular_ids() if song_id not in history and song_id not in chosen), self.TOP_N - len(top)))
+        self.top_songs[user_id] = top
+        self.dirty_users.discard(user_id)
@@ -0,0 +1,75 @@
+from heapq import heappop, heappush
+from itertools import count
+from threading import Condition, Lock, Thread
+from time import monotonic
+from typing import Callable, Optional
+
+
+class AdScheduler:
+    """
+    Ends ad breaks on one background thread instead of sleeping on the caller's thread
+    Pending ad breaks are kept in a min-heap by due time, so 100k concurrent sessions cost
+    100k heap entries instead of 100k timer threads
+    """
+
+    _instance: Optional["AdScheduler"] = None
+    _lock: Lock = Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if hasattr(self, "heap"):
+            return
+        self.condition = Condition()
+        self.heap: list[tuple[float, int, Callable[[], None]]] = []  # (due time, sequence, callback)
+        self.sequence = count()
+        self.running_callbacks = 0
+        self.worker: Optional[Thread] = None
+
+    @classmethod
+    def get_instance(cls) -> "AdScheduler":
+        return cls()
+
+    def schedule(self, delay_seconds: float, callback: Callable[[], None]) -> None:
+        with self.condition:
+            heappush(self.heap, (monotonic() + delay_seconds, next(self.sequence), callback))
+            if self.worker is None:
+                self.worker = Thread(target=self._run, name="ad-scheduler", daemon=True)
+                self.worker.start()
+            self.condition.notify_all()
+
+    def get_pending_count(self) -> int:
+        with self.condition:
+            return len(self.heap)
+
+    def wait_until_idle(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until every scheduled ad break has ended; returns False on timeout"""
+        with self.condition:
+            return self.condition.wait_for(lambda: not self.heap and not self.running_callbacks, timeout)
+
+    def _run(self) -> None:
+        while True:
+            with self.condition:
+                while not self.heap or self.heap[0][0] > monotonic():
+                    self.condition.wait(self.heap[0][0] - monotonic() if self.heap else None)
+                # Drain everything that is due in one lock acquisition
+                now = monotonic()
+                due = []
+                while self.heap and self.heap[0][0] <= now:
+                    due.append(heappop(self.heap)[2])
+                self.running_callbacks += len(due)
+
+            for callback in due:
+                try:
+                    callback()
+                except Exception as error:
+                    print(f"Ad break callback failed: {error}")
+
+            with self.condition:
+                self.running_callbacks -= len(due)
+                self.condition.notify_all()
@@ -3,9 +3,11 @@ from app.models.artist import Artist
 from app.models.playable import Song
 from app.models.player import Player
 from app.models.recommendation_strategy import (
-    GenreBasedRecommendationStrategy,
+    ItemBasedCollaborativeStrategy,
 )
 from app.services.recommendation_service import RecommendationService
+from app.services.play_analytics_service import PlayAnalyticsService
+from app.services.player_session_manager import PlayerSessionManager
 from app.services.search_service import SearchService
 from app.services.user_service import UserService
 from threading import Lock
@@ -30,10 +32,12 @@ class MusicStreamingSystem:
             self.users: dict[str, User] = {}
             self.artists: dict[str, Artist] = {}
             self.songs: dict[str, Song] = {}
-            self.player: Player = Player()
             self.recommendation_service = RecommendationService(
-                GenreBasedRecommendationStrategy()
+                ItemBasedCollaborativeStrategy()
             )
+            self.analytics_service = PlayAnalyticsService()
+            # Plays from every session feed the recommender and the analytics pipeline
+            self.session_manager = PlayerSessionManager([self.recommendation_service, self.analytics_service])
             self.search_service = SearchService()
             self.user_service = UserService()
             self._has_initialized = True
@@ -50,6 +54,7 @@ class MusicStreamingSystem:
             return  # Song is already added
         with self.__class__._lock:
             self.songs[song.id] = song
+        self.search_service.index_song(song)
 
     def remove_song(self, song: Song):
         if song.id not in self.songs:
@@ -57,9 +62,18 @@ class MusicStreamingSystem:
             return
         with self.__class__._lock:
             del self.songs[song.id]
+        self.search_service.remove_song(song)
+        self.recommendation_service.remove_song(song)
 
-    def get_player(self) -> Player:
-        return self.player
+    # Every user gets their own player session, so users can listen concurrently
+    def get_player(self, user: User) -> Player:
+        return self.session_manager.get_or_create_session(user)
+
+    def end_player_session(self, user: User):
+        self.session_manager.end_session(user)
+
+    def get_active_session_count(self) -> int:
+        return self.session_manager.get_active_session_count()
 
     def get_all_songs(self) -> list[Song]:
         return list(self.songs.values())
@@ -70,33 +84,63 @@ class MusicStreamingSystem:
     def get_all_artists(self) -> list[Artist]:
         return list(self.artists.values())
 
-    def get_song_recommendations(self) -> list[Song]:
-        all_songs = self.get_all_songs()
-        return self.recommendation_service.recommend(all_songs)
+    # Passes a live view of the catalog instead of copying it; strategies that precompute never scan it
+    def get_song_recommendations(self, user: User | None = None, count: int = 3) -> list[Song]:
+        return self.recommendation_service.recommend(self.songs.values(), user, count)
+
+    # Offline job: recompute stale song similarities and per-user top-N lists
+    def refresh_recommendations(self):
+        self.recommendation_service.refresh()
+
+    def search_songs_by_title(self, query: str, limit: int | None = None) -> list[Song]:
+        return self.search_service.search_songs_by_title(query, limit)
+
+    def search_songs_by_artist_name(self, query: str, limit: int | None = None) -> list[Song]:
+        return self.search_service.search_songs_by_artist_name(query, limit)
+
+    def search_artists_by_name(self, query: str, limit: int | None = None) -> list[Artist]:
+        return self.search_service.search_artists_by_name(query, limit)
+
+    # Typeahead suggestions (word prefix, typo tolerant)
+    def suggest_songs(self, prefix: str, limit: int = 10) -> list[Song]:
+        return self.search_service.suggest_songs(prefix, limit)
+
+    def suggest_artists(self, prefix: str, limit: int = 10) -> list[Artist]:
+        return self.search_service.suggest_artists(prefix, limit)
+
+    # Play analytics: charts are O(K), unique listeners are HyperLogLog estimates
+    def get_top_songs(self, k: int = 10) -> list[tuple[Song, int]]:
+        return self.analytics_service.get_top_songs(k)
+
+    def get_trending_songs(self, k: int = 10) -> list[tuple[Song, int]]:
+        return self.analytics_service.get_trending_songs(k)
+
+    def get_top_artists(self, k: int = 10) -> list[tuple[Artist, int]]:
+        return self.analytics_service.get_top_artists(k)
 
-    def search_songs_by_title(self, query: str) -> list[Song]:
-        all_songs = self.get_all_songs()
-        return self.search_service.search_songs_by_title(all_songs, query)
+    def get_trending_artists(self, k: int = 10) -> list[tuple[Artist, int]]:
+        return self.analytics_service.get_trending_artists(k)
 
-    def search_songs_by_artist_name(self, query: str) -> list[Song]:
-        all_songs = self.get_all_songs()
-        return self.search_service.search_songs_by_artist_name(all_songs, query)
+    def get_song_unique_listeners(self, song: Song) -> int:
+        return self.analytics_service.get_song_unique_listeners(song)
 
-    def search_artists_by_name(self, query: str) -> list[Artist]:
-        all_artists = self.get_all_artists()
-        return self.search_service.search_artists_by_name(all_artists, query)
+    def get_artist_unique_listeners(self, artist: Artist) -> int:
+        return self.analytics_service.get_artist_unique_listeners(artist)
 
     def add_new_user(self, user: User):
         self.user_service.register_user(user)
 
     def remove_user(self, user: User):
         self.user_service.remove_user(user)
+        self.session_manager.end_session(user)
 
     def add_new_artist(self, artist: Artist):
         self.user_service.register_artist(artist)
+        self.search_service.index_artist(artist)
 
     def remove_artist(self, artist: Artist):
         self.user_service.remove_artist(artist)
+        self.search_service.remove_artist(artist)
 
     def get_user_by_id(self, id: str) -> User | None:
         return self.users.get(id)
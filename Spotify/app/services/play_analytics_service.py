@@ -0,0 +1,142 @@
+from collections import deque
+from threading import Lock
+from time import time
+from typing import Optional, TYPE_CHECKING
+from app.models.artist import Artist
+from app.models.frequency_chart import FrequencyChart
+from app.models.hyper_log_log import HyperLogLog
+from app.models.playable import Song
+from app.models.play_event import PlayEvent
+from app.models.play_event_buffer import PlayEventRingBuffer
+from app.models.playback_observer import PlaybackObserver
+
+if TYPE_CHECKING:
+    from app.models.user import User
+
+
+class _WindowBucket:
+    # Plays that started within one BUCKET_SECONDS slice of the trending window
+    def __init__(self, start: float):
+        self.start = start
+        self.song_counts: dict[str, int] = {}
+        self.artist_counts: dict[str, int] = {}
+
+
+class PlayAnalyticsService(PlaybackObserver):
+    """
+    Streaming analytics over play events, updated as each play finishes
+
+    - Every event is appended to a columnar ring buffer of recent history
+    - All-time and trending (sliding window) play counts per song and per artist are FrequencyCharts,
+      so top-K charts cost O(K). The window is a queue of per-minute buckets; an expired bucket is
+      subtracted from the trending charts instead of rescanning history
+    - Unique listeners per song and per artist are HyperLogLog sketches
+    """
+
+    TRENDING_WINDOW_SECONDS = 3600
+    BUCKET_SECONDS = 60
+
+    def __init__(self, buffer_capacity: int = PlayEventRingBuffer.DEFAULT_CAPACITY):
+        self.lock = Lock()
+        self.events = PlayEventRingBuffer(buffer_capacity)
+        self.song_plays = FrequencyChart()
+        self.artist_plays = FrequencyChart()
+        self.trending_songs = FrequencyChart()
+        self.trending_artists = FrequencyChart()
+        self.window: deque[_WindowBucket] = deque()
+        self.song_listeners: dict[str, HyperLogLog] = {}
+        self.artist_listeners: dict[str, HyperLogLog] = {}
+        self.songs: dict[str, Song] = {}
+        self.artists: dict[str, Artist] = {}
+
+    def on_play_finished(self, user: "User", song: Song, started_at: float, listened_seconds: float):
+        self.record_play(user.id, song, started_at, listened_seconds)
+
+    def record_play(self, user_id: str, song: Song, timestamp: float, listened_seconds: float) -> None:
+        artist = song.artist
+        self.events.append(PlayEvent(user_id, song.id, artist.id, timestamp, listened_seconds))
+        user_hash = HyperLogLog.hash(user_id)
+
+        with self.lock:
+            self.songs[song.id] = song
+            self.artists[artist.id] = artist
+            self.song_plays.add(song.id)
+            self.artist_plays.add(artist.id)
+            self._sketch(self.song_listeners, song.id).add_hash(user_hash)
+            self._sketch(self.artist_listeners, artist.id).add_hash(user_hash)
+
+            self._expire(max(timestamp, self.window[-1].start if self.window else timestamp))
+            bucket = self._window_bucket(timestamp)
+            if bucket is not None:
+                bucket.song_counts[song.id] = bucket.song_counts.get(song.id, 0) + 1
+                bucket.artist_counts[artist.id] = bucket.artist_counts.get(artist.id, 0) + 1
+                self.trending_songs.add(song.id)
+                self.trending_artists.add(artist.id)
+
+    @staticmethod
+    def _sketch(sketches: dict[str, HyperLogLog], key: str) -> HyperLogLog:
+        sketch = sketches.get(key)
+        if sketch is None:
+            sketch = sketches[key] = HyperLogLog()
+        return sketch
+
+    def _window_bucket(self, timestamp: float) -> Optional[_WindowBucket]:
+        start = timestamp - timestamp % self.BUCKET_SECONDS
+        if not self.window or start > self.window[-1].start:
+            self.window.append(_WindowBucket(start))
+            return self.window[-1]
+        # A late event: find its bucket from the newest end, drop it if it already left the window
+        for bucket in reversed(self.window):
+            if bucket.start == start:
+                return bucket
+            if bucket.start < start:
+                break
+        return None
+
+    def _expire(self, now: float) -> None:
+        cutoff = now - self.TRENDING_WINDOW_SECONDS
+        while self.window and self.window[0].start + self.BUCKET_SECONDS <= cutoff:
+            bucket = self.window.popleft()
+            for song_id, count in bucket.song_counts.items():
+                self.trending_songs.add(song_id, -count)
+            for artist_id, count in bucket.artist_counts.items():
+                self.trending_artists.add(artist_id, -count)
+
+    # Charts: O(K)
+    def get_top_songs(self, k: int = 10) -> list[tuple[Song, int]]:
+        with self.lock:
+            return [(self.songs[song_id], count) for song_id, count in self.song_plays.top(k)]
+
+    def get_top_artists(self, k: int = 10) -> list[tuple[Artist, int]]:
+        with self.lock:
+            return [(self.artists[artist_id], count) for artist_id, count in self.artist_plays.top(k)]
+
+    def get_trending_songs(self, k: int = 10, now: Optional[float] = None) -> list[tuple[Song, int]]:
+        with self.lock:
+            self._expire(time() if now is None else now)
+            return [(self.songs[song_id], count) for song_id, count in self.trending_songs.top(k)]
+
+    def get_trending_artists(self, k: int = 10, now: Optional[float] = None) -> list[tuple[Artist, int]]:
+        with self.lock:
+            self._expire(time() if now is None else now)
+            return [(self.artists[artist_id], count) for artist_id, count in self.trending_artists.top(k)]
+
+    # Counters
+    def get_song_play_count(self, song: Song) -> int:
+        return self.song_plays.get(song.id)
+
+    def get_artist_play_count(self, artist: Artist) -> int:
+        return self.artist_plays.get(artist.id)
+
+    def get_song_unique_listeners(self, song: Song) -> int:
+        with self.lock:
+            sketch = self.song_listeners.get(song.id)
+            return sketch.count() if sketch else 0
+
+    def get_artist_unique_listeners(self, artist: Artist) -> int:
+        with self.lock:
+            sketch = self.artist_listeners.get(artist.id)
+            return sketch.count() if sketch else 0
+
+    def get_recent_events(self, count: int = 10) -> list[PlayEvent]:
+        return self.events.recent(count)
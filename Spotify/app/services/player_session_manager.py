@@ -0,0 +1,42 @@
+from app.models.player import Player
+from app.models.playback_observer import PlaybackObserver
+from threading import Lock
+from typing import Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from app.models.user import User
+
+
+class PlayerSessionManager:
+    """Keeps one Player per active user, so any number of listeners can play at the same time"""
+
+    def __init__(self, observers: Optional[list[PlaybackObserver]] = None):
+        self.sessions: dict[str, Player] = {}  # user id -> player
+        self.lock = Lock()
+        self.observers: list[PlaybackObserver] = observers if observers is not None else []
+
+    def add_observer(self, observer: PlaybackObserver) -> None:
+        # Every session shares this list, so existing players see the new observer too
+        self.observers.append(observer)
+
+    def get_or_create_session(self, user: "User") -> Player:
+        player = self.sessions.get(user.id)
+        if player is None:
+            with self.lock:
+                player = self.sessions.get(user.id)
+                if player is None:
+                    player = self.sessions[user.id] = Player(user, self.observers)
+        return player
+
+    def get_session(self, user: "User") -> Optional[Player]:
+        return self.sessions.get(user.id)
+
+    def end_session(self, user: "User") -> None:
+        with self.lock:
+            # A pending ad break of an ended session only touches the dropped player, so nothing to cancel
+            player = self.sessions.pop(user.id, None)
+        if player is not None:
+            player.finish_current_play()
+
+    def get_active_session_count(self) -> int:
+        return len(self.sessions)
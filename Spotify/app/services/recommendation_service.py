@@ -1,10 +1,28 @@
+from typing import Collection, Optional, TYPE_CHECKING
 from app.models.recommendation_strategy import RecommendationStrategy
 from app.models.playable import Song
+from app.models.playback_observer import PlaybackObserver
 
+if TYPE_CHECKING:
+    from app.models.user import User
 
-class RecommendationService:
+
+class RecommendationService(PlaybackObserver):
     def __init__(self, strategy: RecommendationStrategy):
         self.strategy = strategy
 
-    def recommend(self, all_songs: list[Song]) -> list[Song]:
-        return self.strategy.recommend(all_songs)
+    def set_strategy(self, strategy: RecommendationStrategy):
+        self.strategy = strategy
+
+    def recommend(self, all_songs: Collection[Song], user: Optional["User"] = None, count: int = RecommendationStrategy.DEFAULT_COUNT) -> list[Song]:
+        return self.strategy.recommend(all_songs, user, count)
+
+    # Every play from any player session streams into the strategy
+    def on_song_played(self, user: "User", song: Song):
+        self.strategy.record_play(user, song)
+
+    def remove_song(self, song: Song):
+        self.strategy.remove_song(song)
+
+    def refresh(self):
+        self.strategy.refresh()
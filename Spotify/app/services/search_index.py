@@ -0,0 +1,187 @@
+from bisect import insort
+from heapq import nsmallest
+from threading import Lock
+from typing import Callable, Generic, Iterable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class NGramSearchIndex(Generic[T]):
+    """
+    Incrementally maintained inverted indexes over one text field of the indexed items.
+
+    - 1/2/3-gram postings answer substring queries: intersect the postings of the query's trigrams
+      (rarest first) and only verify the survivors
+    - Word-prefix postings answer typeahead queries. Each prefix keeps a small cache of its best ranked
+      completions, updated on add and invalidated on remove, so a suggestion is a dict lookup
+    - Typos are handled by looking up the one-edit variants of the typed prefix in the same prefix postings
+    """
+
+    MAX_GRAM_SIZE = 3
+    MAX_PREFIX_LENGTH = 12
+    COMPLETION_CACHE_SIZE = 32
+
+    def __init__(self, text_of: Callable[[T], str]):
+        self.text_of = text_of
+        self.lock = Lock()
+        self.gram_postings: dict[str, set[int]] = {}
+        self.prefix_postings: dict[str, set[int]] = {}
+        self.completions: dict[str, list[tuple]] = {}  # prefix -> sorted [(rank, doc id)], at most COMPLETION_CACHE_SIZE
+        self.documents: dict[int, tuple[T, str, tuple[str, ...]]] = {}  # doc id -> (item, normalized text, words)
+        self.doc_ids: dict[str, int] = {}  # item id -> doc id
+        self.alphabet: set[str] = set()
+        self.next_doc_id = 0
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return " ".join(text.casefold().split())
+
+    @staticmethod
+    def _grams(text: str, size: int) -> set[str]:
+        return {text[i : i + size] for i in range(len(text) - size + 1)}
+
+    def _all_grams(self, text: str) -> set[str]:
+        grams: set[str] = set()
+        for size in range(1, self.MAX_GRAM_SIZE + 1):
+            grams |= self._grams(text, size)
+        return grams
+
+    def _word_prefixes(self, words: tuple[str, ...]) -> set[str]:
+        return {word[:length] for word in words for length in range(1, min(len(word), self.MAX_PREFIX_LENGTH) + 1)}
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def add(self, item: T) -> None:
+        text = self.normalize(self.text_of(item))
+        words = tuple(text.split())
+        with self.lock:
+            self._remove(item.id)
+            doc_id = self.next_doc_id
+            self.next_doc_id += 1
+            self.doc_ids[item.id] = doc_id
+            self.documents[doc_id] = (item, text, words)
+            self.alphabet.update(text.replace(" ", ""))
+            for gram in self._all_grams(text):
+                self.gram_postings.setdefault(gram, set()).add(doc_id)
+            for prefix in self._word_prefixes(words):
+                self.prefix_postings.setdefault(prefix, set()).add(doc_id)
+                cached = self.completions.get(prefix)
+                if cached is not None:
+                    entry = (self._prefix_rank(doc_id, prefix), doc_id)
+                    # A full cache only holds the best entries, so a worse newcomer can be ignored
+                    if len(cached) < self.COMPLETION_CACHE_SIZE or entry < cached[-1]:
+                        insort(cached, entry)
+                        del cached[self.COMPLETION_CACHE_SIZE :]
+
+    def add_all(self, items: Iterable[T]) -> None:
+        for item in items:
+            self.add(item)
+
+    def remove(self, item: T) -> None:
+        with self.lock:
+            self._remove(item.id)
+
+    def _remove(self, item_id: str) -> None:
+        doc_id = self.doc_ids.pop(item_id, None)
+        if doc_id is None:
+            return
+        _, text, words = self.documents.pop(doc_id)
+        for gram in self._all_grams(text):
+            self._discard(self.gram_postings, gram, doc_id)
+        for prefix in self._word_prefixes(words):
+            self._discard(self.prefix_postings, prefix, doc_id)
+            # Rebuilt lazily on the next query for this prefix
+            self.completions.pop(prefix, None)
+
+    @staticmethod
+    def _discard(postings: dict[str, set[int]], key: str, doc_id: int) -> None:
+        posting = postings.get(key)
+        if posting is not None:
+            posting.discard(doc_id)
+            if not posting:
+                del postings[key]
+
+    def search(self, query: str, limit: Optional[int] = None) -> list[T]:
+        """Ranked substring search: text prefix first, then word prefix, then anywhere; shorter texts first"""
+        query = self.normalize(query)
+        if not query:
+            return []
+        with self.lock:
+            matches = [(self._substring_rank(doc_id, query), doc_id) for doc_id in self._substring_matches(query)]
+            ranked = nsmallest(limit, matches) if limit is not None else sorted(matches)
+            return [self.documents[doc_id][0] for _, doc_id in ranked]
+
+    def suggest(self, prefix: str, limit: int = 10, max_typos: Optional[int] = None) -> list[T]:
+        """Typeahead: items with a word starting with the prefix; one-edit variants fill up the remaining slots"""
+        prefix = self.normalize(prefix)
+        if not prefix:
+            return []
+        if max_typos is None:
+            max_typos = 0 if len(prefix) < 4 else 1
+
+        with self.lock:
+            ranked = self._top_completions(prefix, limit)
+            if len(ranked) < limit and max_typos > 0:
+                seen = {doc_id for _, doc_id in ranked}
+                fuzzy: list[tuple] = []
+                for variant in self._one_edit_variants(prefix):
+                    for rank, doc_id in self._top_completions(variant, limit):
+                        if doc_id not in seen:
+                            seen.add(doc_id)
+                            fuzzy.append((rank, doc_id))
+                ranked.extend(nsmallest(limit - len(ranked), fuzzy))
+            return [self.documents[doc_id][0] for _, doc_id in ranked]
+
+    def _top_completions(self, prefix: str, limit: int) -> list[tuple]:
+        # A multi-word prefix is looked up by its longest word, the most selective posting
+        key = max(prefix.split(" "), key=len)[: self.MAX_PREFIX_LENGTH]
+        posting = self.prefix_postings.get(key)
+        if not posting:
+            return []
+        if key != prefix:
+            # Long or multi-word prefixes are rare and their posting is already small: verify directly
+            matches = [(self._prefix_rank(doc_id, prefix), doc_id) for doc_id in posting]
+            return nsmallest(limit, [match for match in matches if match[0] is not None])
+        if limit > self.COMPLETION_CACHE_SIZE:
+            return nsmallest(limit, ((self._prefix_rank(doc_id, key), doc_id) for doc_id in posting))
+        cached = self.completions.get(key)
+        if cached is None:
+            cached = self.completions[key] = nsmallest(self.COMPLETION_CACHE_SIZE, ((self._prefix_rank(doc_id, key), doc_id) for doc_id in posting))
+        return cached[:limit]
+
+    def _one_edit_variants(self, prefix: str) -> set[str]:
+        # Deletions, transpositions, substitutions and insertions over the characters seen in the index
+        splits = [(prefix[:i], prefix[i:]) for i in range(len(prefix) + 1)]
+        deletes = {left + right[1:] for left, right in splits if right}
+        transposes = {left + right[1] + right[0] + right[2:] for left, right in splits if len(right) > 1}
+        replaces = {left + char + right[1:] for left, right in splits if right for char in self.alphabet}
+        inserts = {left + char + right for left, right in splits for char in self.alphabet}
+        return {variant for variant in deletes | transposes | replaces | inserts if variant and variant != prefix}
+
+    def _substring_matches(self, query: str) -> Iterable[int]:
+        if len(query) <= self.MAX_GRAM_SIZE:
+            # The query is itself an indexed gram, so its posting list is the exact answer
+            return self.gram_postings.get(query, ())
+        postings = sorted((self.gram_postings.get(gram, set()) for gram in self._grams(query, self.MAX_GRAM_SIZE)), key=len)
+        if not postings[0]:
+            return ()
+        # Trigram co-occurrence does not imply adjacency, so verify the survivors
+        return [doc_id for doc_id in set.intersection(*postings) if query in self.documents[doc_id][1]]
+
+    def _substring_rank(self, doc_id: int, query: str) -> tuple:
+        _, text, _ = self.documents[doc_id]
+        if text.startswith(query):
+            return (0, len(text), text)
+        if (" " + query) in text:
+            return (1, len(text), text)
+        return (2, len(text), text)
+
+    def _prefix_rank(self, doc_id: int, prefix: str) -> Optional[tuple]:
+        # Matching from the first word beats matching a later one; shorter texts rank higher
+        _, text, _ = self.documents[doc_id]
+        if text.startswith(prefix):
+            return (0, len(text), text)
+        if (" " + prefix) in text:
+            return (1, len(text), text)
+        return None
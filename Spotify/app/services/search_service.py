@@ -1,20 +1,42 @@
+from typing import Optional
 from app.models.playable import Song
 from app.models.artist import Artist
+from app.services.search_index import NGramSearchIndex
 
 
 class SearchService:
-    @staticmethod
-    def search_songs_by_title(songs: list[Song], query_title: str) -> list[Song]:
-        return [song for song in songs if query_title.lower() in song.title.lower()]
-
-    @staticmethod
-    def search_songs_by_artist_name(songs: list[Song], query_name: str) -> list[Song]:
-        return [
-            song for song in songs if query_name.lower() in song.artist.name.lower()
-        ]
-
-    @staticmethod
-    def search_artists_by_name(artists: list[Artist], query_name: str) -> list[Artist]:
-        return [
-            artist for artist in artists if query_name.lower() in artist.name.lower()
-        ]
+    # Indexes are maintained incrementally by MusicStreamingSystem (add/remove song and artist)
+    # so queries never scan or copy the catalog
+    def __init__(self):
+        self.song_title_index: NGramSearchIndex[Song] = NGramSearchIndex(lambda song: song.title)
+        self.song_artist_index: NGramSearchIndex[Song] = NGramSearchIndex(lambda song: song.artist.name)
+        self.artist_name_index: NGramSearchIndex[Artist] = NGramSearchIndex(lambda artist: artist.name)
+
+    def index_song(self, song: Song):
+        self.song_title_index.add(song)
+        self.song_artist_index.add(song)
+
+    def remove_song(self, song: Song):
+        self.song_title_index.remove(song)
+        self.song_artist_index.remove(song)
+
+    def index_artist(self, artist: Artist):
+        self.artist_name_index.add(artist)
+
+    def remove_artist(self, artist: Artist):
+        self.artist_name_index.remove(artist)
+
+    def search_songs_by_title(self, query_title: str, limit: Optional[int] = None) -> list[Song]:
+        return self.song_title_index.search(query_title, limit)
+
+    def search_songs_by_artist_name(self, query_name: str, limit: Optional[int] = None) -> list[Song]:
+        return self.song_artist_index.search(query_name, limit)
+
+    def search_artists_by_name(self, query_name: str, limit: Optional[int] = None) -> list[Artist]:
+        return self.artist_name_index.search(query_name, limit)
+
+    def suggest_songs(self, prefix: str, limit: int = 10) -> list[Song]:
+        return self.song_title_index.suggest(prefix, limit)
+
+    def suggest_artists(self, prefix: str, limit: int = 10) -> list[Artist]:
+        return self.artist_name_index.suggest(prefix, limit)
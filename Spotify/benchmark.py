@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Music Streaming System Benchmarks
+
+Usage: python benchmark.py [search|sessions|recommend|analytics] [song_count|session_count|play_count|event_count]
+"""
+
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from app.models.artist import Artist
+from app.models.enums import SongGenre, SongTheme, UserSubscription
+from app.models.playable import Playlist, Song
+from app.models.playback_strategy import FreePlaybackStrategy
+from app.models.player import Player
+from app.models.recommendation_strategy import ItemBasedCollaborativeStrategy
+from app.models.user import User, UserBuilder
+from app.services.ad_scheduler import AdScheduler
+from app.services.play_analytics_service import PlayAnalyticsService
+from app.services.player_session_manager import PlayerSessionManager
+from app.services.search_service import SearchService
+
+
+class MusicBenchmark:
+    SONG_COUNT = 1_000_000
+    ARTIST_COUNT = 50_000
+    VOCABULARY_SIZE = 20_000
+    QUERIES = 2_000
+    SESSION_COUNT = 100_000
+    SESSION_WORKERS = 32
+    PLAYS_PER_SESSION = 4
+    LONG_QUEUE_SIZE = 10_000
+    RECOMMEND_USERS = 20_000
+    RECOMMEND_SONGS = 5_000
+    PLAY_COUNT = 300_000
+    TASTE_CLUSTERS = 50
+    STREAMED_PLAYS = 10_000
+    EVENT_COUNT = 1_000_000
+    ANALYTICS_SONGS = 100_000
+    ANALYTICS_LISTENERS = 200_000
+    EVENTS_PER_SECOND = 100
+    SYLLABLES = ["ka", "ri", "mo", "le", "ta", "su", "na", "ve", "ro", "di", "pa", "ne", "lo", "ga", "hi", "yu", "ze", "ba"]
+
+    @staticmethod
+    def main():
+        section = sys.argv[1] if len(sys.argv) > 1 else "search"
+        count = int(sys.argv[2]) if len(sys.argv) > 2 else None
+
+        print("=" * 60)
+        print("MUSIC STREAMING SYSTEM BENCHMARK")
+        print("=" * 60)
+
+        if section == "search":
+            MusicBenchmark.benchmark_search(count or MusicBenchmark.SONG_COUNT)
+        elif section == "sessions":
+            MusicBenchmark.benchmark_sessions(count or MusicBenchmark.SESSION_COUNT)
+        elif section == "recommend":
+            MusicBenchmark.benchmark_recommendations(count or MusicBenchmark.PLAY_COUNT)
+        elif section == "analytics":
+            MusicBenchmark.benchmark_analytics(count or MusicBenchmark.EVENT_COUNT)
+
+    @staticmethod
+    def random_word(rng: random.Random) -> str:
+        return "".join(rng.choice(MusicBenchmark.SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+    @staticmethod
+    def build_catalog(song_count: int, rng: random.Random) -> list[Song]:
+        vocabulary = [MusicBenchmark.random_word(rng) for _ in range(MusicBenchmark.VOCABULARY_SIZE)]
+        artists = [Artist(id=f"artist{i}", name=f"{rng.choice(vocabulary).title()} {rng.choice(vocabulary).title()}") for i in range(MusicBenchmark.ARTIST_COUNT)]
+        return [
+            Song(
+                id=f"song{i}",
+                title=" ".join(rng.choice(vocabulary) for _ in range(rng.randint(1, 4))).title(),
+                duration=rng.randint(120, 420),
+                artist=rng.choice(artists),
+                genre=rng.choice(list(SongGenre)),
+                theme=rng.choice(list(SongTheme)),
+            )
+            for i in range(song_count)
+        ]
+
+    @staticmethod
+    def benchmark_search(song_count: int):
+        rng = random.Random(7)
+        songs = MusicBenchmark.build_catalog(song_count, rng)
+        search_service = SearchService()
+
+        start_time = time.perf_counter()
+        for song in songs:
+            search_service.index_song(song)
+        print(f"\nIndexed {song_count} songs in {time.perf_counter() - start_time:.1f}s")
+
+        titles = [song.title for song in rng.sample(songs, MusicBenchmark.QUERIES)]
+        substring_queries = [title[len(title) // 3 : len(title) // 3 + 6] for title in titles]
+        prefix_queries = [title.split()[0][:5] for title in titles]
+        typo_queries = [MusicBenchmark.with_typo(title.split()[0][:7], rng) for title in titles]
+
+        print(f"\n--- Query latency ({MusicBenchmark.QUERIES} queries each, top 10) ---")
+        MusicBenchmark.measure("substring search", substring_queries, lambda query: search_service.search_songs_by_title(query, limit=10))
+        MusicBenchmark.measure("prefix typeahead", prefix_queries, lambda query: search_service.suggest_songs(query))
+        MusicBenchmark.measure("typo typeahead", typo_queries, lambda query: search_service.suggest_songs(query))
+
+        # Reference: the full scan the index replaced
+        sample = substring_queries[:20]
+        start_time = time.perf_counter()
+        for query in sample:
+            [song for song in songs if query.lower() in song.title.lower()]
+        print(f"{'full scan (reference)':<20} mean {(time.perf_counter() - start_time) / len(sample) * 1000:9.3f} ms")
+
+    @staticmethod
+    def benchmark_sessions(session_count: int):
+        rng = random.Random(7)
+        songs = MusicBenchmark.build_catalog(50, rng)
+        playlist = Playlist(id="load", title="Load Test")
+        for song in songs[:10]:
+            playlist.add_track(song)
+        session_manager = PlayerSessionManager()
+        # Half free (ad every third song), half premium
+        users = [
+            UserBuilder(User(f"user{i}")).add_name(f"User {i}").add_subscription(UserSubscription.FREE if i % 2 else UserSubscription.PREMIUM).build()
+            for i in range(session_count)
+        ]
+
+        def listen(user: User) -> float:
+            start_time = time.perf_counter()
+            player = session_manager.get_or_create_session(user)
+            player.load(user, playlist)
+            player.click_play()
+            for _ in range(MusicBenchmark.PLAYS_PER_SESSION - 1):
+                player.click_next()
+                player.click_play()
+            return (time.perf_counter() - start_time) * 1000
+
+        print(f"\n--- Concurrent player sessions ({session_count} users, {MusicBenchmark.SESSION_WORKERS} threads, {MusicBenchmark.PLAYS_PER_SESSION} plays each) ---")
+        # Players narrate every action (ad breaks end on the scheduler thread too); keep the output readable
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            start_time = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=MusicBenchmark.SESSION_WORKERS) as executor:
+                latencies = sorted(executor.map(listen, users, chunksize=256))
+            elapsed = time.perf_counter() - start_time
+            ads_in_flight = AdScheduler.get_instance().get_pending_count()
+            start_time = time.perf_counter()
+            AdScheduler.get_instance().wait_until_idle()
+            drain_elapsed = time.perf_counter() - start_time
+
+        ad_breaks = sum(user.get_playback_strategy().song_played // FreePlaybackStrategy.AD_FREQUENCY for user in users if user.subscription_tier == UserSubscription.FREE)
+        print(f"Active sessions: {session_manager.get_active_session_count()}")
+        print(f"Drove all sessions in {elapsed:.2f}s ({session_count * MusicBenchmark.PLAYS_PER_SESSION / elapsed:,.0f} plays/s)")
+        print(f"Per session: mean {statistics.mean(latencies):.3f} ms   p50 {statistics.median(latencies):.3f} ms   p99 {latencies[int(len(latencies) * 0.99) - 1]:.3f} ms")
+        print(f"Ad breaks: {ad_breaks} scheduled, {ads_in_flight} still in flight when the load finished, all ended {drain_elapsed:.2f}s later")
+        print(f"Blocking 1s ad sleeps would have added about {ad_breaks * FreePlaybackStrategy.AD_DURATION_SECONDS / MusicBenchmark.SESSION_WORKERS:,.0f}s with {MusicBenchmark.SESSION_WORKERS} threads")
+
+        # set_current_song on a long queue: index map lookup instead of a queue scan
+        long_playlist = Playlist(id="long", title="Long Queue")
+        long_playlist.tracks = MusicBenchmark.build_catalog(MusicBenchmark.LONG_QUEUE_SIZE, rng)
+        player = Player(users[0])
+        player.load(users[0], long_playlist)
+        last_song = long_playlist.tracks[-1]
+        start_time = time.perf_counter()
+        for _ in range(MusicBenchmark.QUERIES):
+            player.set_current_song(last_song)
+        print(f"set_current_song (last of {MusicBenchmark.LONG_QUEUE_SIZE} tracks): {(time.perf_counter() - start_time) / MusicBenchmark.QUERIES * 1_000_000:.3f} us")
+
+    @staticmethod
+    def benchmark_recommendations(play_count: int):
+        rng = random.Random(7)
+        songs = MusicBenchmark.build_catalog(MusicBenchmark.RECOMMEND_SONGS, rng)
+        users = [User(f"user{i}", f"User {i}") for i in range(MusicBenchmark.RECOMMEND_USERS)]
+        # Every user mostly listens to two taste clusters, so item-item similarity has structure to find
+        cluster_size = len(songs) // MusicBenchmark.TASTE_CLUSTERS
+        tastes = [rng.sample(range(MusicBenchmark.TASTE_CLUSTERS), 2) for _ in users]
+
+        def random_play() -> tuple[User, Song]:
+            index = rng.randrange(len(users))
+            cluster = rng.choice(tastes[index]) if rng.random() < 0.9 else rng.randrange(MusicBenchmark.TASTE_CLUSTERS)
+            return users[index], songs[cluster * cluster_size + min(int(rng.paretovariate(1.2)) - 1, cluster_size - 1)]
+
+        strategy = ItemBasedCollaborativeStrategy()
+        plays = [random_play() for _ in range(play_count)]
+        print(f"\n--- Item-based recommender ({len(users)} users, {len(songs)} songs, {play_count} plays) ---")
+        start_time = time.perf_counter()
+        for user, song in plays:
+            strategy.record_play(user, song)
+        elapsed = time.perf_counter() - start_time
+        print(f"Ingested plays: {play_count / elapsed:,.0f} plays/s")
+
+        start_time = time.perf_counter()
+        strategy.refresh()
+        print(f"Offline build (similarities + top-{strategy.TOP_N} for every user): {time.perf_counter() - start_time:.2f}s")
+
+        sample = [rng.choice(users) for _ in range(MusicBenchmark.QUERIES)]
+        MusicBenchmark.measure("cached top-N read", sample, lambda user: strategy.recommend((), user, 10))
+
+        # Stream more plays in: touched users are recomputed on their next read, touched songs on the next refresh
+        streamed = [random_play() for _ in range(MusicBenchmark.STREAMED_PLAYS)]
+        for user, song in streamed:
+            strategy.record_play(user, song)
+        MusicBenchmark.measure("read after new play", [user for user, _ in streamed[: MusicBenchmark.QUERIES]], lambda user: strategy.recommend((), user, 10))
+        stale_songs = len(strategy.stale_songs)
+        start_time = time.perf_counter()
+        strategy.refresh()
+        print(f"Incremental refresh after {MusicBenchmark.STREAMED_PLAYS} more plays ({stale_songs} stale songs): {time.perf_counter() - start_time:.2f}s")
+
+        hits = sum(
+            1
+            for user, taste in zip(users[:1000], tastes)
+            for song in strategy.recommend((), user, 10)
+            if int(song.id[4:]) // cluster_size in taste
+        )
+        print(f"Recommendations from the user's own taste clusters: {hits / (1000 * 10):.0%}")
+
+    @staticmethod
+    def benchmark_analytics(event_count: int):
+        rng = random.Random(7)
+        songs = MusicBenchmark.build_catalog(MusicBenchmark.ANALYTICS_SONGS, rng)
+        analytics = PlayAnalyticsService()
+        # Skewed popularity, timestamps advancing at EVENTS_PER_SECOND so the trending window keeps sliding
+        events = [
+            (f"user{rng.randrange(MusicBenchmark.ANALYTICS_LISTENERS)}", songs[min(int(rng.paretovariate(0.8)) - 1, len(songs) - 1)], index / MusicBenchmark.EVENTS_PER_SECOND)
+            for index in range(event_count)
+        ]
+
+        print(f"\n--- Play analytics ({event_count} events, {len(songs)} songs) ---")
+        start_time = time.perf_counter()
+        for user_id, song, timestamp in events:
+            analytics.record_play(user_id, song, timestamp, 180.0)
+        elapsed = time.perf_counter() - start_time
+        print(f"Ingested {event_count / elapsed:,.0f} events/s ({elapsed / event_count * 1_000_000:.2f} us/event)")
+        buffer = analytics.events
+        column_bytes = sum(column.itemsize * len(column) for column in (buffer.user_indexes, buffer.song_indexes, buffer.artist_indexes, buffer.timestamps, buffer.listened_seconds))
+        print(f"Ring buffer: {len(buffer)} events in {column_bytes / 1_000_000:.1f} MB of columns")
+
+        now = events[-1][2]
+        MusicBenchmark.measure("top 10 songs", range(MusicBenchmark.QUERIES), lambda _: analytics.get_top_songs(10))
+        MusicBenchmark.measure("trending 10 songs", range(MusicBenchmark.QUERIES), lambda _: analytics.get_trending_songs(10, now))
+        MusicBenchmark.measure("trending 10 artists", range(MusicBenchmark.QUERIES), lambda _: analytics.get_trending_artists(10, now))
+        MusicBenchmark.measure("unique listeners", songs[:MusicBenchmark.QUERIES], analytics.get_song_unique_listeners)
+
+        # Reference: trending chart by scanning the window of history
+        window_start = now - analytics.TRENDING_WINDOW_SECONDS
+        start_time = time.perf_counter()
+        counts: dict[str, int] = {}
+        for event in buffer.since(window_start):
+            counts[event.song_id] = counts.get(event.song_id, 0) + 1
+        sorted(counts.items(), key=lambda item: item[1], reverse=True)[:10]
+        print(f"{'window scan (reference)':<20} {(time.perf_counter() - start_time) * 1000:9.3f} ms")
+
+        top_song = songs[0]
+        exact = len({user_id for user_id, song, _ in events if song is top_song})
+        estimate = analytics.get_song_unique_listeners(top_song)
+        print(f"Unique listeners of the top song: exact {exact}, HyperLogLog {estimate} ({abs(estimate - exact) / exact:.1%} error, 1 KB sketch)")
+
+    @staticmethod
+    def with_typo(word: str, rng: random.Random) -> str:
+        position = rng.randrange(1, len(word))
+        return word[:position] + rng.choice("aeiou") + word[position + 1 :]
+
+    @staticmethod
+    def measure(name: str, queries: list[str], run_query):
+        latencies = []
+        for query in queries:
+            start_time = time.perf_counter()
+            run_query(query)
+            latencies.append((time.perf_counter() - start_time) * 1000)
+        latencies.sort()
+        p99 = latencies[int(len(latencies) * 0.99) - 1]
+        print(f"{name:<20} mean {statistics.mean(latencies):9.3f} ms   p50 {statistics.median(latencies):9.3f} ms   p99 {p99:9.3f} ms")
+
+
+if __name__ == "__main__":
+    MusicBenchmark.main()
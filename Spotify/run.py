@@ -1,3 +1,4 @@
+from app.services.ad_scheduler import AdScheduler
 from app.services.music_streaming_system import MusicStreamingSystem
 from app.models.user import User, UserBuilder, Address
 from app.models.artist import Artist
@@ -20,7 +21,6 @@ class MusicApplication:
 
     def run(self):
         # Example usage of the music streaming system
-        player = self.music_service.get_player()
         user1_address = Address("123 Main St", "City", "State", "12345")
         user2_address = Address(
             "456 Another St", "Another City", "Another State", "67890"
@@ -144,17 +144,21 @@ class MusicApplication:
         artist3.release_album(album3)
         print("\n\n")
 
+        # Each user gets their own player session
+        player1 = self.music_service.get_player(user1)
+        player2 = self.music_service.get_player(user2)
+
         # Simulate user commands
-        play = PlayCommand(player=player)
-        pause = PauseCommand(player=player)
-        stop = StopCommand(player=player)
-        next_track = NextTrackCommand(player=player)
-        previous_track = PreviousTrackCommand(player=player)
-        toggle_play_pause = TogglePlayPauseCommand(player=player)
+        play = PlayCommand(player=player1)
+        pause = PauseCommand(player=player1)
+        stop = StopCommand(player=player1)
+        next_track = NextTrackCommand(player=player1)
+        previous_track = PreviousTrackCommand(player=player1)
+        toggle_play_pause = TogglePlayPauseCommand(player=player1)
 
         # Play for user1
         print("Playing for User 1:")
-        player.load(user1, playlist1)
+        player1.load(user1, playlist1)
         play.execute()
         pause.execute()
         stop.execute()
@@ -162,15 +166,17 @@ class MusicApplication:
         play.execute()
         print("\n")
         next_track.execute()
-        play.execute()  # This should print add
+        play.execute()  # This should print add (the ad break ends in the background)
         next_track.execute()
         play.execute()  # This should not print ad as only 3 songs in playlist
         previous_track.execute()
         toggle_play_pause.execute()
 
-        # Play for second User
+        # Play for second User, on their own player while user1's session stays active
         print("Playing for User 2:\n")
-        player.load(user2, playlist2)
+        play = PlayCommand(player=player2)
+        next_track = NextTrackCommand(player=player2)
+        player2.load(user2, playlist2)
         play.execute()
         next_track.execute()
         play.execute()
@@ -180,6 +186,10 @@ class MusicApplication:
         # This will not cause any ads to be played
         play.execute()
 
+        print(f"\nActive player sessions: {self.music_service.get_active_session_count()}")
+        print(f"User 1 is still on: {player1.current_song.title}, User 2 is on: {player2.current_song.title}")
+        AdScheduler.get_instance().wait_until_idle()
+
         # Search Service Demo
 
         print("\n\nSearch Service Demo\n")
@@ -197,11 +207,30 @@ class MusicApplication:
         for song in search_results_by_artist:
             print(f"Found song by artist: {song.title}")
 
+        suggestions = self.music_service.suggest_songs("rangele")
+        print(f"Typeahead suggestions for 'rangele' (typo tolerant): {str(suggestions)}")
+
         print("\n\nRecommendation Service Demo\n")
-        recommended_songs = self.music_service.get_song_recommendations()
-        print(f"Recommended songs for User 1: {str(recommended_songs)}")
-        for song in recommended_songs:
-            print(f" - {song.title}")
+        # Plays from both sessions above were streamed into the recommender; run the offline job
+        self.music_service.refresh_recommendations()
+        for user in all_users:
+            recommended_songs = self.music_service.get_song_recommendations(user)
+            print(f"Recommended songs for {user.get_name()}: {str(recommended_songs)}")
+            for song in recommended_songs:
+                print(f" - {song.title}")
+        print(f"Most played songs: {str(self.music_service.get_song_recommendations())}")
+
+        print("\n\nPlay Analytics Demo\n")
+        # Ending the sessions reports the plays still in progress
+        for user in all_users:
+            self.music_service.end_player_session(user)
+        for song, plays in self.music_service.get_top_songs(3):
+            print(f"Top song: {song.title} - {plays} plays, ~{self.music_service.get_song_unique_listeners(song)} unique listeners")
+        for song, plays in self.music_service.get_trending_songs(3):
+            print(f"Trending in the last hour: {song.title} - {plays} plays")
+        for artist, plays in self.music_service.get_top_artists(3):
+            print(f"Top artist: {artist.get_name()} - {plays} plays, ~{self.music_service.get_artist_unique_listeners(artist)} unique listeners")
+        print(f"Recent plays: {self.music_service.analytics_service.get_recent_events(3)}")
 
 
 if __name__ == "__main__":
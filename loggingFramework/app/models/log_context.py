@@ -0,0 +1,46 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Mapping
+from types import MappingProxyType
+
+# A single ContextVar holding an immutable mapping, so binding new fields never mutates
+# a mapping that another thread/task (or an already queued LogMessage) still references
+_log_context: ContextVar[Mapping[str, Any]] = ContextVar("log_context", default=MappingProxyType({}))
+
+
+class LogContext:
+    REQUEST_ID = "request_id"
+    USER_ID = "user_id"
+
+    @staticmethod
+    def get() -> Mapping[str, Any]:
+        return _log_context.get()
+
+    @staticmethod
+    @contextmanager
+    def bind(**fields: Any) -> Iterator[Mapping[str, Any]]:
+        merged: Dict[str, Any] = dict(_log_context.get())
+        merged.update(fields)
+        token = _log_context.set(MappingProxyType(merged))
+        try:
+            yield _log_context.get()
+        finally:
+            _log_context.reset(token)
+
+    @staticmethod
+    def set_request_id(request_id: str) -> None:
+        LogContext._set_field(LogContext.REQUEST_ID, request_id)
+
+    @staticmethod
+    def set_user_id(user_id: str) -> None:
+        LogContext._set_field(LogContext.USER_ID, user_id)
+
+    @staticmethod
+    def clear() -> None:
+        _log_context.set(MappingProxyType({}))
+
+    @staticmethod
+    def _set_field(key: str, value: Any) -> None:
+        merged = dict(_log_context.get())
+        merged[key] = value
+        _log_context.set(MappingProxyType(merged))
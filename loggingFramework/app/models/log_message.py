@@ -1,7 +1,8 @@
 from app.models.enums import LogLevel
 from datetime import datetime
-from typing import Optional
+from typing import Any, Mapping, Optional
 import threading
+from app.models.log_context import LogContext
 
 
 class LogMessage:
@@ -12,6 +13,8 @@ class LogMessage:
         self.thread_id = threading.get_ident()
         # Context variable (from contextvars import ContextVar) is used to manage the thread id for logger because the process might context switch to different threads and we might log inconsistent thread ids in the log file
         # Any other variable we may log here (like RequestId,userId,etc.) can be added here similar to thread_id
+        # Context is captured here (in the caller's context) because formatting happens later on the worker thread
+        self.context = LogContext.get()
 
     def get_level(self) -> LogLevel:
         return self.level
@@ -25,5 +28,8 @@ class LogMessage:
     def get_timestamp(self) -> datetime:
         return self.timestamp
 
+    def get_context(self) -> Mapping[str, Any]:
+        return self.context
+
     def __str__(self) -> str:
         return f"[{self.level}] {self.timestamp} - {self.message} - {self.thread_id if self.thread_id else ''}"
@@ -4,11 +4,22 @@ from app.models.log_config import LogConfig
 from app.models.log_message import LogMessage
 from app.models.enums import LogLevel
 from app.chain.log_handler import LogHandlerChain
+from app.strategies.appender import AppenderStrategy
+
+
+class _BatchBuffer(AppenderStrategy):
+    # Collects what the handler chain lets through, so the real appenders get it as one batch
+    def __init__(self):
+        self.messages: list[LogMessage] = []
+
+    def append(self, log_message: LogMessage):
+        self.messages.append(log_message)
 
 
 class Logger:
     _instance = None
     _lock = threading.Lock()
+    MAX_BATCH = 512  # messages drained from the queue per appender call
 
     def __init__(self, config: LogConfig):
         self.config = config
@@ -51,11 +62,25 @@ class Logger:
             while True:
                 # This uses mutex behind the scenes to ensure that only one thread can access the queue at a time
                 # Since has one property bock with default value as True, it will block the thread till it is not empty
-                msg = self.queue.get()  # Gets item, counter stays same
-
-                self.handler_chain.handle(msg, self.config.appenders)
-
-                self.queue.task_done()  # Marks task as done, decrements counter
+                batch = [self.queue.get()]  # Gets item, counter stays same
+                # Then take whatever else is already queued, so a burst costs one write per appender
+                while len(batch) < self.MAX_BATCH:
+                    try:
+                        batch.append(self.queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                try:
+                    accepted = _BatchBuffer()
+                    for msg in batch:
+                        self.handler_chain.handle(msg, [accepted])
+                    for appender in self.config.appenders:
+                        appender.append_batch(accepted.messages)
+                except Exception as e:
+                    print(f"Failed to write log batch: {e}")
+                finally:
+                    for _ in batch:
+                        self.queue.task_done()  # Marks task as done, decrements counter
 
         # Daemon thread to run in the background indefinitely as when the main thread exits, the daemon threads will also exit
         # without any guaranteed termination/cleanup of resources like database connections, file handles, etc.
@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
 from app.models.log_message import LogMessage
 import threading
+from typing import List
+import sys
 from app.strategies.format import FormatStrategy, TextFormatter, JsonFormatter
 
 try:
@@ -14,6 +16,10 @@ class AppenderStrategy(ABC):
     def append(self, log_message: LogMessage):
         raise NotImplementedError("Subclasses must implement this method")
 
+    def append_batch(self, log_messages: List[LogMessage]):
+        for log_message in log_messages:
+            self.append(log_message)
+
 
 class ConsoleAppender(AppenderStrategy):
     def __init__(self, formatter: FormatStrategy = None):
@@ -22,6 +28,9 @@ class ConsoleAppender(AppenderStrategy):
     def append(self, log_message: LogMessage):
         print(self.formatter.format(log_message))
 
+    def append_batch(self, log_messages: List[LogMessage]):
+        sys.stdout.write(self.formatter.format_batch(log_messages).decode("utf-8"))
+
 
 import os
 import glob
@@ -87,6 +96,37 @@ class FileAppender(AppenderStrategy):
 
             self.current_file_size = self._get_file_size(self.current_file_path)
 
+    def append_batch(self, log_messages: List[LogMessage]):
+        if not log_messages:
+            return
+        # Whole batch is formatted into one buffer and written with a single call
+        buffer = self.formatter.format_batch(log_messages)
+        with self._lock:
+            current_size = self._get_file_size(self.current_file_path)
+            if current_size + len(buffer) <= self.max_file_size_bytes:
+                with open(self.current_file_path, "ab") as f:
+                    f.write(buffer)
+            else:
+                self._append_lines_with_rotation([(self.formatter.format(log_message) + "\n").encode("utf-8") for log_message in log_messages], current_size)
+
+            self.current_file_size = self._get_file_size(self.current_file_path)
+
+    def _append_lines_with_rotation(self, lines: List[bytes], current_size: int):
+        # Same rule as append: rotate before a line that would push the file over the limit, one write per file
+        start = 0
+        while start < len(lines):
+            if current_size + len(lines[start]) > self.max_file_size_bytes:
+                self._rotate_file()
+                current_size = 0
+            end = start + 1
+            current_size += len(lines[start])
+            while end < len(lines) and current_size + len(lines[end]) <= self.max_file_size_bytes:
+                current_size += len(lines[end])
+                end += 1
+            with open(self.current_file_path, "ab") as f:
+                f.write(b"".join(lines[start:end]))
+            start = end
+
 
 class DatabaseAppender(AppenderStrategy):
     def __init__(self, db_url: str, username: str, password: str):
@@ -1,26 +1,113 @@
 from abc import ABC, abstractmethod
 from app.models.log_message import LogMessage
+from datetime import datetime
+from string import Formatter
+from typing import Callable, Iterable, List, Optional, Tuple
 import json
 
 
+class TimestampRenderer:
+    # Rendering a datetime is the most expensive part of formatting a line. Messages logged within the
+    # same second share everything up to the seconds field, so that prefix is cached and only the
+    # microseconds are appended per message.
+    def __init__(self, separator: str = "T"):
+        self.separator = separator
+        # (second, tzinfo, fold, rendered prefix, UTC offset) swapped as one tuple so concurrent callers never see a torn entry
+        self._cache: Tuple[Optional[datetime], object, int, str, str] = (None, None, 0, "", "")
+
+    def render(self, timestamp: datetime) -> str:
+        second = timestamp.replace(microsecond=0)
+        cached_second, cached_tzinfo, cached_fold, prefix, offset = self._cache
+        # Same-zone datetimes compare by wall clock, so the zone and DST fold are part of the key too
+        if second != cached_second or timestamp.tzinfo is not cached_tzinfo or timestamp.fold != cached_fold:
+            # Single slot cache: timestamps reach the worker thread (almost) in order
+            rendered = second.isoformat(sep=self.separator)
+            # An aware datetime ends in its UTC offset, which belongs after the fraction: "...:SS.ffffff+00:00"
+            prefix, offset = rendered[:19], rendered[19:]
+            self._cache = (second, timestamp.tzinfo, timestamp.fold, prefix, offset)
+        return f"{prefix}.{timestamp.microsecond:06d}{offset}"
+
+
 class FormatStrategy(ABC):
     @abstractmethod
     def format(self, log_message: LogMessage) -> str:
         raise NotImplementedError("Subclasses must implement this method")
 
+    def format_batch(self, log_messages: Iterable[LogMessage]) -> bytes:
+        # One newline-terminated buffer for the whole batch so an appender can issue a single write
+        lines = [self.format(log_message) for log_message in log_messages]
+        if not lines:
+            return b""
+        lines.append("")
+        return "\n".join(lines).encode("utf-8")
+
 
 class TextFormatter(FormatStrategy):
+    DEFAULT_TEMPLATE = "[{level}] {timestamp} - {message} - {thread_id}"
+
+    def __init__(self, template: str = DEFAULT_TEMPLATE):
+        self.template = template
+        self.timestamp_renderer = TimestampRenderer(separator=" ")
+        self._compiled_template, self._field_getters = self._compile(template)
+
+    def _compile(self, template: str) -> Tuple[str, List[Callable[[LogMessage], object]]]:
+        # Parse the layout once into a positional template plus one getter per placeholder,
+        # so format() never re-parses the layout or resolves field names per message
+        compiled_parts: List[str] = []
+        field_getters: List[Callable[[LogMessage], object]] = []
+        for literal, field_name, format_spec, conversion in Formatter().parse(template):
+            compiled_parts.append(literal.replace("{", "{{").replace("}", "}}"))
+            if field_name is None:
+                continue
+            placeholder = "{" + str(len(field_getters))
+            if conversion:
+                placeholder += "!" + conversion
+            if format_spec:
+                placeholder += ":" + format_spec
+            compiled_parts.append(placeholder + "}")
+            field_getters.append(self._field_getter(field_name))
+        return "".join(compiled_parts), field_getters
+
+    def _field_getter(self, field_name: str) -> Callable[[LogMessage], object]:
+        if field_name == "level":
+            return lambda log_message: log_message.level.name
+        if field_name == "timestamp":
+            return lambda log_message: self.timestamp_renderer.render(log_message.timestamp)
+        if field_name == "message":
+            return lambda log_message: log_message.message
+        if field_name == "thread_id":
+            return lambda log_message: log_message.thread_id if log_message.thread_id else ""
+        # Anything else is looked up in the context captured with the message (request_id, user_id, ...)
+        return lambda log_message: log_message.context.get(field_name, "")
+
     def format(self, log_message: LogMessage) -> str:
-        return f"[{log_message.get_level().name}] {log_message.get_timestamp()} - {log_message.get_message()} - {log_message.get_thread_id() if log_message.get_thread_id() else ''}"
+        return self._compiled_template.format(*[getter(log_message) for getter in self._field_getters])
 
 
 class JsonFormatter(FormatStrategy):
+    def __init__(self):
+        self.timestamp_renderer = TimestampRenderer(separator="T")
+        # Built once and reused; json.dumps would construct a new encoder for every non-default call
+        self._encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=str)
+        self._encode_value = self._encoder.encode
+
     def format(self, log_message: LogMessage) -> str:
-        return json.dumps(
-            {
-                "level": log_message.get_level().name,
-                "timestamp": log_message.get_timestamp(),
-                "message": log_message.get_message(),
-                "thread_id": log_message.get_thread_id() if log_message.get_thread_id() else "",
-            }
-        )
+        # Level names and rendered timestamps never need escaping, so only the message text
+        # and context values go through the encoder
+        parts = [
+            '{"level":"',
+            log_message.level.name,
+            '","timestamp":"',
+            self.timestamp_renderer.render(log_message.timestamp),
+            '","message":',
+            self._encode_value(log_message.message),
+            ',"thread_id":',
+            str(log_message.thread_id) if log_message.thread_id else '""',
+        ]
+        for key, value in log_message.context.items():
+            parts.append(",")
+            parts.append(self._encode_value(key))
+            parts.append(":")
+            parts.append(self._encode_value(value))
+        parts.append("}")
+        return "".join(parts)
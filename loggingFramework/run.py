@@ -2,7 +2,8 @@ from app.models.logger import Logger
 from app.models.log_config import LogConfig
 from app.models.enums import LogLevel
 from app.strategies.appender import ConsoleAppender, FileAppender
-from app.strategies.format import TextFormatter
+from app.strategies.format import TextFormatter, JsonFormatter
+from app.models.log_context import LogContext
 import time
 
 
@@ -24,6 +25,13 @@ def main():
     logger.error("Database connection failed")
     logger.fatal("Critical system failure")
 
+    print("\n🧾 Testing structured logging with request context...")
+    config.add_appender(ConsoleAppender(JsonFormatter()))
+    with LogContext.bind(request_id="req-42", user_id="user-7"):
+        logger.info("Checkout started")
+    time.sleep(0.1)
+    config.set_appenders([console, file])
+
     print("\n🔄 Testing file rotation (generating logs to exceed 10KB limit)...")
     large_message = "X" * 500
     for i in range(30):
@@ -12,6 +12,8 @@ class Booking:
         self._user = user
         self._show = show
         self._seats = seats
+        # Priced once by the show's pricing strategy: a later strategy change does not alter this booking
+        self._total_price = show.get_total_price(seats)
         self._state = PendingState()
         self._status = BookingStatus.PENDING
 
@@ -33,7 +35,7 @@ class Booking:
 
     @property
     def total_price(self) -> float:
-        return sum(seat.type.price for seat in self._seats)
+        return self._total_price
 
     @property
     def status(self) -> BookingStatus:
@@ -49,10 +51,15 @@ class Booking:
     def set_state(self, state: BookingState) -> None:
         self._state = state
 
+    # The status only changes when the state transition succeeds (e.g. not when the seat hold expired)
     def confirm_booking(self) -> bool:
-        self.set_status(BookingStatus.CONFIRMED)
-        return self.state.confirm_booking(self)
+        confirmed = self.state.confirm_booking(self)
+        if confirmed:
+            self.set_status(BookingStatus.CONFIRMED)
+        return confirmed
 
     def cancel_booking(self) -> bool:
-        self.set_status(BookingStatus.CANCELLED)
-        return self.state.cancel_booking(self)
+        cancelled = self.state.cancel_booking(self)
+        if cancelled:
+            self.set_status(BookingStatus.CANCELLED)
+        return cancelled
@@ -1,5 +1,4 @@
 from abc import ABC, abstractmethod
-from app.models.enums import SeatStatus
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -18,18 +17,20 @@ class BookingState(ABC):
 
 class PendingState(BookingState):
     def confirm_booking(self, booking: "Booking") -> bool:
+        inventory = booking.show.seat_inventory
+        # Turn the user's holds into bookings for all seats at once, or none if a hold has expired
+        if not inventory.confirm(str(booking.user.id), inventory.mask_of(booking.seats)):
+            print(f"❌ Booking {booking.id} cannot be confirmed, seat hold expired")
+            return False
         print(f"✅ Booking {booking.id} confirmed successfully")
-        # Mark all seats as booked
-        for seat in booking.seats:
-            seat.set_status(SeatStatus.BOOKED)
         booking.set_state(ConfirmedState())
         return True
 
     def cancel_booking(self, booking: "Booking") -> bool:
         print(f"❌ Booking {booking.id} cancelled")
-        # Mark all seats as available
-        for seat in booking.seats:
-            seat.set_status(SeatStatus.AVAILABLE)
+        # Release the seats still held for this booking
+        inventory = booking.show.seat_inventory
+        inventory.release(str(booking.user.id), inventory.mask_of(booking.seats))
 
         # Transition to cancelled state
         booking.set_state(CancelledState())
@@ -43,9 +44,9 @@ class ConfirmedState(BookingState):
 
     def cancel_booking(self, booking: "Booking") -> bool:
         print(f"❌ Booking {booking.id} cancelled")
-        # Mark all seats as available
-        for seat in booking.seats:
-            seat.set_status(SeatStatus.AVAILABLE)
+        # Mark all seats as available again
+        inventory = booking.show.seat_inventory
+        inventory.cancel(inventory.mask_of(booking.seats))
 
         # Transition to cancelled state
         booking.set_state(CancelledState())
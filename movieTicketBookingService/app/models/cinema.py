@@ -9,6 +9,8 @@ class Cinema:
         self._name = name
         self._city = city
         self._screens = screens
+        for screen in screens:
+            screen.cinema = self
 
     @property
     def id(self) -> str:
@@ -30,4 +32,5 @@ class Cinema:
         return self._screens
 
     def add_screen(self, screen: Screen) -> None:
+        screen.cinema = self
         self._screens.append(screen)
@@ -0,0 +1,123 @@
+from itertools import count
+from random import random
+from typing import Any, Generic, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class _IntervalNode(Generic[T]):
+    def __init__(self, order: tuple, start: Any, end: Any, value: T):
+        self.order = order  # (start, insertion sequence): unique even when starts are equal
+        self.start = start
+        self.end = end
+        self.value = value
+        self.max_end = end  # largest end in this subtree
+        self.priority = random()
+        self.left: Optional["_IntervalNode[T]"] = None
+        self.right: Optional["_IntervalNode[T]"] = None
+
+
+class IntervalTree(Generic[T]):
+    """
+    Closed intervals [start, end] in a treap ordered by start, where every node also keeps the largest end
+    of its subtree. Overlap queries skip any subtree that ends before the query starts and stop going right
+    once starts pass the query end: O(log n + matches). Insert and remove are O(log n) expected.
+    """
+
+    def __init__(self):
+        self.root: Optional[_IntervalNode[T]] = None
+        self.orders: dict[Hashable, tuple] = {}  # key -> order of its node
+        self.sequence = count()
+
+    def __len__(self) -> int:
+        return len(self.orders)
+
+    def add(self, key: Hashable, start: Any, end: Any, value: T) -> None:
+        if end < start:
+            raise ValueError("Interval end cannot be before its start")
+        if key in self.orders:
+            self.remove(key)
+        node = _IntervalNode((start, next(self.sequence)), start, end, value)
+        self.orders[key] = node.order
+        self.root = self._insert(self.root, node)
+
+    def remove(self, key: Hashable) -> None:
+        order = self.orders.pop(key, None)
+        if order is not None:
+            self.root = self._delete(self.root, order)
+
+    def overlapping(self, start: Any, end: Any) -> list[T]:
+        """Values whose interval shares at least one point with [start, end], in start order"""
+        result: list[T] = []
+        self._collect(self.root, start, end, result)
+        return result
+
+    def containing(self, point: Any) -> list[T]:
+        return self.overlapping(point, point)
+
+    @staticmethod
+    def _update(node: _IntervalNode[T]) -> None:
+        node.max_end = node.end
+        if node.left is not None and node.left.max_end > node.max_end:
+            node.max_end = node.left.max_end
+        if node.right is not None and node.right.max_end > node.max_end:
+            node.max_end = node.right.max_end
+
+    def _rotate_right(self, node: _IntervalNode[T]) -> _IntervalNode[T]:
+        pivot = node.left
+        node.left, pivot.right = pivot.right, node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+    def _rotate_left(self, node: _IntervalNode[T]) -> _IntervalNode[T]:
+        pivot = node.right
+        node.right, pivot.left = pivot.left, node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+    def _insert(self, node: Optional[_IntervalNode[T]], new: _IntervalNode[T]) -> _IntervalNode[T]:
+        if node is None:
+            return new
+        if new.order < node.order:
+            node.left = self._insert(node.left, new)
+            if node.left.priority > node.priority:
+                return self._rotate_right(node)
+        else:
+            node.right = self._insert(node.right, new)
+            if node.right.priority > node.priority:
+                return self._rotate_left(node)
+        self._update(node)
+        return node
+
+    def _delete(self, node: Optional[_IntervalNode[T]], order: tuple) -> Optional[_IntervalNode[T]]:
+        if node is None:
+            return None
+        if order < node.order:
+            node.left = self._delete(node.left, order)
+        elif order > node.order:
+            node.right = self._delete(node.right, order)
+        else:
+            # Rotate the node down towards a leaf, keeping the heap order of priorities
+            if node.left is None:
+                return node.right
+            if node.right is None:
+                return node.left
+            if node.left.priority > node.right.priority:
+                node = self._rotate_right(node)
+                node.right = self._delete(node.right, order)
+            else:
+                node = self._rotate_left(node)
+                node.left = self._delete(node.left, order)
+        self._update(node)
+        return node
+
+    def _collect(self, node: Optional[_IntervalNode[T]], start: Any, end: Any, result: list[T]) -> None:
+        while node is not None and node.max_end >= start:
+            self._collect(node.left, start, end, result)
+            if node.start > end:
+                return
+            if node.end >= start:
+                result.append(node.value)
+            node = node.right
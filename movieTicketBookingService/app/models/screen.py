@@ -1,3 +1,4 @@
+from app.models.enums import SeatType
 from app.models.seat import Seat
 import uuid
 
@@ -7,6 +8,10 @@ class Screen:
         self._id = str(uuid.uuid4())
         self._name = name
         self._seats = seats
+        self._seat_positions = {seat.id: position for position, seat in enumerate(seats)}  # seat id -> bit in a SeatInventory
+        self._seat_type_samples: dict[SeatType, Seat] = {}  # one seat of each type present, e.g. to price the types
+        for seat in seats:
+            self._seat_type_samples.setdefault(seat.type, seat)
         self._cinema = None
 
     @property
@@ -32,5 +37,13 @@ class Screen:
     def get_seats(self) -> list[Seat]:
         return self._seats
 
+    def get_seat_positions(self) -> dict[str, int]:
+        return self._seat_positions
+
+    def get_seat_type_samples(self) -> dict[SeatType, Seat]:
+        return self._seat_type_samples
+
     def add_seat(self, seat: Seat) -> None:
+        self._seat_type_samples.setdefault(seat.type, seat)
+        self._seat_positions[seat.id] = len(self._seats)
         self._seats.append(seat)
@@ -1,4 +1,4 @@
-from app.models.enums import SeatType, SeatStatus
+from app.models.enums import SeatType
 import uuid
 
 
@@ -8,7 +8,6 @@ class Seat:
         self._row = row
         self._col = col
         self._seat_type = seat_type
-        self._status = SeatStatus.AVAILABLE
 
     @property
     def id(self) -> str:
@@ -26,9 +25,4 @@ class Seat:
     def type(self) -> SeatType:
         return self._seat_type
 
-    @property
-    def status(self) -> SeatStatus:
-        return self._status
-
-    def set_status(self, status: SeatStatus) -> None:
-        self._status = status
+    # Booking status is per show, see SeatInventory
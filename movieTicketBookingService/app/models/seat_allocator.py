@@ -0,0 +1,131 @@
+from app.models.enums import SeatType
+from app.models.seat import Seat
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from app.models.screen import Screen
+
+
+class _RowSegment:
+    # Seats of one row with consecutive columns and the same type: the only places a block can sit
+    def __init__(self, row: int, seat_type: SeatType, seats: list[Seat], positions: list[int], centre_col: float, row_distance: float):
+        self.row = row
+        self.seat_type = seat_type
+        self.seats = seats
+        self.positions = positions  # inventory bit of each seat, in column order
+        self.mask = sum(1 << position for position in positions)
+        self.first_col = seats[0].col
+        self.centre_col = centre_col
+        self.row_distance = row_distance
+
+
+class SeatAllocator:
+    """
+    Best-available contiguous blocks ("N adjacent seats of type T, closest to centre") over one show's seats
+    The screen is split once into row segments; each segment caches its free runs and longest free run.
+    The free bits seen by the previous query tell which segments changed, so only those are rescanned, and a
+    request longer than every free run of its seat type fails in O(1).
+    A query visits the segments in order of distance from the centre row and stops once no further row can
+    beat the best block found: O(rows) cached lookups.
+    The caches are not synchronized: SeatInventory only calls the allocator under its lock.
+    """
+
+    def __init__(self, screen: "Screen"):
+        self._screen = screen
+        self._seat_count = -1
+        self._segments: list[_RowSegment] = []
+        self._free_runs: list[list[tuple[int, int]]] = []  # per segment: [(first offset, length)]
+        self._longest: list[int] = []  # per segment: longest free run
+        self._longest_by_type: dict[Optional[SeatType], int] = {}  # seat type (None: any) -> longest free run
+        self._available = 0  # free bits the caches were computed from
+
+    def _build(self) -> None:
+        # Rebuilt when seats are added to the screen
+        seats = self._screen.get_seats()
+        positions = self._screen.get_seat_positions()
+        rows: dict[int, list[Seat]] = {}
+        for seat in seats:
+            rows.setdefault(seat.row, []).append(seat)
+        centre_row = (min(rows) + max(rows)) / 2 if rows else 0
+
+        segments = []
+        for row, row_seats in rows.items():
+            row_seats.sort(key=lambda seat: seat.col)
+            centre_col = (row_seats[0].col + row_seats[-1].col) / 2
+            current: list[Seat] = []
+            for seat in row_seats:
+                if current and (seat.col != current[-1].col + 1 or seat.type != current[-1].type):
+                    segments.append(_RowSegment(row, current[0].type, current, [positions[s.id] for s in current], centre_col, abs(row - centre_row)))
+                    current = []
+                current.append(seat)
+            if current:
+                segments.append(_RowSegment(row, current[0].type, current, [positions[s.id] for s in current], centre_col, abs(row - centre_row)))
+
+        segments.sort(key=lambda segment: (segment.row_distance, segment.row))
+        self._segments = segments
+        self._free_runs = [[] for _ in segments]
+        self._longest = [0] * len(segments)
+        self._longest_by_type = {}
+        self._available = 0
+        self._seat_count = len(seats)
+
+    def _refresh(self, available: int) -> None:
+        changed = available ^ self._available
+        if not changed:
+            return
+        for index, segment in enumerate(self._segments):
+            if changed & segment.mask:
+                runs = []
+                start = None
+                for offset, position in enumerate(segment.positions):
+                    if available >> position & 1:
+                        if start is None:
+                            start = offset
+                    elif start is not None:
+                        runs.append((start, offset - start))
+                        start = None
+                if start is not None:
+                    runs.append((start, len(segment.positions) - start))
+                self._free_runs[index] = runs
+                self._longest[index] = max((length for _, length in runs), default=0)
+        longest_by_type: dict[Optional[SeatType], int] = {None: 0}
+        for segment, longest in zip(self._segments, self._longest):
+            longest_by_type[segment.seat_type] = max(longest_by_type.get(segment.seat_type, 0), longest)
+            longest_by_type[None] = max(longest_by_type[None], longest)
+        self._longest_by_type = longest_by_type
+        self._available = available
+
+    def find_best_block(self, available: int, count: int, seat_type: Optional[SeatType] = None) -> int:
+        """Mask of the free block of count adjacent seats closest to the centre, or 0 if there is none"""
+        if count <= 0:
+            raise ValueError("Seat count must be positive")
+        if self._seat_count != len(self._screen.get_seats()):
+            self._build()
+
+        self._refresh(available)
+        if self._longest_by_type.get(seat_type, 0) < count:
+            return 0
+
+        best_score: Optional[tuple[float, float]] = None
+        best: Optional[tuple[int, int]] = None  # (segment index, first seat offset)
+        for index, segment in enumerate(self._segments):
+            # Segments are ordered by row distance, and a block's score is at least its row distance
+            if best_score is not None and segment.row_distance >= best_score[0]:
+                break
+            if self._longest[index] < count or (seat_type is not None and segment.seat_type != seat_type):
+                continue
+            # First offset whose block is centred on the row's centre column
+            ideal = round(segment.centre_col - segment.first_col - (count - 1) / 2)
+            for start, length in self._free_runs[index]:
+                if length < count:
+                    continue
+                offset = min(max(ideal, start), start + length - count)
+                col_distance = abs(segment.first_col + offset + (count - 1) / 2 - segment.centre_col)
+                score = (segment.row_distance + col_distance, segment.row_distance)
+                if best_score is None or score < best_score:
+                    best_score, best = score, (index, offset)
+
+        if best is None:
+            return 0
+        index, offset = best
+        return sum(1 << position for position in self._segments[index].positions[offset : offset + count])
@@ -0,0 +1,138 @@
+from app.models.enums import SeatStatus, SeatType
+from app.models.seat import Seat
+from app.models.seat_allocator import SeatAllocator
+from typing import TYPE_CHECKING, Iterable, Optional
+from threading import Lock
+
+if TYPE_CHECKING:
+    from app.models.screen import Screen
+
+
+class SeatInventory:
+    """
+    Seat states of one show, as bitsets over the screen's seat positions (bit i = screen.seats[i])
+    - locked / booked: one bit per seat, held as Python ints (arbitrary length, word-level operations in C)
+    - holds: user id -> bitset of the seats that user currently holds
+    Lock, confirm and release check and update a whole seat set with a handful of bit operations,
+    so a multi-seat request either succeeds for every seat or changes nothing.
+    """
+
+    def __init__(self, screen: "Screen"):
+        self._screen = screen
+        self._lock = Lock()
+        self._locked = 0
+        self._booked = 0
+        self._holds: dict[str, int] = {}
+        self._allocator = SeatAllocator(screen)
+
+    @property
+    def lock(self) -> Lock:
+        return self._lock
+
+    def mask_of(self, seats: Iterable[Seat]) -> int:
+        positions = self._screen.get_seat_positions()
+        mask = 0
+        for seat in seats:
+            position = positions.get(seat.id)
+            if position is None:
+                raise ValueError(f"Seat {seat.id} does not belong to screen {self._screen.name}")
+            mask |= 1 << position
+        return mask
+
+    def seats_of(self, mask: int) -> list[Seat]:
+        seats = self._screen.get_seats()
+        result = []
+        while mask:
+            lowest = mask & -mask
+            result.append(seats[lowest.bit_length() - 1])
+            mask ^= lowest
+        return result
+
+    def _full_mask(self) -> int:
+        return (1 << len(self._screen.get_seats())) - 1
+
+    def try_lock(self, user_id: str, mask: int) -> bool:
+        """Holds every seat in mask for the user, or none of them if any is locked or booked"""
+        with self._lock:
+            if (self._locked | self._booked) & mask:
+                return False
+            self._locked |= mask
+            self._holds[user_id] = self._holds.get(user_id, 0) | mask
+            return True
+
+    def try_lock_best_block(self, user_id: str, count: int, seat_type: Optional[SeatType] = None) -> int:
+        """Finds and holds the best free block of count adjacent seats in one step; returns its bits (0 if none)"""
+        with self._lock:
+            mask = self._allocator.find_best_block(self.get_available_mask(), count, seat_type)
+            if mask:
+                self._locked |= mask
+                self._holds[user_id] = self._holds.get(user_id, 0) | mask
+            return mask
+
+    def find_best_block(self, count: int, seat_type: Optional[SeatType] = None) -> list[Seat]:
+        with self._lock:
+            return self.seats_of(self._allocator.find_best_block(self.get_available_mask(), count, seat_type))
+
+    def confirm(self, user_id: str, mask: int) -> bool:
+        """Turns the user's hold on every seat in mask into a booking; fails if any hold has been released"""
+        with self._lock:
+            held = self._holds.get(user_id, 0)
+            if held & mask != mask:
+                return False
+            self._locked &= ~mask
+            self._booked |= mask
+            self._set_hold(user_id, held & ~mask)
+            return True
+
+    def release(self, user_id: str, mask: int) -> int:
+        """Releases the seats in mask still held by the user; returns the released bits"""
+        with self._lock:
+            held = self._holds.get(user_id, 0)
+            released = held & mask
+            self._locked &= ~released
+            self._set_hold(user_id, held & ~released)
+            return released
+
+    def release_all(self, user_id: str) -> int:
+        with self._lock:
+            released = self._holds.pop(user_id, 0)
+            self._locked &= ~released
+            return released
+
+    def cancel(self, mask: int) -> None:
+        with self._lock:
+            self._booked &= ~mask
+
+    def _set_hold(self, user_id: str, mask: int) -> None:
+        if mask:
+            self._holds[user_id] = mask
+        else:
+            self._holds.pop(user_id, None)
+
+    def get_status(self, seat: Seat) -> SeatStatus:
+        bit = self.mask_of([seat])
+        if self._booked & bit:
+            return SeatStatus.BOOKED
+        if self._locked & bit:
+            return SeatStatus.LOCKED
+        return SeatStatus.AVAILABLE
+
+    def get_available_mask(self) -> int:
+        return self._full_mask() & ~(self._locked | self._booked)
+
+    def get_available_count(self) -> int:
+        return self.get_available_mask().bit_count()
+
+    def get_booked_count(self) -> int:
+        return self._booked.bit_count()
+
+    def get_available_seats(self) -> list[Seat]:
+        return self.seats_of(self.get_available_mask())
+
+    def get_held_seats(self, user_id: str) -> list[Seat]:
+        return self.seats_of(self._holds.get(user_id, 0))
+
+    def get_availability_map(self) -> bytes:
+        """Availability bitmap for clients, little endian (bit i of the map = seat position i)"""
+        seat_count = len(self._screen.get_seats())
+        return self.get_available_mask().to_bytes((seat_count + 7) // 8, "little")
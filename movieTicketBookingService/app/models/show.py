@@ -1,8 +1,11 @@
 from app.models.movie import Movie
 from app.models.seat import Seat
 from app.models.screen import Screen
+from app.models.seat_inventory import SeatInventory
+from app.models.enums import SeatStatus, SeatType
 from datetime import datetime, timedelta
 from app.models.strategy.show_pricing_strategy import ShowPricingStrategy
+from typing import Iterable, Optional
 import uuid
 
 
@@ -14,6 +17,9 @@ class Show:
         self._screen = screen
         self._start_time = start_time
         self._pricing_strategy = pricing_strategy
+        self._build_prices()
+        # Every show on the same screen has its own seat states
+        self._seat_inventory = SeatInventory(screen)
 
     @property
     def id(self) -> str:
@@ -35,6 +41,16 @@ class Show:
     def show_time(self) -> datetime:
         return self._start_time
 
+    @property
+    def seat_inventory(self) -> SeatInventory:
+        return self._seat_inventory
+
+    def get_seat_status(self, seat: Seat) -> SeatStatus:
+        return self._seat_inventory.get_status(seat)
+
+    def get_available_seats(self) -> list[Seat]:
+        return self._seat_inventory.get_available_seats()
+
     def get_movie(self) -> Movie:
         return self._movie
 
@@ -52,3 +68,37 @@ class Show:
 
     def set_pricing_strategy(self, pricing_strategy: ShowPricingStrategy) -> None:
         self._pricing_strategy = pricing_strategy
+        self._build_prices()
+
+    def _build_prices(self) -> None:
+        # One strategy call per seat type, redone only when the strategy changes (or a seat type is added)
+        seat_type_samples = self._screen.get_seat_type_samples()
+        self._type_prices: dict[SeatType, float] = self._pricing_strategy.calculate_type_prices(seat_type_samples)
+        self._priced_seat_count = len(self._screen.get_seats())
+        self._seat_prices: Optional[tuple[dict, tuple[float, ...]]] = None  # (type prices used, price per seat position)
+
+    def _get_type_prices(self) -> dict[SeatType, float]:
+        if self._priced_seat_count != len(self._screen.get_seats()):
+            self._build_prices()
+        return self._type_prices
+
+    def get_seat_price(self, seat: Seat) -> float:
+        return self._get_type_prices()[seat.type]
+
+    def price_seats(self, seats: Iterable[Seat]) -> list[float]:
+        type_prices = self._get_type_prices()
+        return [type_prices[seat.type] for seat in seats]
+
+    def get_seat_prices(self) -> tuple[float, ...]:
+        """Price of every seat of the screen, in seat position order (for rendering the seat map)"""
+        type_prices = self._get_type_prices()
+        cached = self._seat_prices
+        # Built on first use, and rebuilt if the strategy changed meanwhile
+        if cached is None or cached[0] is not type_prices:
+            cached = self._seat_prices = (type_prices, tuple(type_prices[seat.type] for seat in self._screen.get_seats()))
+        return cached[1]
+
+    def get_total_price(self, seats: Iterable[Seat]) -> float:
+        # Table lookups only: no strategy call per seat
+        type_prices = self._get_type_prices()
+        return sum(type_prices[seat.type] for seat in seats)
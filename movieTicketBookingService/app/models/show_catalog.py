@@ -0,0 +1,134 @@
+from datetime import datetime
+from threading import Lock
+from typing import Optional
+from app.models.enums import Genre
+from app.models.interval_tree import IntervalTree
+from app.models.movie import Movie
+from app.models.show import Show
+from app.models.trigram_index import TrigramIndex
+
+
+class ShowCatalog:
+    """
+    Shows and movies with a hash index per filter (city, cinema, movie, genre), a trigram index over movie
+    titles and an interval tree over show start/end times
+    A combined query intersects the matching id sets smallest first and only filters the survivors by time
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.shows: dict[str, Show] = {}
+        self.movies: dict[str, Movie] = {}
+        self.shows_by_city: dict[str, set[str]] = {}
+        self.shows_by_cinema: dict[str, set[str]] = {}
+        self.shows_by_movie: dict[str, set[str]] = {}
+        self.shows_by_genre: dict[Genre, set[str]] = {}
+        self.movies_by_genre: dict[Genre, set[str]] = {}
+        self.titles = TrigramIndex()  # movie id -> title
+        self.show_times: IntervalTree[Show] = IntervalTree()
+
+    @staticmethod
+    def _normalize(city: str) -> str:
+        return city.strip().casefold()
+
+    @staticmethod
+    def _discard(index: dict, key, show_id: str) -> None:
+        ids = index.get(key)
+        if ids is not None:
+            ids.discard(show_id)
+            if not ids:
+                del index[key]
+
+    def _index_keys(self, show: Show) -> list[tuple[dict, object]]:
+        keys: list[tuple[dict, object]] = [(self.shows_by_movie, show.movie.id), (self.shows_by_genre, show.movie.genre)]
+        cinema = show.screen.cinema
+        if cinema is not None:
+            keys.append((self.shows_by_city, self._normalize(cinema.city)))
+            keys.append((self.shows_by_cinema, cinema.id))
+        return keys
+
+    def add_movie(self, movie: Movie) -> None:
+        with self.lock:
+            self._add_movie(movie)
+
+    def _add_movie(self, movie: Movie) -> None:
+        if movie.id in self.movies:
+            return
+        self.movies[movie.id] = movie
+        self.movies_by_genre.setdefault(movie.genre, set()).add(movie.id)
+        self.titles.add(movie.id, movie.title)
+
+    def add_show(self, show: Show) -> None:
+        with self.lock:
+            if show.id in self.shows:
+                return
+            self._add_movie(show.movie)
+            self.shows[show.id] = show
+            for index, key in self._index_keys(show):
+                index.setdefault(key, set()).add(show.id)
+            self.show_times.add(show.id, show.get_start_time(), show.get_end_time(), show)
+
+    def remove_show(self, show: Show) -> None:
+        with self.lock:
+            if self.shows.pop(show.id, None) is None:
+                return
+            for index, key in self._index_keys(show):
+                self._discard(index, key, show.id)
+            self.show_times.remove(show.id)
+
+    def get_movies_by_title(self, title: str) -> list[Movie]:
+        with self.lock:
+            return sorted((self.movies[movie_id] for movie_id in self.titles.search(title)), key=lambda movie: movie.title)
+
+    def get_movies_by_genre(self, genre: Genre) -> list[Movie]:
+        with self.lock:
+            return sorted((self.movies[movie_id] for movie_id in self.movies_by_genre.get(genre, ())), key=lambda movie: movie.title)
+
+    def find_shows(
+        self,
+        city: Optional[str] = None,
+        cinema_id: Optional[str] = None,
+        movie_id: Optional[str] = None,
+        genre: Optional[Genre] = None,
+        title: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> list[Show]:
+        """
+        Shows matching every given filter, in start time order
+        With start and/or end, a show matches when it is running at some point of [start, end]
+        """
+        with self.lock:
+            candidates: list[set[str]] = []
+            if city is not None:
+                candidates.append(self.shows_by_city.get(self._normalize(city), set()))
+            if cinema_id is not None:
+                candidates.append(self.shows_by_cinema.get(cinema_id, set()))
+            if movie_id is not None:
+                candidates.append(self.shows_by_movie.get(movie_id, set()))
+            if genre is not None:
+                candidates.append(self.shows_by_genre.get(genre, set()))
+            if title is not None:
+                title_shows: set[str] = set()
+                for matched_movie in self.titles.search(title):
+                    title_shows |= self.shows_by_movie.get(matched_movie, set())
+                candidates.append(title_shows)
+
+            timed = start is not None or end is not None
+            if not candidates:
+                shows = self.show_times.overlapping(start or datetime.min, end or datetime.max) if timed else sorted(self.shows.values(), key=Show.get_start_time)
+                return list(shows)
+
+            candidates.sort(key=len)
+            show_ids = candidates[0].intersection(*candidates[1:])
+            if timed and len(show_ids) > len(self.show_times) // 8:
+                # A wide hash match is cheaper to narrow through the interval tree than to check one by one
+                return [show for show in self.show_times.overlapping(start or datetime.min, end or datetime.max) if show.id in show_ids]
+            shows = [self.shows[show_id] for show_id in show_ids]
+            if timed:
+                shows = [show for show in shows if (end is None or show.get_start_time() <= end) and (start is None or show.get_end_time() >= start)]
+            return sorted(shows, key=Show.get_start_time)
+
+    def get_shows_running_at(self, moment: datetime) -> list[Show]:
+        with self.lock:
+            return self.show_times.containing(moment)
@@ -5,6 +5,7 @@
 # Vip shows: Luxury price
 
 from abc import ABC, abstractmethod
+from app.models.enums import SeatType
 from app.models.seat import Seat
 
 
@@ -13,6 +14,10 @@ class ShowPricingStrategy(ABC):
     def calculate_price(self, seat: Seat) -> float:
         raise NotImplementedError("Subclass must implement this method")
 
+    def calculate_type_prices(self, seat_type_samples: dict[SeatType, Seat]) -> dict[SeatType, float]:
+        # Prices depend on the seat type only, so one call per type prices a whole screen
+        return {seat_type: self.calculate_price(seat) for seat_type, seat in seat_type_samples.items()}
+
 
 class MorningPricingStrategy(ShowPricingStrategy):
     def __init__(self, morning_discount_percentage: float = 0.2):
@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
 from app.models.show import Show
+from app.models.interval_tree import IntervalTree
+from app.models.trigram_index import TrigramIndex
 from datetime import datetime
 from typing import Any
 from app.models.enums import Genre
@@ -15,15 +17,38 @@ class ShowSearchStrategy(ABC):
 
 
 class DateTimeSearchStrategy(ShowSearchStrategy):
+    """Interval tree over show start/end: O(log n + matches) per query instead of a scan"""
+
+    def __init__(self, shows: list[Show]):
+        super().__init__(shows)
+        self.show_times: IntervalTree[Show] = IntervalTree()
+        for show in shows:
+            self.show_times.add(show.id, show.get_start_time(), show.get_end_time(), show)
+
     def search(self, query: datetime) -> list[Show]:
-        return [show for show in self.shows if query >= show.get_start_time() and query <= show.get_end_time()]
+        return self.show_times.containing(query)
 
 
 class MovieNameSearchStrategy(ShowSearchStrategy):
+    def __init__(self, shows: list[Show]):
+        super().__init__(shows)
+        self.titles = TrigramIndex()
+        self.shows_by_movie: dict[str, list[Show]] = {}
+        for show in shows:
+            self.titles.add(show.movie.id, show.movie.title)
+            self.shows_by_movie.setdefault(show.movie.id, []).append(show)
+
     def search(self, query: str) -> list[Show]:
-        return [show for show in self.shows if query in show.movie.title]
+        # Case-insensitive substring match on the title
+        return [show for movie_id in self.titles.search(query) for show in self.shows_by_movie[movie_id]]
 
 
 class GenreSearchStrategy(ShowSearchStrategy):
+    def __init__(self, shows: list[Show]):
+        super().__init__(shows)
+        self.shows_by_genre: dict[Genre, list[Show]] = {}
+        for show in shows:
+            self.shows_by_genre.setdefault(show.movie.genre, []).append(show)
+
     def search(self, query: Genre) -> list[Show]:
-        return [show for show in self.shows if query in show.movie.genre]
+        return list(self.shows_by_genre.get(query, ()))
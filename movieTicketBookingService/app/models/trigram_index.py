@@ -0,0 +1,48 @@
+from typing import Hashable
+
+
+class TrigramIndex:
+    """
+    Substring index over short texts (movie titles): every 1-, 2- and 3-gram of a text points to its key
+    A query intersects the postings of its trigrams, rarest first, and only verifies the survivors
+    """
+
+    GRAM_SIZE = 3
+
+    def __init__(self):
+        self.postings: dict[str, set[Hashable]] = {}
+        self.texts: dict[Hashable, str] = {}
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return " ".join(text.casefold().split())
+
+    def _grams(self, text: str) -> set[str]:
+        return {text[index : index + size] for size in range(1, self.GRAM_SIZE + 1) for index in range(len(text) - size + 1)}
+
+    def add(self, key: Hashable, text: str) -> None:
+        self.remove(key)
+        text = self.normalize(text)
+        self.texts[key] = text
+        for gram in self._grams(text):
+            self.postings.setdefault(gram, set()).add(key)
+
+    def remove(self, key: Hashable) -> None:
+        text = self.texts.pop(key, None)
+        if text is None:
+            return
+        for gram in self._grams(text):
+            posting = self.postings[gram]
+            posting.discard(key)
+            if not posting:
+                del self.postings[gram]
+
+    def search(self, query: str) -> set[Hashable]:
+        query = self.normalize(query)
+        if not query:
+            return set()
+        if len(query) <= self.GRAM_SIZE:
+            return set(self.postings.get(query, ()))
+        grams = {query[index : index + self.GRAM_SIZE] for index in range(len(query) - self.GRAM_SIZE + 1)}
+        postings = sorted((self.postings.get(gram, set()) for gram in grams), key=len)
+        return {key for key in set.intersection(*postings) if query in self.texts[key]}
@@ -2,6 +2,8 @@ from app.services.payment_service import PaymentService
 from app.services.search_service import SearchService
 from app.services.booking_service import BookingService
 from app.services.user_service import UserService
+from app.services.sharded_booking_service import ShardedBookingService
+from concurrent.futures import Future
 from app.models.user import User
 from app.models.show import Show
 from app.models.seat import Seat
@@ -11,7 +13,7 @@ from typing import Optional
 from threading import Lock
 from app.models.cinema import Cinema
 from app.models.movie import Movie
-from app.models.enums import PaymentStatus
+from app.models.enums import PaymentStatus, SeatType
 
 
 class MovieTicketBookingService:
@@ -32,6 +34,8 @@ class MovieTicketBookingService:
         self.search_service = SearchService()
         self.booking_service = BookingService()
         self.user_service = UserService()
+        # Asynchronous bookings, sharded by show onto worker queues
+        self.booking_pipeline = ShardedBookingService(self.booking_service, self.payment_service)
         self.cinema: dict[str, Cinema] = {}
         self.show: dict[str, Show] = {}
         self.movie: dict[str, Movie] = {}
@@ -53,6 +57,7 @@ class MovieTicketBookingService:
         if show.id in self.show:
             raise ValueError(f"Show with id {show.id} already exists")
         self.show[show.id] = show
+        self.search_service.add_show(show)
 
     def get_show(self, show_id: str) -> Show:
         if show_id not in self.show:
@@ -73,6 +78,7 @@ class MovieTicketBookingService:
         if movie.id in self.movie:
             raise ValueError(f"Movie with id {movie.id} already exists")
         self.movie[movie.id] = movie
+        self.search_service.add_movie(movie)
 
     def get_movie(self, movie_id: str) -> Movie:
         if movie_id not in self.movie:
@@ -86,8 +92,20 @@ class MovieTicketBookingService:
             print("Booking failed. Please try again.")
             return None
         print(f"Booking {booking.id} created successfully.")
+        return self._pay_and_confirm(booking, payment_strategy)
 
-        # Process payment
+    def book_best_available(self, user: User, show: Show, count: int, payment_strategy: PaymentStrategy, seat_type: Optional[SeatType] = None) -> Optional[Booking]:
+        # Books the count adjacent seats (of seat_type, if given) closest to the centre of the screen
+        booking = self.booking_service.create_best_available_booking(user, show, count, seat_type, payment_strategy)
+        if booking is None:
+            print("Booking failed. Please try again.")
+            return None
+        print(f"Booking {booking.id} created successfully for seats {[f'{seat.row}-{seat.col}' for seat in booking.seats]}.")
+        return self._pay_and_confirm(booking, payment_strategy)
+
+    def _pay_and_confirm(self, booking: Booking, payment_strategy: PaymentStrategy) -> Optional[Booking]:
+        # Process payment, with the seat hold restarted so it cannot expire mid-payment
+        self.booking_service.extend_hold(booking)
         payment_result = self.payment_service.process_payment(booking.total_price, payment_strategy)
         if not payment_result.status == PaymentStatus.SUCCESS:
             print("Payment failed. Please try again.")
@@ -95,8 +113,19 @@ class MovieTicketBookingService:
 
         print(f"Payment {payment_result.id} processed successfully.")
         # Confirm booking
-        self.booking_service.confirm_booking(booking)
+        if not self.booking_service.confirm_booking(booking):
+            print("Booking could not be confirmed. Please try again.")
+            return None
         return booking
 
+    def book_tickets_async(self, user: User, show: Show, seats: list[Seat], payment_strategy: PaymentStrategy, idempotency_key: Optional[str] = None) -> "Future[Optional[Booking]]":
+        # Returns at once; the future resolves to the confirmed booking, or None if it failed
+        return self.booking_pipeline.book_tickets(user, show, seats, payment_strategy, idempotency_key)
+
+    def book_best_available_async(
+        self, user: User, show: Show, count: int, payment_strategy: PaymentStrategy, seat_type: Optional[SeatType] = None, idempotency_key: Optional[str] = None
+    ) -> "Future[Optional[Booking]]":
+        return self.booking_pipeline.book_best_available(user, show, count, payment_strategy, seat_type, idempotency_key)
+
     def cancel_booking(self, booking: Booking) -> None:
         self.booking_service.cancel_booking(booking)
@@ -1,74 +1,88 @@
 from app.models.show import Show
 from app.models.seat import Seat
 from app.models.user import User
-from app.models.enums import SeatStatus
-from collections import defaultdict
-from concurrent.futures import ThreadPoolExecutor
+from app.models.enums import SeatType
+from app.timer_wheel import HashedTimerWheel, TimerTask
 from threading import Lock
-import time
+from typing import Optional
 
 
-# We will use threadpool executor to schedule the task to unlock the seats after a timeout
+# Seat holds expire through one shared timer wheel instead of a sleeping worker per hold
 class SeatLockManager:
-    def __init__(self):
-        self.max_workers = 5
+    def __init__(self, timer_wheel: Optional[HashedTimerWheel] = None):
         self.lock_timeout = 2  # 2 seconds
-        self.locked_seats: dict[Show, dict[Seat, User]] = defaultdict(dict)
-        self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        self.timer_wheel = timer_wheel or HashedTimerWheel()
+        # One expiry timer per (show, user): everything a user holds on a show expires together
+        self.hold_timers: dict[tuple[str, str], TimerTask] = {}
+        self.lock = Lock()
 
     def lock_seats(self, show: Show, seats: list[Seat], user: User) -> bool:
-        # We will use Show's instance level lock to ensure atomicity for that specific show
-        # Because if we use class level lock, then multiple shows will be locked and we will not be able to lock the seats for that show
-        if getattr(show, "_lock", None) is None:
-            show_lock = Lock()
-            setattr(show, "_lock", show_lock)
-        with show._lock:
-            # Check if any of the requested seats are already locked or booked
-            for seat in seats:
-                if seat.status != SeatStatus.AVAILABLE:
-                    print(f"Seat {seat.id} ,row {seat.row} ,column {seat.col} is not available. Locking failed.")
-                    return False
+        # The show's seat inventory checks and holds all requested seats in one atomic step
+        # (per show, so locking seats of one show never blocks another show)
+        if not show.seat_inventory.try_lock(str(user.id), show.seat_inventory.mask_of(seats)):
+            print(f"Seats {[f'row {seat.row} column {seat.col}' for seat in seats]} are not all available. Locking failed.")
+            return False
 
-            # Lock the seats and mark the locked seats in the name of current user
-            for seat in seats:
-                seat.set_status(SeatStatus.LOCKED)
-                self.locked_seats[show][seat] = user
+        # Unlock the seats after a timeout (Just in case the booking is not confirmed or user is not able to pay)
+        self._schedule_expiry(show, str(user.id), self.lock_timeout)
+        return True
 
-            # Schedule a task to unlock the seats after a timeout (Just in case the booking is not confirmed or user is not able to pay)
-            self.executor.submit(self.unlock_seats_impl, show, seats, user)
-            return True
+    def lock_best_available(self, show: Show, user: User, count: int, seat_type: Optional[SeatType] = None) -> list[Seat]:
+        """Holds the count adjacent seats (of seat_type, if given) closest to the centre; empty if no such block is free"""
+        # Choosing and holding the block is one atomic step, so there is nothing to retry on contention
+        mask = show.seat_inventory.try_lock_best_block(str(user.id), count, seat_type)
+        if not mask:
+            print(f"No {count} adjacent {seat_type.name + ' ' if seat_type else ''}seats available. Locking failed.")
+            return []
+        self._schedule_expiry(show, str(user.id), self.lock_timeout)
+        return show.seat_inventory.seats_of(mask)
 
-    def unlock_seats_impl(self, show: Show, seats: list[Seat], user: User):
-        time.sleep(self.lock_timeout)
-        self.unlock_seats(show, seats, user)
+    def extend_hold(self, show: Show, user: User, seconds: Optional[float] = None) -> bool:
+        """Restarts the user's hold timer on the show (e.g. while payment is in progress)"""
+        with self.lock:
+            if (show.id, str(user.id)) not in self.hold_timers:
+                return False
+        self._schedule_expiry(show, str(user.id), self.lock_timeout if seconds is None else seconds)
+        return True
 
-    def unlock_seats(self, show: Show, seats: list[Seat], user: User) -> None:
-        # Check if these seats are still locked by the same user, And we will use the same lock
-        # First Check if there is lock for the show, if not return because if these seats were locked for current show then that show must have lock
-        if getattr(show, "_lock", None) is None:
-            return
+    def _schedule_expiry(self, show: Show, user_id: str, seconds: float) -> None:
+        key = (show.id, user_id)
+        with self.lock:
+            previous = self.hold_timers.get(key)
+            if previous is not None:
+                self.timer_wheel.cancel(previous)
+            self.hold_timers[key] = self.timer_wheel.schedule(seconds, lambda task: self._expire_hold(show, user_id, task))
 
-        with show._lock:
-            if self.locked_seats.get(show, None) is None:
+    def _expire_hold(self, show: Show, user_id: str, task: TimerTask) -> None:
+        with self.lock:
+            # The hold may have been extended or completed after this timer was picked up
+            if self.hold_timers.get((show.id, user_id)) is not task:
                 return
-            locked_seats = self.locked_seats[show]
-            # Check if the seats are still locked by the same user (The current implementation supports partial booking but in real world, we will not allow partial booking)
-            for seat in seats:
-                if seat in locked_seats and locked_seats[seat] == user:
-                    if seat.status == SeatStatus.LOCKED:
-                        print(f"Unlocked seat: {seat.id} ,row {seat.row} ,column {seat.col} due to timeout.")
-                        seat.set_status(SeatStatus.AVAILABLE)
-                    else:
-                        print(f"Unlocked seat: {seat.id} ,row {seat.row} ,column {seat.col} due to booking completion.")
-                    del locked_seats[seat]
-            # If there are no locked seats for the show, then remove the show from the locked_seats dictionary
-            if len(locked_seats) == 0:
-                del self.locked_seats[show]
+            del self.hold_timers[(show.id, user_id)]
+        released = show.seat_inventory.release_all(user_id)
+        if released:
+            print(f"Unlocked {released.bit_count()} seat(s) of show {show.name} due to timeout.")
+
+    def complete_hold(self, show: Show, user: User) -> None:
+        # Cancel the expiry timer once the user holds nothing more on the show (booking confirmed or released)
+        key = (show.id, str(user.id))
+        with self.lock:
+            task = self.hold_timers.get(key)
+            if task is not None and not show.seat_inventory.get_held_seats(str(user.id)):
+                self.timer_wheel.cancel(task)
+                del self.hold_timers[key]
+
+    def confirm_seats(self, show: Show, seats: list[Seat], user: User) -> bool:
+        # Fails as a whole if any of the user's holds has already expired
+        confirmed = show.seat_inventory.confirm(str(user.id), show.seat_inventory.mask_of(seats))
+        self.complete_hold(show, user)
+        return confirmed
+
+    def unlock_seats(self, show: Show, seats: list[Seat], user: User) -> None:
+        # Only seats still held by this user are released; booked seats are left untouched
+        show.seat_inventory.release(str(user.id), show.seat_inventory.mask_of(seats))
+        self.complete_hold(show, user)
 
     def get_user_locked_seats(self, show: Show, user_id: str) -> list[Seat]:
         """Get all seats locked by a specific user in a show"""
-        if show not in self.locked_seats:
-            return []
-
-        show_locks = self.locked_seats[show]
-        return [seat for seat, locked_user_id in show_locks.items() if locked_user_id == user_id]
+        return show.seat_inventory.get_held_seats(str(user_id))
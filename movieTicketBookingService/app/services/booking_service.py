@@ -4,39 +4,66 @@ from app.models.user import User
 from app.models.show import Show
 from app.models.seat import Seat
 from app.models.strategy.payment_strategy import PaymentStrategy
+from app.models.enums import SeatType
+from typing import Optional
+from threading import Lock
 
 
 class BookingService:
     def __init__(self) -> None:
         self.seat_lock_manager = SeatLockManager()
         self.booking_history: dict[str, list[Booking]] = {}  # Append only on creation of booking
+        self.history_lock = Lock()  # bookings are created from many threads (callers and booking shards)
 
     # Create booking and mark the seats as locked for current user using lock manager
     def create_booking(self, user: User, show: Show, seats: list[Seat], payment_strategy: PaymentStrategy) -> Booking:
         booking = Booking(user, show, seats)
         if not self.seat_lock_manager.lock_seats(show, seats, user):
             return None
+        self._record_booking(booking)
+        return booking
+
+    # Create booking for the best available block of adjacent seats, chosen and locked in one step
+    def create_best_available_booking(self, user: User, show: Show, count: int, seat_type: Optional[SeatType], payment_strategy: PaymentStrategy) -> Optional[Booking]:
+        seats = self.seat_lock_manager.lock_best_available(show, user, count, seat_type)
+        if not seats:
+            return None
+        booking = Booking(user, show, seats)
+        self._record_booking(booking)
+        return booking
+
+    def _record_booking(self, booking: Booking) -> None:
+        user = booking.user
         user.update_booking_status(booking)
         # Add booking to the user's bookings history
-        if user.id not in self.booking_history:
-            self.booking_history[user.id] = []
-        self.booking_history[user.id].append(booking)
-        return booking
+        with self.history_lock:
+            self.booking_history.setdefault(user.id, []).append(booking)
+
+    def get_booking_history(self, user: User) -> list[Booking]:
+        with self.history_lock:
+            return list(self.booking_history.get(user.id, ()))
+
+    # Keep the seats held while a slow step (payment) is in progress
+    def extend_hold(self, booking: Booking) -> bool:
+        return self.seat_lock_manager.extend_hold(booking.show, booking.user)
 
-    # Confirm booking and mark the seats as booked
-    def confirm_booking(self, booking: Booking) -> None:
-        booking.confirm_booking()
+    # Confirm booking and mark the seats as booked (the show's inventory moves them from held to booked)
+    def confirm_booking(self, booking: Booking) -> bool:
+        confirmed = booking.confirm_booking()
+        # The hold is over either way: stop its expiry timer
+        self.seat_lock_manager.complete_hold(booking.show, booking.user)
+        if not confirmed:
+            booking.user.update_booking_status(booking)
+            return False
         # Add booking to the user's bookings history
         booking.user.add_booking_to_history(booking)
         booking.user.update_booking_status(booking)
-        # Unlock the seats
-        self.seat_lock_manager.unlock_seats(booking.show, booking.seats, booking.user)
+        return True
 
     # Cancel booking and mark the seats as available
     def cancel_booking(self, booking: Booking) -> None:
         booking.cancel_booking()
+        self.seat_lock_manager.complete_hold(booking.show, booking.user)
         # Remove booking from the user's bookings history
         booking.user.remove_booking_from_history(booking)
         booking.user.update_booking_status(booking)
-        # Unlock the seats
-        self.seat_lock_manager.unlock_seats(booking.show, booking.seats, booking.user)
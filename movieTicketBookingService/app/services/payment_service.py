@@ -1,8 +1,59 @@
 from app.models.strategy.payment_strategy import PaymentStrategy
 from app.models.payment import PaymentResult
+from app.models.enums import PaymentStatus
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import BoundedSemaphore, Lock
+from typing import Optional
 
 
 class PaymentService:
-    def process_payment(self, amount: float, payment_strategy: PaymentStrategy) -> PaymentResult:
-        payment_result = payment_strategy.pay(amount)
-        return payment_result
+    MAX_WORKERS = 32
+    MAX_PENDING = 1024  # payments queued or running before process_payment_async blocks the caller
+    IDEMPOTENCY_TABLE_SIZE = 100_000  # finished payments remembered, oldest forgotten first
+
+    def __init__(self, max_workers: int = MAX_WORKERS, max_pending: int = MAX_PENDING):
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.max_workers = max_workers
+        self.pending = BoundedSemaphore(max_pending)
+        # Idempotency key -> payment, so a retried request never charges twice
+        self.payments: "OrderedDict[str, Future]" = OrderedDict()
+        self.lock = Lock()
+
+    def process_payment(self, amount: float, payment_strategy: PaymentStrategy, idempotency_key: Optional[str] = None) -> PaymentResult:
+        if idempotency_key is None:
+            return payment_strategy.pay(amount)
+        return self.process_payment_async(amount, payment_strategy, idempotency_key).result()
+
+    def process_payment_async(self, amount: float, payment_strategy: PaymentStrategy, idempotency_key: str) -> "Future[PaymentResult]":
+        """Runs the payment on the bounded executor; the same key always returns the same payment"""
+        with self.lock:
+            payment = self.payments.get(idempotency_key)
+            if payment is not None:
+                return payment
+            payment = self.payments[idempotency_key] = Future()
+            # Payments still running are never forgotten, so a retry of one cannot pay twice
+            while len(self.payments) > self.IDEMPOTENCY_TABLE_SIZE:
+                key, oldest = next(iter(self.payments.items()))
+                if not oldest.done():
+                    break
+                del self.payments[key]
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="payment")
+
+        # Backpressure: wait for a free slot instead of queueing without bound
+        self.pending.acquire()
+        self.executor.submit(self._pay, payment, amount, payment_strategy)
+        return payment
+
+    def _pay(self, payment: Future, amount: float, payment_strategy: PaymentStrategy) -> None:
+        try:
+            payment.set_result(payment_strategy.pay(amount))
+        except Exception as e:
+            payment.set_result(PaymentResult(amount, PaymentStatus.FAILED, str(e)))
+        finally:
+            self.pending.release()
+
+    def refund(self, payment_result: PaymentResult) -> PaymentResult:
+        print(f"Refunding {payment_result.amount} for payment {payment_result.id}")
+        return PaymentResult(payment_result.amount, PaymentStatus.REFUNDED, f"Refund of payment {payment_result.id}")
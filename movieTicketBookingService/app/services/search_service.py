@@ -1,31 +1,46 @@
 from app.models.show import Show
 from app.models.movie import Movie
 from app.models.enums import Genre
-from typing import Any
+from app.models.show_catalog import ShowCatalog
+from datetime import datetime
+from typing import Optional
 
 
 class SearchService:
     def __init__(self) -> None:
-        self.shows: list[Show] = []
-        self.movies: list[Movie] = []
+        # Indexed by city, cinema, movie, genre, title trigrams and show time
+        self.catalog = ShowCatalog()
 
     def search_movies_by_name(self, name: str) -> list[Movie]:
-        return [movie for movie in self.movies if name.lower() in movie.title.lower()]
+        return self.catalog.get_movies_by_title(name)
 
     def search_movies_by_genre(self, genre: Genre) -> list[Movie]:
-        return [movie for movie in self.movies if movie.genre == genre]
+        return self.catalog.get_movies_by_genre(genre)
 
     def search_shows_by_city(self, city: str) -> list[Show]:
-        return [show for show in self.shows if city.lower() in show.screen.cinema.city.lower()]
+        return self.catalog.find_shows(city=city)
+
+    def search_shows_running_at(self, moment: datetime) -> list[Show]:
+        return self.catalog.get_shows_running_at(moment)
+
+    def search_shows(
+        self,
+        city: Optional[str] = None,
+        cinema_id: Optional[str] = None,
+        movie_id: Optional[str] = None,
+        genre: Optional[Genre] = None,
+        title: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> list[Show]:
+        """Combined query, e.g. city X, genre Y, running between 6pm and 9pm"""
+        return self.catalog.find_shows(city, cinema_id, movie_id, genre, title, start, end)
 
     def add_show(self, show: Show) -> None:
-        if show not in self.shows:
-            self.shows.append(show)
+        self.catalog.add_show(show)
 
     def add_movie(self, movie: Movie) -> None:
-        if movie not in self.movies:
-            self.movies.append(movie)
+        self.catalog.add_movie(movie)
 
     def remove_show(self, show: Show) -> None:
-        if show in self.shows:
-            self.shows.remove(show)
+        self.catalog.remove_show(show)
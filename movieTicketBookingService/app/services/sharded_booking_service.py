@@ -0,0 +1,136 @@
+from app.models.booking import Booking
+from app.models.enums import BookingStatus, PaymentStatus, SeatType
+from app.models.payment import PaymentResult
+from app.models.seat import Seat
+from app.models.show import Show
+from app.models.strategy.payment_strategy import PaymentStrategy
+from app.models.user import User
+from app.services.booking_service import BookingService
+from app.services.payment_service import PaymentService
+from collections import OrderedDict
+from concurrent.futures import Future
+from queue import SimpleQueue
+from threading import Lock, Thread
+from typing import Callable, Optional
+import zlib
+
+
+class ShardedBookingService:
+    """
+    Asynchronous booking pipeline for ticket drops
+    - Requests are sharded by show id onto single-threaded worker queues: every step touching a show's seats
+      runs on that show's shard, in arrival order, so a popular show never contends with itself or others
+    - Payments run on PaymentService's bounded executor; when one completes, the confirmation is queued
+      back onto the show's shard
+    - Each request returns a Future resolved with the confirmed Booking, or None if it failed; an unexpected
+      error sets it as the future's exception and releases the held seats
+    - An idempotency key makes a retried request return the first request's future (and never pay twice)
+    """
+
+    DEFAULT_SHARDS = 8
+    IDEMPOTENCY_TABLE_SIZE = 100_000  # finished requests remembered, oldest forgotten first
+
+    def __init__(self, booking_service: BookingService, payment_service: PaymentService, shard_count: int = DEFAULT_SHARDS):
+        if shard_count <= 0:
+            raise ValueError("Shard count must be positive")
+        self.booking_service = booking_service
+        self.payment_service = payment_service
+        self.shards: list[SimpleQueue] = [SimpleQueue() for _ in range(shard_count)]
+        self.requests: "OrderedDict[str, Future]" = OrderedDict()  # idempotency key -> booking future
+        self.lock = Lock()
+        for index, shard in enumerate(self.shards):
+            Thread(target=self._run_shard, args=(shard,), name=f"booking-shard-{index}", daemon=True).start()
+
+    def _shard_of(self, show: Show) -> SimpleQueue:
+        # crc32 rather than hash(): stable across processes
+        return self.shards[zlib.crc32(show.id.encode()) % len(self.shards)]
+
+    @staticmethod
+    def _run_shard(shard: SimpleQueue) -> None:
+        while True:
+            task = shard.get()
+            try:
+                task()
+            except Exception as e:
+                print(f"Booking shard task failed: {e}")
+
+    def book_tickets(self, user: User, show: Show, seats: list[Seat], payment_strategy: PaymentStrategy, idempotency_key: Optional[str] = None) -> "Future[Optional[Booking]]":
+        return self._submit(show, lambda: self.booking_service.create_booking(user, show, seats, payment_strategy), payment_strategy, idempotency_key)
+
+    def book_best_available(
+        self, user: User, show: Show, count: int, payment_strategy: PaymentStrategy, seat_type: Optional[SeatType] = None, idempotency_key: Optional[str] = None
+    ) -> "Future[Optional[Booking]]":
+        return self._submit(show, lambda: self.booking_service.create_best_available_booking(user, show, count, seat_type, payment_strategy), payment_strategy, idempotency_key)
+
+    def _submit(self, show: Show, create: Callable[[], Optional[Booking]], payment_strategy: PaymentStrategy, idempotency_key: Optional[str]) -> Future:
+        result: Future = Future()
+        if idempotency_key is not None:
+            with self.lock:
+                existing = self.requests.get(idempotency_key)
+                if existing is not None:
+                    return existing
+                self.requests[idempotency_key] = result
+                self._evict_finished_requests()
+        self._shard_of(show).put(lambda: self._create(create, payment_strategy, idempotency_key, result))
+        return result
+
+    def _evict_finished_requests(self) -> None:
+        # Callers hold self.lock; requests still in flight are never forgotten
+        while len(self.requests) > self.IDEMPOTENCY_TABLE_SIZE:
+            key, oldest = next(iter(self.requests.items()))
+            if not oldest.done():
+                break
+            del self.requests[key]
+
+    def _create(self, create: Callable[[], Optional[Booking]], payment_strategy: PaymentStrategy, idempotency_key: Optional[str], result: Future) -> None:
+        # Runs on the show's shard
+        try:
+            booking = create()
+        except Exception as e:
+            result.set_exception(e)
+            return
+        if booking is None:
+            result.set_result(None)
+            return
+        try:
+            # Keep the seats held while the payment waits for a slot and runs
+            self.booking_service.extend_hold(booking)
+            payment = self.payment_service.process_payment_async(booking.total_price, payment_strategy, idempotency_key or booking.id)
+            shard = self._shard_of(booking.show)
+            payment.add_done_callback(lambda done: shard.put(lambda: self._confirm(booking, done, result)))
+        except Exception as e:
+            self._fail(booking, None, result, e)
+
+    def _confirm(self, booking: Booking, payment: "Future[PaymentResult]", result: Future) -> None:
+        # Runs on the show's shard once the payment has completed
+        payment_result = None
+        try:
+            payment_result = payment.result()
+            if payment_result.status != PaymentStatus.SUCCESS:
+                self.booking_service.cancel_booking(booking)
+                result.set_result(None)
+                return
+            if not self.booking_service.confirm_booking(booking):
+                # The hold expired while paying: give the money back
+                self.payment_service.refund(payment_result)
+                result.set_result(None)
+                return
+            result.set_result(booking)
+        except Exception as e:
+            self._fail(booking, payment_result, result, e)
+
+    def _fail(self, booking: Booking, payment_result: Optional[PaymentResult], result: Future, error: Exception) -> None:
+        """Release the held seats, refund a successful payment and hand the error to the caller"""
+        if result.done():
+            return
+        if booking.status != BookingStatus.CONFIRMED:
+            try:
+                self.booking_service.cancel_booking(booking)
+                if payment_result is not None and payment_result.status == PaymentStatus.SUCCESS:
+                    self.payment_service.refund(payment_result)
+            except Exception as e:
+                print(f"Could not release booking {booking.id}: {e}")
+        result.set_exception(error)
+
+    def get_queue_depth(self, show: Show) -> int:
+        return self._shard_of(show).qsize()
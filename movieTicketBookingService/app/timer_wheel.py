@@ -0,0 +1,91 @@
+from itertools import count
+from threading import Event, Lock, Thread
+from time import monotonic
+from typing import Callable, Optional
+
+
+class TimerTask:
+    def __init__(self, id: int, deadline: float, deadline_tick: int, callback: Callable[["TimerTask"], None]):
+        self.id = id
+        self.deadline = deadline
+        self.deadline_tick = deadline_tick
+        self.callback = callback
+        self.cancelled = False
+
+
+# A single hashed timer wheel thread replaces one sleeping worker per timeout
+class HashedTimerWheel:
+    """
+    Timers are hashed into wheel_size slots by their deadline tick. Every tick the worker only visits
+    the current slot, so scheduling and cancelling are O(1) and each timer is visited once per wheel
+    revolution until it fires. Timers longer than one revolution stay in their slot for extra rounds.
+    Callbacks run on the wheel thread, so they should be short.
+    """
+
+    def __init__(self, tick_duration: float = 0.01, wheel_size: int = 512):
+        if tick_duration <= 0 or wheel_size <= 0:
+            raise ValueError("Tick duration and wheel size must be positive")
+        self.tick_duration = tick_duration
+        self.wheel_size = wheel_size
+        self.slots: list[dict[int, TimerTask]] = [{} for _ in range(wheel_size)]
+        self.lock = Lock()
+        self.ids = count()
+        self.start_time = monotonic()
+        self.processed_tick = 0
+        self.pending = 0
+        self.stopped = Event()
+        self.worker: Optional[Thread] = None
+
+    def _tick_of(self, timestamp: float) -> int:
+        return int((timestamp - self.start_time) / self.tick_duration)
+
+    def schedule(self, delay_seconds: float, callback: Callable[[TimerTask], None]) -> TimerTask:
+        deadline = monotonic() + delay_seconds
+        with self.lock:
+            # Round up so a timer never fires before its deadline, and never into an already processed tick
+            deadline_tick = max(self._tick_of(deadline) + 1, self.processed_tick + 1)
+            task = TimerTask(next(self.ids), deadline, deadline_tick, callback)
+            self.slots[deadline_tick % self.wheel_size][task.id] = task
+            self.pending += 1
+            if self.worker is None:
+                self.worker = Thread(target=self._run, name="timer-wheel", daemon=True)
+                self.worker.start()
+        return task
+
+    def cancel(self, task: TimerTask) -> bool:
+        """Returns False when the timer already fired or was cancelled"""
+        with self.lock:
+            if self.slots[task.deadline_tick % self.wheel_size].pop(task.id, None) is None:
+                return False
+            task.cancelled = True
+            self.pending -= 1
+            return True
+
+    def get_pending_count(self) -> int:
+        return self.pending
+
+    def stop(self) -> None:
+        self.stopped.set()
+
+    def _run(self) -> None:
+        while not self.stopped.is_set():
+            current_tick = self._tick_of(monotonic())
+            due: list[TimerTask] = []
+            with self.lock:
+                # Catch up on every tick missed while the previous callbacks were running
+                while self.processed_tick < current_tick:
+                    self.processed_tick += 1
+                    slot = self.slots[self.processed_tick % self.wheel_size]
+                    for task in [task for task in slot.values() if task.deadline_tick <= self.processed_tick]:
+                        del slot[task.id]
+                        due.append(task)
+                self.pending -= len(due)
+
+            for task in due:
+                try:
+                    task.callback(task)
+                except Exception as error:
+                    print(f"Timer callback failed: {error}")
+
+            next_tick_at = self.start_time + (self.processed_tick + 1) * self.tick_duration
+            self.stopped.wait(max(0.0, next_tick_at - monotonic()))
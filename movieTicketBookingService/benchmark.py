@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+"""
+Movie Ticket Booking Service Benchmarks
+
+Usage: python benchmark.py [seats|holds|search|allocate|drop|pricing|all]
+"""
+
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from app.models.cinema import Cinema
+from app.models.enums import Genre, PaymentStatus, SeatType
+from app.models.movie import Movie
+from app.models.payment import PaymentResult
+from app.models.screen import Screen
+from app.models.seat import Seat
+from app.models.show import Show
+from app.models.strategy.payment_strategy import CashPaymentStrategy, PaymentStrategy
+from app.models.strategy.show_pricing_strategy import EveningPricingStrategy, WeekendPricingStrategy
+from app.models.user import User
+from app.seat_lock_manager import SeatLockManager
+from app.services.booking_service import BookingService
+from app.services.payment_service import PaymentService
+from app.services.search_service import SearchService
+from app.services.sharded_booking_service import ShardedBookingService
+from app.timer_wheel import HashedTimerWheel, TimerTask
+
+
+class SimulatedGatewayPaymentStrategy(PaymentStrategy):
+    """Payment gateway stand-in: fixed latency and a share of declined payments"""
+
+    def __init__(self, latency: float, decline_rate: float, rng: random.Random):
+        self.latency = latency
+        self.declined = rng.random() < decline_rate
+
+    def pay(self, amount: float) -> PaymentResult:
+        time.sleep(self.latency)
+        if self.declined:
+            return PaymentResult(amount, PaymentStatus.FAILED, "Declined")
+        return PaymentResult(amount, PaymentStatus.SUCCESS, "Gateway payment successful")
+
+
+class MovieTicketBookingBenchmark:
+    ROWS = 20
+    SEATS_PER_ROW = 25
+    BOOKING_ATTEMPTS = 10_000
+    WORKERS = 64
+    ABANDON_RATE = 0.2  # share of holds released instead of confirmed
+    RENDERS = 10_000
+    OUTSTANDING_HOLDS = 100_000
+    HOLD_SHOWS = 200
+    CATALOG_SHOWS = 100_000
+    CATALOG_CITIES = 50
+    CINEMAS_PER_CITY = 4
+    CATALOG_MOVIES = 2_000
+    CATALOG_DAYS = 30
+    QUERIES = 1_000
+    SCAN_QUERIES = 20
+    IMAX_ROWS = 40
+    IMAX_SEATS_PER_ROW = 72
+    IMAX_AISLES = (18, 54)  # columns left empty for the aisles
+    DROP_USERS = 50_000
+    DROP_RETRY_RATE = 0.05  # share of users resubmitting their request with the same idempotency key
+    PAYMENT_LATENCY = 0.005
+    PAYMENT_DECLINE_RATE = 0.02
+    PRICING_ROWS = 40
+    PRICING_SEATS_PER_ROW = 25
+    PRICED_BOOKINGS = 100_000
+
+    @staticmethod
+    def main():
+        section = sys.argv[1] if len(sys.argv) > 1 else "all"
+
+        print("=" * 60)
+        print("MOVIE TICKET BOOKING SERVICE BENCHMARK")
+        print("=" * 60)
+
+        if section in ("seats", "all"):
+            MovieTicketBookingBenchmark.benchmark_concurrent_bookings()
+        if section in ("holds", "all"):
+            MovieTicketBookingBenchmark.benchmark_timer_wheel_accuracy()
+            MovieTicketBookingBenchmark.benchmark_hold_expiry()
+        if section in ("search", "all"):
+            MovieTicketBookingBenchmark.benchmark_show_search()
+        if section in ("allocate", "all"):
+            MovieTicketBookingBenchmark.benchmark_best_available()
+        if section in ("drop", "all"):
+            MovieTicketBookingBenchmark.benchmark_ticket_drop()
+        if section in ("pricing", "all"):
+            MovieTicketBookingBenchmark.benchmark_pricing()
+
+    @staticmethod
+    def build_show(rows: int, seats_per_row: int) -> Show:
+        seats = []
+        for row in range(rows):
+            seat_type = SeatType.RECLINER if row >= rows - 2 else SeatType.PREMIUM if row >= rows // 2 else SeatType.REGULAR
+            seats.extend(Seat(row, col, seat_type) for col in range(seats_per_row))
+        screen = Screen("Benchmark Screen", seats)
+        movie = Movie("Benchmark Movie", Genre.ACTION, 150)
+        return Show("Benchmark Show", movie, screen, datetime.now(), EveningPricingStrategy())
+
+    @staticmethod
+    def benchmark_concurrent_bookings():
+        show = MovieTicketBookingBenchmark.build_show(MovieTicketBookingBenchmark.ROWS, MovieTicketBookingBenchmark.SEATS_PER_ROW)
+        seats = show.screen.get_seats()
+        booking_service = BookingService()
+        payment_strategy = CashPaymentStrategy()
+
+        rng = random.Random(7)
+        attempts = []
+        for index in range(MovieTicketBookingBenchmark.BOOKING_ATTEMPTS):
+            # Groups of 1-6 adjacent seats in a random row, most people aiming at the middle rows
+            row = min(max(int(rng.gauss(MovieTicketBookingBenchmark.ROWS / 2, MovieTicketBookingBenchmark.ROWS / 4)), 0), MovieTicketBookingBenchmark.ROWS - 1)
+            size = rng.randint(1, 6)
+            start = rng.randint(0, MovieTicketBookingBenchmark.SEATS_PER_ROW - size)
+            group = seats[row * MovieTicketBookingBenchmark.SEATS_PER_ROW + start : row * MovieTicketBookingBenchmark.SEATS_PER_ROW + start + size]
+            attempts.append((User(f"User {index}", f"user{index}@example.com"), group, rng.random() < MovieTicketBookingBenchmark.ABANDON_RATE))
+
+        def attempt(user: User, group: list[Seat], abandon: bool) -> tuple[str, float, list[Seat]]:
+            start_time = time.perf_counter()
+            booking = booking_service.create_booking(user, show, group, payment_strategy)
+            if booking is None:
+                outcome = "rejected"
+            elif abandon:
+                booking_service.cancel_booking(booking)
+                outcome = "abandoned"
+            else:
+                outcome = "confirmed" if booking_service.confirm_booking(booking) else "expired"
+            return outcome, (time.perf_counter() - start_time) * 1000, group
+
+        print(f"\n--- {MovieTicketBookingBenchmark.BOOKING_ATTEMPTS} concurrent booking attempts, {len(seats)}-seat show, {MovieTicketBookingBenchmark.WORKERS} threads ---")
+        # Bookings narrate every step; keep the benchmark output readable
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            start_time = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=MovieTicketBookingBenchmark.WORKERS) as executor:
+                results = list(executor.map(lambda args: attempt(*args), attempts))
+            elapsed = time.perf_counter() - start_time
+
+        outcomes: dict[str, int] = {}
+        for outcome, _, _ in results:
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+        latencies = sorted(latency for _, latency, _ in results)
+        print(f"Completed in {elapsed:.2f}s ({len(attempts) / elapsed:,.0f} attempts/s): {outcomes}")
+        print(f"Attempt latency: mean {statistics.mean(latencies):.3f} ms   p50 {statistics.median(latencies):.3f} ms   p99 {latencies[int(len(latencies) * 0.99) - 1]:.3f} ms")
+
+        # Invariant: every seat is booked at most once and the inventory agrees with the confirmed bookings
+        confirmed_seats = [seat.id for outcome, _, group in results if outcome == "confirmed" for seat in group]
+        inventory = show.seat_inventory
+        assert len(confirmed_seats) == len(set(confirmed_seats)), "Seat booked twice"
+        assert len(confirmed_seats) == inventory.get_booked_count(), "Inventory disagrees with bookings"
+        assert inventory.get_available_count() + inventory.get_booked_count() == len(seats), "Seat left locked"
+        print(f"No double bookings: {len(confirmed_seats)} seats booked, {inventory.get_available_count()} available, 0 locked")
+
+        start_time = time.perf_counter()
+        for _ in range(MovieTicketBookingBenchmark.RENDERS):
+            inventory.get_availability_map()
+        print(f"Availability map ({len(seats)} seats): {(time.perf_counter() - start_time) / MovieTicketBookingBenchmark.RENDERS * 1_000_000:.3f} us")
+
+        group = seats[:4]
+        start_time = time.perf_counter()
+        for index in range(MovieTicketBookingBenchmark.RENDERS):
+            mask = inventory.mask_of(group)
+            if inventory.try_lock("probe", mask):
+                inventory.release("probe", mask)
+        print(f"Atomic 4-seat lock + release: {(time.perf_counter() - start_time) / MovieTicketBookingBenchmark.RENDERS * 1_000_000:.3f} us")
+
+    @staticmethod
+    def benchmark_timer_wheel_accuracy():
+        """Expiry lateness with OUTSTANDING_HOLDS timers of 1-3s, 10% cancelled (confirmed) and 10% extended (paying)"""
+        wheel = HashedTimerWheel()
+        rng = random.Random(7)
+        lateness: list[float] = []
+
+        def on_expire(task: TimerTask):
+            lateness.append((time.monotonic() - task.deadline) * 1000)
+
+        print(f"\n--- Timer wheel accuracy ({MovieTicketBookingBenchmark.OUTSTANDING_HOLDS} outstanding holds, {wheel.tick_duration * 1000:g} ms ticks) ---")
+        start_time = time.perf_counter()
+        tasks = [wheel.schedule(rng.uniform(1.0, 3.0), on_expire) for _ in range(MovieTicketBookingBenchmark.OUTSTANDING_HOLDS)]
+        print(f"Scheduled in {(time.perf_counter() - start_time) / len(tasks) * 1_000_000:.2f} us/hold, pending {wheel.get_pending_count()}")
+
+        start_time = time.perf_counter()
+        for task in rng.sample(tasks, len(tasks) // 10):
+            wheel.cancel(task)
+        for task in rng.sample(tasks, len(tasks) // 10):
+            if wheel.cancel(task):
+                wheel.schedule(1.0, on_expire)
+        print(f"Cancelled/extended 20% in {(time.perf_counter() - start_time) / (len(tasks) // 5) * 1_000_000:.2f} us/operation")
+
+        while wheel.get_pending_count():
+            time.sleep(0.1)
+        wheel.stop()
+        lateness.sort()
+        print(f"Fired {len(lateness)}: lateness p50 {statistics.median(lateness):.2f} ms   p99 {lateness[int(len(lateness) * 0.99) - 1]:.2f} ms   max {lateness[-1]:.2f} ms   early {sum(1 for value in lateness if value < 0)}")
+        print(f"Old executor (5 workers sleeping 2s per hold) would release the last of {len(tasks)} holds after ~{len(tasks) / 5 * 2 / 3600:.1f} h")
+
+    @staticmethod
+    def benchmark_hold_expiry():
+        """End to end: OUTSTANDING_HOLDS single-seat holds over HOLD_SHOWS shows, none confirmed"""
+        seats_per_show = MovieTicketBookingBenchmark.OUTSTANDING_HOLDS // MovieTicketBookingBenchmark.HOLD_SHOWS
+        shows = [MovieTicketBookingBenchmark.build_show(seats_per_show // MovieTicketBookingBenchmark.SEATS_PER_ROW, MovieTicketBookingBenchmark.SEATS_PER_ROW) for _ in range(MovieTicketBookingBenchmark.HOLD_SHOWS)]
+        seat_lock_manager = SeatLockManager()
+        users = [User(f"User {index}", f"user{index}@example.com") for index in range(seats_per_show)]
+
+        print(f"\n--- SeatLockManager expiry ({MovieTicketBookingBenchmark.OUTSTANDING_HOLDS} holds, {seat_lock_manager.lock_timeout}s timeout) ---")
+        start_time = time.perf_counter()
+        for show in shows:
+            for user, seat in zip(users, show.screen.get_seats()):
+                seat_lock_manager.lock_seats(show, [seat], user)
+        locked_at = time.perf_counter()
+        print(f"Placed holds in {locked_at - start_time:.2f}s ({(locked_at - start_time) / MovieTicketBookingBenchmark.OUTSTANDING_HOLDS * 1_000_000:.2f} us/hold)")
+
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            while any(show.seat_inventory.get_available_count() < seats_per_show for show in shows):
+                time.sleep(0.01)
+        released_at = time.perf_counter()
+        print(f"All seats available again {released_at - start_time:.2f}s after the first hold, {released_at - locked_at:.2f}s after the last")
+
+    @staticmethod
+    def measure(name: str, queries: list, run) -> None:
+        latencies = []
+        for query in queries:
+            start_time = time.perf_counter()
+            run(query)
+            latencies.append((time.perf_counter() - start_time) * 1000)
+        latencies.sort()
+        print(f"{name:<34} mean {statistics.mean(latencies):8.3f} ms   p50 {statistics.median(latencies):8.3f} ms   p99 {latencies[int(len(latencies) * 0.99) - 1]:8.3f} ms")
+
+    @staticmethod
+    def benchmark_show_search():
+        """Combined city + genre + time window queries on CATALOG_SHOWS shows, indexed catalog against a full scan"""
+        benchmark = MovieTicketBookingBenchmark
+        rng = random.Random(7)
+        genres = list(Genre)
+        movies = [Movie(f"Movie {index} {rng.choice(['War', 'Love', 'Night', 'Star', 'River'])}", rng.choice(genres), rng.randint(90, 180)) for index in range(benchmark.CATALOG_MOVIES)]
+        cinemas = [Cinema(f"Cinema {city}-{index}", f"City {city}", [Screen(f"Screen {index}", [Seat(0, 0, SeatType.REGULAR)])]) for city in range(benchmark.CATALOG_CITIES) for index in range(benchmark.CINEMAS_PER_CITY)]
+        base_time = datetime(2024, 6, 1)
+
+        search_service = SearchService()
+        shows = []
+        start_time = time.perf_counter()
+        for index in range(benchmark.CATALOG_SHOWS):
+            start = base_time + timedelta(minutes=15 * rng.randrange(benchmark.CATALOG_DAYS * 24 * 4))
+            show = Show(f"Show {index}", rng.choice(movies), rng.choice(cinemas).screens[0], start, EveningPricingStrategy())
+            shows.append(show)
+            search_service.add_show(show)
+        print(f"\n--- Show search ({benchmark.CATALOG_SHOWS} shows, {len(cinemas)} cinemas, {benchmark.CATALOG_MOVIES} movies) ---")
+        print(f"Built and indexed in {time.perf_counter() - start_time:.2f}s")
+
+        queries = []
+        for _ in range(benchmark.QUERIES):
+            evening = base_time + timedelta(days=rng.randrange(benchmark.CATALOG_DAYS), hours=18)
+            queries.append((f"City {rng.randrange(benchmark.CATALOG_CITIES)}", rng.choice(genres), evening, evening + timedelta(hours=3)))
+
+        def scan(query):
+            city, genre, start, end = query
+            return sorted(
+                (show for show in shows if show.screen.cinema.city.lower() == city.lower() and show.movie.genre == genre and show.get_start_time() <= end and show.get_end_time() >= start),
+                key=Show.get_start_time,
+            )
+
+        for query in queries[: benchmark.SCAN_QUERIES]:
+            assert [show.id for show in search_service.search_shows(city=query[0], genre=query[1], start=query[2], end=query[3])] == [show.id for show in scan(query)]
+
+        benchmark.measure("city + genre + 6pm-9pm (indexed)", queries, lambda query: search_service.search_shows(city=query[0], genre=query[1], start=query[2], end=query[3]))
+        benchmark.measure("city + genre + 6pm-9pm (scan)", queries[: benchmark.SCAN_QUERIES], scan)
+        benchmark.measure("running at (interval tree)", [query[2] for query in queries], search_service.search_shows_running_at)
+        benchmark.measure("running at (scan)", [query[2] for query in queries[: benchmark.SCAN_QUERIES]], lambda moment: [show for show in shows if show.get_start_time() <= moment <= show.get_end_time()])
+        benchmark.measure("title substring (trigram)", ["war"] * benchmark.QUERIES, search_service.search_movies_by_name)
+        benchmark.measure("city only", [query[0] for query in queries], search_service.search_shows_by_city)
+
+    @staticmethod
+    def build_imax_show() -> Show:
+        benchmark = MovieTicketBookingBenchmark
+        seats = []
+        for row in range(benchmark.IMAX_ROWS):
+            seat_type = SeatType.RECLINER if row >= benchmark.IMAX_ROWS - 4 else SeatType.PREMIUM if row >= benchmark.IMAX_ROWS // 3 else SeatType.REGULAR
+            seats.extend(Seat(row, col, seat_type) for col in range(benchmark.IMAX_SEATS_PER_ROW) if col not in benchmark.IMAX_AISLES)
+        random.Random(7).shuffle(seats)  # positions in the inventory need not follow the layout
+        return Show("IMAX Show", Movie("Benchmark Movie", Genre.ACTION, 150), Screen("IMAX", seats), datetime.now(), EveningPricingStrategy())
+
+    @staticmethod
+    def block_score(block: list[Seat]) -> float:
+        # Seats away from the centre, counting rows and columns alike (the allocator's ranking)
+        centre_row, centre_col = (MovieTicketBookingBenchmark.IMAX_ROWS - 1) / 2, (MovieTicketBookingBenchmark.IMAX_SEATS_PER_ROW - 1) / 2
+        return abs(block[0].row - centre_row) + abs((block[0].col + block[-1].col) / 2 - centre_col)
+
+    @staticmethod
+    def scan_best_block(show: Show, count: int, seat_type: SeatType) -> list[Seat]:
+        # Reference: try every start seat of every row and score it
+        seats_by_cell = {(seat.row, seat.col): seat for seat in show.screen.get_seats()}
+        available = set(seat.id for seat in show.seat_inventory.get_available_seats())
+        best, best_score = [], None
+        for (row, col), seat in seats_by_cell.items():
+            block = [seats_by_cell.get((row, col + offset)) for offset in range(count)]
+            if all(other is not None and other.id in available and other.type == seat_type for other in block):
+                score = MovieTicketBookingBenchmark.block_score(block)
+                if best_score is None or score < best_score:
+                    best, best_score = block, score
+        return best
+
+    @staticmethod
+    def benchmark_best_available():
+        """Sells an IMAX layout out with best-available requests of 1-8 adjacent seats, sequentially and from 64 threads"""
+        benchmark = MovieTicketBookingBenchmark
+        show = benchmark.build_imax_show()
+        seat_count = len(show.screen.get_seats())
+        inventory = show.seat_inventory
+        rng = random.Random(7)
+        seat_types = [SeatType.REGULAR, SeatType.PREMIUM, SeatType.PREMIUM, SeatType.PREMIUM, SeatType.RECLINER]
+        print(f"\n--- Best available block ({seat_count}-seat IMAX layout, {benchmark.IMAX_ROWS} rows) ---")
+
+        latencies, failures, index = [], 0, 0
+        while inventory.get_available_count():
+            count, seat_type = rng.randint(1, 8), rng.choice(seat_types)
+            start_time = time.perf_counter()
+            mask = inventory.try_lock_best_block(f"user{index}", count, seat_type)
+            latencies.append((time.perf_counter() - start_time) * 1000)
+            index += 1
+            if mask:
+                inventory.confirm(f"user{index - 1}", mask)
+            else:
+                failures += 1
+                if count == 1 and not inventory.find_best_block(1):
+                    break
+        latencies.sort()
+        print(f"Sold out in {index} requests ({failures} without a block): mean {statistics.mean(latencies):.3f} ms   p50 {statistics.median(latencies):.3f} ms   p99 {latencies[int(len(latencies) * 0.99) - 1]:.3f} ms")
+
+        show = benchmark.build_imax_show()
+        for count in (2, 4, 8):
+            seats = sorted(show.seat_inventory.find_best_block(count, SeatType.PREMIUM), key=lambda seat: seat.col)
+            assert benchmark.block_score(seats) == benchmark.block_score(benchmark.scan_best_block(show, count, SeatType.PREMIUM))
+        benchmark.measure("best 4 PREMIUM (allocator)", range(benchmark.QUERIES), lambda _: show.seat_inventory.find_best_block(4, SeatType.PREMIUM))
+        benchmark.measure("best 4 PREMIUM (scan)", range(benchmark.SCAN_QUERIES), lambda _: benchmark.scan_best_block(show, 4, SeatType.PREMIUM))
+
+        # Concurrent requests through SeatLockManager: every chosen block is held atomically, so nothing overlaps
+        show = benchmark.build_imax_show()
+        seat_lock_manager = SeatLockManager()
+        users = [User(f"User {index}", f"user{index}@example.com") for index in range(seat_count)]
+        requests = [(user, rng.randint(1, 8), rng.choice(seat_types)) for user in users]
+        start_time = time.perf_counter()
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            with ThreadPoolExecutor(max_workers=benchmark.WORKERS) as executor:
+                held = list(executor.map(lambda request: seat_lock_manager.lock_best_available(show, *request), requests))
+            for user, seats in zip(users, held):
+                if seats:
+                    seat_lock_manager.confirm_seats(show, seats, user)
+        elapsed = time.perf_counter() - start_time
+        booked = [seat.id for seats in held for seat in seats]
+        assert len(booked) == len(set(booked)) == show.seat_inventory.get_booked_count()
+        print(f"{len(requests)} concurrent requests from {benchmark.WORKERS} threads in {elapsed:.2f}s: {len(booked)} of {seat_count} seats booked, no overlaps")
+        seat_lock_manager.timer_wheel.stop()
+
+    @staticmethod
+    def benchmark_ticket_drop():
+        """DROP_USERS users asking for 1-6 best available seats of one IMAX show at once"""
+        benchmark = MovieTicketBookingBenchmark
+        rng = random.Random(7)
+        users = [User(f"User {index}", f"user{index}@example.com") for index in range(benchmark.DROP_USERS)]
+        requests = [(user, rng.randint(1, 6), SimulatedGatewayPaymentStrategy(benchmark.PAYMENT_LATENCY, benchmark.PAYMENT_DECLINE_RATE, rng)) for user in users]
+        print(f"\n--- Ticket drop ({benchmark.DROP_USERS} users, one {len(benchmark.build_imax_show().screen.get_seats())}-seat show, {benchmark.PAYMENT_LATENCY * 1000:g} ms payments) ---")
+
+        # Baseline: synchronous create + pay + confirm in WORKERS caller threads
+        show = benchmark.build_imax_show()
+        booking_service = BookingService()
+        payment_service = PaymentService()
+
+        def book_synchronously(user: User, count: int, payment_strategy: PaymentStrategy):
+            booking = booking_service.create_best_available_booking(user, show, count, None, payment_strategy)
+            if booking is None:
+                return None
+            if payment_service.process_payment(booking.total_price, payment_strategy).status != PaymentStatus.SUCCESS:
+                booking_service.cancel_booking(booking)
+                return None
+            return booking if booking_service.confirm_booking(booking) else None
+
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            start_time = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=benchmark.WORKERS) as executor:
+                bookings = list(executor.map(lambda request: book_synchronously(*request), requests))
+            elapsed = time.perf_counter() - start_time
+        confirmed = [booking for booking in bookings if booking]
+        print(f"{'synchronous, ' + str(benchmark.WORKERS) + ' threads':<30} {elapsed:.2f}s ({len(requests) / elapsed:,.0f} requests/s): {len(confirmed)} bookings, {show.seat_inventory.get_booked_count()} seats")
+        booking_service.seat_lock_manager.timer_wheel.stop()
+
+        # Sharded pipeline: submission returns a future at once, payments overlap on the bounded executor
+        show = benchmark.build_imax_show()
+        booking_service = BookingService()
+        pipeline = ShardedBookingService(booking_service, PaymentService())
+        latencies: list[float] = []
+
+        def record_latency(submitted_at: float):
+            return lambda _: latencies.append((time.perf_counter() - submitted_at) * 1000)
+
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            start_time = time.perf_counter()
+            futures: list[Future] = []
+            retried = 0
+            for index, (user, count, payment_strategy) in enumerate(requests):
+                future = pipeline.book_best_available(user, show, count, payment_strategy, idempotency_key=f"drop-{index}")
+                future.add_done_callback(record_latency(time.perf_counter()))
+                futures.append(future)
+                if rng.random() < benchmark.DROP_RETRY_RATE:
+                    retried += 1
+                    assert pipeline.book_best_available(user, show, count, payment_strategy, idempotency_key=f"drop-{index}") is future
+            submitted = time.perf_counter() - start_time
+            wait(futures)
+            elapsed = time.perf_counter() - start_time
+
+        confirmed = [future.result() for future in futures if future.result()]
+        booked = [seat.id for booking in confirmed for seat in booking.seats]
+        assert len(booked) == len(set(booked)) == show.seat_inventory.get_booked_count()
+        assert show.seat_inventory.get_available_count() + len(booked) == len(show.screen.get_seats())
+        latencies.sort()
+        print(f"{'sharded pipeline':<30} {elapsed:.2f}s ({len(requests) / elapsed:,.0f} requests/s, submitted in {submitted:.2f}s): {len(confirmed)} bookings, {len(booked)} seats")
+        print(f"Request latency: p50 {statistics.median(latencies):.1f} ms   p99 {latencies[int(len(latencies) * 0.99) - 1]:.1f} ms   max {latencies[-1]:.1f} ms")
+        print(f"{retried} retried requests deduplicated by idempotency key; no seat booked twice, no seat left held")
+        booking_service.seat_lock_manager.timer_wheel.stop()
+
+    @staticmethod
+    def benchmark_pricing():
+        """Seat map prices and multi-seat totals on a 1,000-seat show: per-seat strategy calls against the show's price tables"""
+        benchmark = MovieTicketBookingBenchmark
+        show = benchmark.build_show(benchmark.PRICING_ROWS, benchmark.PRICING_SEATS_PER_ROW)
+        strategy = WeekendPricingStrategy()
+        show.set_pricing_strategy(strategy)
+        seats = show.screen.get_seats()
+        print(f"\n--- Pricing ({len(seats)}-seat show, {benchmark.RENDERS} seat map renders, {benchmark.PRICED_BOOKINGS} booking totals) ---")
+
+        def per_seat_render(_):
+            return [strategy.calculate_price(seat) for seat in seats]
+
+        assert list(show.get_seat_prices()) == per_seat_render(None) == show.price_seats(seats)
+        benchmark.measure("seat map: strategy per seat", range(benchmark.RENDERS), per_seat_render)
+        benchmark.measure("seat map: price_seats", range(benchmark.RENDERS), lambda _: show.price_seats(seats))
+        benchmark.measure("seat map: cached vector", range(benchmark.RENDERS), lambda _: show.get_seat_prices())
+
+        rng = random.Random(7)
+        groups = []
+        for _ in range(benchmark.PRICED_BOOKINGS):
+            start = rng.randrange(len(seats) - 8)
+            groups.append(seats[start : start + rng.randint(1, 8)])
+        for group in groups[:1000]:
+            assert abs(show.get_total_price(group) - sum(strategy.calculate_price(seat) for seat in group)) < 1e-9
+
+        start_time = time.perf_counter()
+        for group in groups:
+            sum(strategy.calculate_price(seat) for seat in group)
+        print(f"{'total: strategy per seat':<34} {(time.perf_counter() - start_time) / len(groups) * 1_000_000:8.3f} us/booking")
+        start_time = time.perf_counter()
+        for group in groups:
+            show.get_total_price(group)
+        print(f"{'total: price table':<34} {(time.perf_counter() - start_time) / len(groups) * 1_000_000:8.3f} us/booking")
+
+        start_time = time.perf_counter()
+        for strategy in (EveningPricingStrategy(), WeekendPricingStrategy()) * 5_000:
+            show.set_pricing_strategy(strategy)
+        print(f"{'strategy change (table rebuild)':<34} {(time.perf_counter() - start_time) / 10_000 * 1_000_000:8.3f} us")
+
+
+if __name__ == "__main__":
+    MovieTicketBookingBenchmark.main()
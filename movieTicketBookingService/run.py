@@ -17,6 +17,7 @@ from app.models.screen import Screen
 from app.models.enums import Genre, SeatType
 from app.models.strategy.payment_strategy import CreditCardPaymentStrategy, CashPaymentStrategy, UPIPaymentStrategy
 from app.models.strategy.show_pricing_strategy import MorningPricingStrategy, EveningPricingStrategy, WeekendPricingStrategy, VipPricingStrategy
+from concurrent.futures import wait
 from datetime import datetime, timedelta
 import random
 import time
@@ -41,6 +42,7 @@ class MovieTicketBookingServiceDemo:
             self._demonstrate_observer_pattern()
             self._demonstrate_booking_scenarios()
             self._demonstrate_payment_strategies()
+            self._demonstrate_async_bookings()
             self._demonstrate_search_functionality()
             self._demonstrate_booking_management()
             self._demonstrate_error_scenarios()
@@ -109,23 +111,24 @@ class MovieTicketBookingServiceDemo:
 
             all_available_seats.append(Seat(row, col, seat_type))
 
-        # Create screens
-        screens = []
-        for i in range(3):
-            screen = Screen(f"Screen {i+1}", all_available_seats.copy())
-            screens.append(screen)
-            print(f"✅ Screen created: {screen.name} with {len(screen.seats)} seats")
-
-        # Create cinemas
+        # Create cinemas, each with its own screens
         cities = ["Mumbai", "Delhi", "Bangalore", "Chennai", "Kolkata", "Hyderabad", "Pune", "Ahmedabad"]
 
+        screen_count = 0
         for i in range(2):
+            screens = []
+            for j in range(3):
+                screen = Screen(f"Screen {j+1}", all_available_seats.copy())
+                screens.append(screen)
+                screen_count += 1
+                print(f"✅ Screen created: {screen.name} with {len(screen.seats)} seats")
+
             city = random.choice(cities)
             cinema = Cinema(f"Cinema {i+1}", city, screens)
             self.movie_ticket_booking_service.add_cinema(cinema)
             print(f"✅ Cinema created: {cinema.name} in {cinema.city}")
 
-        print(f"Total cinemas: 2, Total screens: {len(screens)}")
+        print(f"Total cinemas: 2, Total screens: {screen_count}")
 
     def _setup_shows(self):
         """Create shows with different pricing strategies."""
@@ -211,6 +214,7 @@ class MovieTicketBookingServiceDemo:
         print(f"   User: {user.get_name()}")
         print(f"   Show: {show.name} - {show.movie.title}")
         print(f"   Seats: {[f'Row {seat.row}, Col {seat.col}' for seat in seats]}")
+        print(f"   Seat prices ({show.get_pricing_strategy().__class__.__name__}): {show.price_seats(seats)}")
 
         payment_strategy = CreditCardPaymentStrategy("1234-5678-9012-3456", "123", "12/25")
         booking = self.movie_ticket_booking_service.book_tickets(user, show, seats, payment_strategy)
@@ -221,6 +225,21 @@ class MovieTicketBookingServiceDemo:
         else:
             print("   ❌ Booking failed!")
 
+        # Scenario 2: Best available seats, chosen by the system and held in one step
+        print("\n📝 Scenario 2: Best 4 adjacent PREMIUM seats")
+        user = users[1]
+        print(f"   User: {user.get_name()}")
+        print(f"   Show: {show.name} - {show.movie.title}")
+
+        payment_strategy = UPIPaymentStrategy("user@upi")
+        booking = self.movie_ticket_booking_service.book_best_available(user, show, 4, payment_strategy, SeatType.PREMIUM)
+
+        if booking:
+            print(f"   ✅ Booking successful! Seats: {[f'Row {seat.row}, Col {seat.col}' for seat in booking.seats]}")
+            print(f"   Total price: ₹{booking.total_price}")
+        else:
+            print("   ❌ Booking failed!")
+
     def _demonstrate_payment_strategies(self):
         """Demonstrate different payment strategies."""
         print("\n💳 Demonstrating Payment Strategies...")
@@ -264,6 +283,31 @@ class MovieTicketBookingServiceDemo:
         if booking:
             print(f"   ✅ Cash payment successful! Booking ID: {booking.id}")
 
+    def _demonstrate_async_bookings(self):
+        """Demonstrate asynchronous bookings through the show-sharded pipeline."""
+        print("\n⚡ Demonstrating Asynchronous Bookings (ticket drop)...")
+
+        users = list(self.movie_ticket_booking_service.user_service.users.values())
+        show = list(self.movie_ticket_booking_service.show.values())[4]
+
+        # Every user asks for the best 2 seats at once; the requests queue on the show's shard
+        futures = []
+        for user in users:
+            payment_strategy = UPIPaymentStrategy(f"{user.get_name().split()[0].lower()}@upi")
+            futures.append((user, self.movie_ticket_booking_service.book_best_available_async(user, show, 2, payment_strategy, idempotency_key=f"drop-{user.id}")))
+
+        # A retry with the same idempotency key gets the original request back instead of paying twice
+        retry = self.movie_ticket_booking_service.book_best_available_async(users[0], show, 2, UPIPaymentStrategy("retry@upi"), idempotency_key=f"drop-{users[0].id}")
+
+        wait([future for _, future in futures], timeout=10)
+        print(f"   Retried request returned the original future: {retry is futures[0][1]}")
+        for user, future in futures:
+            booking = future.result()
+            if booking:
+                print(f"   ✅ {user.get_name()}: {[f'Row {seat.row}, Col {seat.col}' for seat in booking.seats]}")
+            else:
+                print(f"   ❌ {user.get_name()}: booking failed")
+
     def _demonstrate_search_functionality(self):
         """Demonstrate search functionality."""
         print("\n🔍 Demonstrating Search Functionality...")
@@ -281,11 +325,27 @@ class MovieTicketBookingServiceDemo:
             print(f"   - {movie.title} ({movie.genre.value})")
 
         # Search shows by city
-        print("\n🏙️ Searching for shows in Mumbai:")
-        shows = self.movie_ticket_booking_service.search_service.search_shows_by_city("Mumbai")
+        city = next(iter(self.movie_ticket_booking_service.cinema.values())).city
+        print(f"\n🏙️ Searching for shows in {city}:")
+        shows = self.movie_ticket_booking_service.search_service.search_shows_by_city(city)
         for show in shows:
             print(f"   - {show.name}: {show.movie.title} at {show.show_time.strftime('%H:%M')}")
 
+        # Combined query, resolved by intersecting the city and genre indexes and the show time interval tree
+        all_shows = sorted(self.movie_ticket_booking_service.show.values(), key=lambda show: show.show_time)
+        window_start = all_shows[0].show_time
+        window_end = window_start + timedelta(hours=3)
+        print(f"\n🕕 Searching for ACTION shows in {city} running between {window_start.strftime('%H:%M')} and {window_end.strftime('%H:%M')}:")
+        shows = self.movie_ticket_booking_service.search_service.search_shows(city=city, genre=Genre.ACTION, start=window_start, end=window_end)
+        for show in shows:
+            print(f"   - {show.name}: {show.movie.title} at {show.show_time.strftime('%H:%M')}")
+
+        # Shows running at a given moment
+        moment = window_start + timedelta(minutes=30)
+        print(f"\n⏰ Shows running at {moment.strftime('%H:%M')}:")
+        for show in self.movie_ticket_booking_service.search_service.search_shows_running_at(moment):
+            print(f"   - {show.name}: {show.movie.title} ({show.show_time.strftime('%H:%M')} - {show.get_end_time().strftime('%H:%M')})")
+
     def _demonstrate_booking_management(self):
         """Demonstrate booking management features."""
         print("\n📋 Demonstrating Booking Management...")
@@ -1,4 +1,5 @@
 from datetime import datetime
+from threading import Lock
 from typing import TYPE_CHECKING
 import uuid
 from abc import ABC, abstractmethod
@@ -20,6 +21,10 @@ class Commentable(ABC, CommentableSubject):
         self.timestamp = datetime.now()
         self.likes: list["Like"] = []
         self.comments: list["Comment"] = []
+        # Counters are kept next to the lists so ranking never has to len() or walk them
+        self.counter_lock = Lock()
+        self.like_count = 0
+        self.comment_count = 0
 
     @abstractmethod
     def get_type(self) -> CommentableType:
@@ -43,13 +48,21 @@ class Commentable(ABC, CommentableSubject):
     def get_comments(self) -> list["Comment"]:
         return self.comments
 
+    def get_like_count(self) -> int:
+        return self.like_count
+
+    def get_comment_count(self) -> int:
+        return self.comment_count
+
     def add_like(self, like: "Like") -> None:
         # First notify the already existing observers
         self.notify_observers_on_like(self, like)
         # add the like author to the like subject
         self.add_observer(like.get_user())
         # add the like to the likes list
-        self.likes.append(like)
+        with self.counter_lock:
+            self.likes.append(like)
+            self.like_count += 1
 
     def add_comment(self, comment: "Comment") -> None:
         # First notify the already existing observers
@@ -57,4 +70,6 @@ class Commentable(ABC, CommentableSubject):
         # add the comment author to the comment subject
         self.add_observer(comment.get_author())
         # add the comment to the comments list
-        self.comments.append(comment)
+        with self.counter_lock:
+            self.comments.append(comment)
+            self.comment_count += 1
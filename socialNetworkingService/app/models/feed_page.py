@@ -0,0 +1,54 @@
+import base64
+import json
+from typing import Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from app.models.post import Post
+
+
+class FeedCursor:
+    """
+    Opaque pagination token handed to clients for infinite scroll.
+    Time-ordered feeds resume after a post sequence number; ranked feeds resume at an offset.
+    """
+
+    def __init__(self, sequence: Optional[int] = None, offset: Optional[int] = None):
+        self.sequence = sequence
+        self.offset = offset
+
+    def get_sequence(self) -> Optional[int]:
+        return self.sequence
+
+    def get_offset(self) -> int:
+        return self.offset if self.offset is not None else 0
+
+    def encode(self) -> str:
+        payload = {"s": self.sequence} if self.sequence is not None else {"o": self.get_offset()}
+        return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode()
+
+    @staticmethod
+    def decode(token: Optional[str]) -> Optional["FeedCursor"]:
+        if not token:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode()))
+            if "s" in payload:
+                return FeedCursor(sequence=int(payload["s"]))
+            return FeedCursor(offset=int(payload["o"]))
+        except (ValueError, KeyError, TypeError):
+            raise ValueError("Invalid feed cursor")
+
+
+class FeedPage:
+    def __init__(self, posts: list["Post"], next_cursor: Optional[str] = None):
+        self.posts = posts
+        self.next_cursor = next_cursor
+
+    def get_posts(self) -> list["Post"]:
+        return self.posts
+
+    def get_next_cursor(self) -> Optional[str]:
+        return self.next_cursor
+
+    def has_more(self) -> bool:
+        return self.next_cursor is not None
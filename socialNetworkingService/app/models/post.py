@@ -1,3 +1,4 @@
+from itertools import count
 from app.models.commentable import Commentable
 from typing import TYPE_CHECKING
 from app.models.enums import CommentableType
@@ -7,8 +8,15 @@ if TYPE_CHECKING:
 
 
 class Post(Commentable):
+    # Global creation order; unlike timestamps it is unique, so it gives feeds a stable order and cursor position
+    _sequence = count()
+
     def __init__(self, author: "User", content: str) -> None:
         super().__init__(author, content)
+        self.sequence = next(Post._sequence)
 
     def get_type(self) -> CommentableType:
         return CommentableType.POST
+
+    def get_sequence(self) -> int:
+        return self.sequence
@@ -0,0 +1,60 @@
+from heapq import heappop, heappush, heapify
+from threading import Lock
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from app.models.post import Post
+
+
+class TopKIndex:
+    """
+    Keeps the k highest scoring posts, updated one post at a time.
+    Scores only ever grow (see EngagementService), so a post outside the top k can only get in through
+    its own update, which makes a size-k min-heap with lazy deletion of stale entries sufficient.
+    """
+
+    def __init__(self, k: int):
+        self.k = k
+        self.lock = Lock()
+        self.members: dict[str, tuple[float, "Post"]] = {}
+        self.heap: list[tuple[float, int, str]] = []
+
+    def offer(self, post: "Post", score: float) -> None:
+        post_id = post.get_id()
+        with self.lock:
+            if post_id not in self.members and len(self.members) >= self.k:
+                self._drop_stale_entries()
+                if score <= self.heap[0][0]:
+                    return
+                _, _, evicted_id = heappop(self.heap)
+                del self.members[evicted_id]
+            self.members[post_id] = (score, post)
+            # The member's previous heap entry (if any) becomes stale and is skipped later
+            heappush(self.heap, (score, post.get_sequence(), post_id))
+            if len(self.heap) > 4 * self.k:
+                self._compact()
+
+    def top(self, count: int) -> list["Post"]:
+        with self.lock:
+            ranked = sorted(self.members.values(), key=lambda entry: (entry[0], entry[1].get_sequence()), reverse=True)
+        return [post for _, post in ranked[:count]]
+
+    def rescale(self, factor: float) -> None:
+        with self.lock:
+            self.members = {post_id: (score * factor, post) for post_id, (score, post) in self.members.items()}
+            self._compact()
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+    def _drop_stale_entries(self) -> None:
+        while self.heap:
+            score, _, post_id = self.heap[0]
+            member = self.members.get(post_id)
+            if member is not None and member[0] == score:
+                return
+            heappop(self.heap)
+
+    def _compact(self) -> None:
+        self.heap = [(score, post.get_sequence(), post_id) for post_id, (score, post) in self.members.items()]
+        heapify(self.heap)
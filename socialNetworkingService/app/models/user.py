@@ -56,6 +56,7 @@ class User(ConnectionObserver, CommentableObserver):
         self.account = Account(username, password)
         self.connections_sent: list["Connection"] = []
         self.posts: list["Post"] = []
+        self.liked_posts: list["Post"] = []
         self.friends: set["User"] = set()
         self.notifications: list[Notification] = []
 
@@ -86,6 +87,9 @@ class User(ConnectionObserver, CommentableObserver):
     def get_posts(self) -> list["Post"]:
         return self.posts
 
+    def get_liked_posts(self) -> list["Post"]:
+        return self.liked_posts
+
     def get_friends(self) -> list["User"]:
         return list(self.friends)
 
@@ -95,6 +99,9 @@ class User(ConnectionObserver, CommentableObserver):
     def add_post(self, post: "Post") -> None:
         self.posts.append(post)
 
+    def add_liked_post(self, post: "Post") -> None:
+        self.liked_posts.append(post)
+
     def notify(self, notification: Notification) -> None:
         print(f"Notification received: {notification.get_message()}, type: {notification.get_type().value}\n")
         self.notifications.append(notification)
@@ -0,0 +1,80 @@
+import time
+from threading import Lock
+from typing import Optional
+from app.models.top_k_index import TopKIndex
+
+
+class EngagementRepository:
+    """
+    Decayed engagement scores per post and the top-K indexes built from them:
+    one global index, one per author and one per user covering their friends' posts.
+    """
+
+    _instance: Optional["EngagementRepository"] = None
+    _lock: Lock = Lock()
+
+    GLOBAL_TOP_K = 1000
+    AUTHOR_TOP_K = 100
+    USER_GRAPH_TOP_K = 200
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if hasattr(self, "post_scores"):
+            return
+        self.process_lock = Lock()
+        # Landmark time of the forward-decay weights; shared by every EngagementService
+        self.landmark = time.time()
+        self.landmark_lock = Lock()
+        self.post_scores: dict[str, float] = {}
+        self.global_index = TopKIndex(self.GLOBAL_TOP_K)
+        self.author_indexes: dict[str, TopKIndex] = {}
+        self.user_graph_indexes: dict[str, TopKIndex] = {}
+
+    @classmethod
+    def get_instance(cls) -> "EngagementRepository":
+        return cls()
+
+    def add_to_score(self, post_id: str, delta: float) -> float:
+        with self.process_lock:
+            score = self.post_scores.get(post_id, 0.0) + delta
+            self.post_scores[post_id] = score
+            return score
+
+    def get_score(self, post_id: str) -> float:
+        return self.post_scores.get(post_id, 0.0)
+
+    def get_global_index(self) -> TopKIndex:
+        return self.global_index
+
+    def get_author_index(self, author_id: str) -> TopKIndex:
+        index = self.author_indexes.get(author_id)
+        if index is None:
+            with self.process_lock:
+                index = self.author_indexes.setdefault(author_id, TopKIndex(self.AUTHOR_TOP_K))
+        return index
+
+    def get_user_graph_index(self, user_id: str) -> TopKIndex:
+        index = self.user_graph_indexes.get(user_id)
+        if index is None:
+            with self.process_lock:
+                index = self.user_graph_indexes.setdefault(user_id, TopKIndex(self.USER_GRAPH_TOP_K))
+        return index
+
+    def get_landmark(self) -> float:
+        return self.landmark
+
+    def set_landmark(self, landmark: float) -> None:
+        self.landmark = landmark
+
+    def rescale(self, factor: float) -> None:
+        with self.process_lock:
+            self.post_scores = {post_id: score * factor for post_id, score in self.post_scores.items()}
+            indexes = [self.global_index, *self.author_indexes.values(), *self.user_graph_indexes.values()]
+        for index in indexes:
+            index.rescale(factor)
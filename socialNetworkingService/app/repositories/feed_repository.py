@@ -0,0 +1,100 @@
+from collections import deque
+from heapq import merge
+from itertools import islice
+from threading import Lock
+from typing import Iterable, Optional
+from app.models.post import Post
+from app.models.user import User
+
+
+class FeedRepository:
+    """
+    Materialized feed inboxes (fan-out-on-write).
+    Every user has a bounded deque of posts from friends, newest first (by post sequence), so reading a page is O(page size).
+    Authors marked as celebrities are not fanned out; their posts are pulled at read time instead.
+    """
+
+    _instance: Optional["FeedRepository"] = None
+    _lock: Lock = Lock()
+
+    DEFAULT_INBOX_SIZE = 1000
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if hasattr(self, "inboxes"):
+            return
+        self.process_lock = Lock()
+        self.inbox_size = self.DEFAULT_INBOX_SIZE
+        self.inboxes: dict[str, deque[Post]] = {}
+        self.celebrities: set[User] = set()
+
+    @classmethod
+    def get_instance(cls) -> "FeedRepository":
+        return cls()
+
+    def _get_or_create_inbox(self, user_id: str) -> deque[Post]:
+        inbox = self.inboxes.get(user_id)
+        if inbox is None:
+            # maxlen makes the deque drop the oldest post (right end) automatically
+            inbox = self.inboxes[user_id] = deque(maxlen=self.inbox_size)
+        return inbox
+
+    def push(self, user_ids: Iterable[str], post: Post) -> None:
+        with self.process_lock:
+            for user_id in user_ids:
+                inbox = self._get_or_create_inbox(user_id)
+                if inbox and inbox[0].get_sequence() > post.get_sequence():
+                    # A concurrently created newer post got here first; keep the inbox ordered
+                    if len(inbox) == inbox.maxlen:
+                        inbox.pop()  # insert() on a full bounded deque raises instead of evicting
+                    inbox.insert(self._first_older_index(inbox, post.get_sequence()), post)
+                else:
+                    inbox.appendleft(post)
+
+    def merge_into(self, user_id: str, posts: Iterable[Post]) -> None:
+        """Merge older posts (e.g. a new friend's history) into an inbox, keeping it newest first"""
+        with self.process_lock:
+            inbox = self._get_or_create_inbox(user_id)
+            existing_ids = {post.get_id() for post in inbox}
+            incoming = sorted((post for post in posts if post.get_id() not in existing_ids), key=Post.get_sequence, reverse=True)
+            if not incoming:
+                return
+            merged = merge(inbox, incoming, key=Post.get_sequence, reverse=True)
+            self.inboxes[user_id] = deque(islice(merged, self.inbox_size), maxlen=self.inbox_size)
+
+    def get_recent(self, user_id: str, count: int, before_sequence: Optional[int] = None) -> list[Post]:
+        # Copy under the lock: a concurrent appendleft would otherwise break iteration of the deque
+        with self.process_lock:
+            inbox = self.inboxes.get(user_id)
+            if not inbox:
+                return []
+            start = 0 if before_sequence is None else self._first_older_index(inbox, before_sequence)
+            return list(islice(inbox, start, start + count))
+
+    def _first_older_index(self, inbox: deque[Post], before_sequence: int) -> int:
+        # Inbox is sorted by descending sequence, so binary search for the first post older than the cursor
+        low, high = 0, len(inbox)
+        while low < high:
+            mid = (low + high) // 2
+            if inbox[mid].get_sequence() < before_sequence:
+                high = mid
+            else:
+                low = mid + 1
+        return low
+
+    def mark_celebrity(self, user: User) -> None:
+        with self.process_lock:
+            self.celebrities.add(user)
+
+    def is_celebrity(self, user: User) -> bool:
+        return user in self.celebrities
+
+    def get_celebrity_friends(self, user: User) -> set[User]:
+        # Set intersection iterates the smaller side, so this stays cheap for users with many friends
+        return user.friends & self.celebrities
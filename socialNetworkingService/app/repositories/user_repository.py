@@ -1,5 +1,5 @@
 from app.models.user import User
-from typing import Optional
+from typing import Iterable, Optional
 from threading import Lock
 
 
@@ -18,33 +18,74 @@ class UserRepository:
         if hasattr(self, "users"):
             return
         self.process_lock = Lock()
-        self.users: list[User] = []
+        # Primary index by id (insertion ordered) plus secondary indexes on case-normalized username and email
+        self.users: dict[str, User] = {}
+        self.users_by_username: dict[str, User] = {}
+        self.users_by_email: dict[str, User] = {}
 
     @classmethod
     def get_instance(cls) -> "UserRepository":
         return cls()
 
+    @staticmethod
+    def _normalize(value: str) -> str:
+        return value.casefold()
+
+    def _validate_new_user(self, user: User) -> None:
+        if user.get_id() in self.users:
+            raise ValueError(f"User with ID {user.get_id()} already exists")
+        if self._normalize(user.get_username()) in self.users_by_username:
+            raise ValueError(f"Username {user.get_username()} is already taken")
+        if self._normalize(user.get_email()) in self.users_by_email:
+            raise ValueError(f"Email {user.get_email()} is already registered")
+
+    def _index(self, user: User) -> None:
+        self.users[user.get_id()] = user
+        self.users_by_username[self._normalize(user.get_username())] = user
+        self.users_by_email[self._normalize(user.get_email())] = user
+
     def add_user(self, user: User) -> None:
         with self.process_lock:
-            self.users.append(user)
+            self._validate_new_user(user)
+            self._index(user)
+
+    def add_users(self, users: Iterable[User]) -> None:
+        """Bulk load: validates the whole batch first, then indexes it under a single lock acquisition"""
+        users = list(users)
+        with self.process_lock:
+            batch_usernames: set[str] = set()
+            batch_emails: set[str] = set()
+            batch_ids: set[str] = set()
+            for user in users:
+                self._validate_new_user(user)
+                username, email = self._normalize(user.get_username()), self._normalize(user.get_email())
+                if user.get_id() in batch_ids or username in batch_usernames or email in batch_emails:
+                    raise ValueError(f"Duplicate user {user.get_username()} in bulk load")
+                batch_ids.add(user.get_id())
+                batch_usernames.add(username)
+                batch_emails.add(email)
+            for user in users:
+                self._index(user)
 
     def remove_user(self, user: User) -> None:
         with self.process_lock:
-            if user not in self.users:
+            if self.users.get(user.get_id()) is not user:
                 raise ValueError("User not found")
-            self.users.remove(user)
+            del self.users[user.get_id()]
+            del self.users_by_username[self._normalize(user.get_username())]
+            del self.users_by_email[self._normalize(user.get_email())]
 
-    def get_user(self, id: str) -> User:
-        return self.users[id]
+    def get_user(self, id: str) -> Optional[User]:
+        return self.users.get(id)
 
     def get_all_users(self) -> list[User]:
-        return self.users
+        return list(self.users.values())
 
     def get_user_by_email(self, email: str) -> Optional[User]:
-        return next((user for user in self.users if user.get_email().lower() == email.lower()), None)
+        return self.users_by_email.get(self._normalize(email))
 
     def get_user_by_username(self, username: str) -> Optional[User]:
-        return next((user for user in self.users if user.get_username().lower() == username.lower()), None)
+        return self.users_by_username.get(self._normalize(username))
 
     def get_user_by_id(self, id: str) -> Optional[User]:
-        return next((user for user in self.users if user.get_id() == id), None)
+        return self.users.get(id)
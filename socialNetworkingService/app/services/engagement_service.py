@@ -0,0 +1,105 @@
+import math
+from itertools import islice
+import time
+from app.models.post import Post
+from app.models.user import User
+from app.repositories.engagement_repository import EngagementRepository
+from app.repositories.feed_repository import FeedRepository
+
+
+class EngagementService:
+    """
+    Maintains time-decayed post scores incrementally (forward decay).
+    Instead of decaying every score as time passes, each event is weighted by exp((t - t0) / tau).
+    Every score would decay by the same factor, so ranking by these growing weights equals ranking by
+    the decayed score, and an event costs O(1) plus one top-K update per affected index.
+    """
+
+    HALF_LIFE_SECONDS = 24 * 60 * 60
+    POST_WEIGHT = 1.0
+    LIKE_WEIGHT = 2.0
+    COMMENT_WEIGHT = 3.0  # Weight comments higher
+    # Rebase the landmark time before exp() gets anywhere near float overflow
+    MAX_EXPONENT = 500.0
+    # Broader reach for the popularity feed: a few top posts of friends of friends
+    POSTS_PER_FRIEND_OF_FRIEND = 5
+    MAX_FRIENDS_OF_FRIENDS_POSTS = 10
+    MAX_FRIENDS_SCANNED = 50  # keeps the walk O(1) for users with thousands of friends
+
+    def __init__(self):
+        self.engagement_repository = EngagementRepository.get_instance()
+        self.feed_repository = FeedRepository.get_instance()
+        self.tau = self.HALF_LIFE_SECONDS / math.log(2)
+
+    def record_post(self, post: Post) -> None:
+        self._record(post, self.POST_WEIGHT)
+
+    def record_like(self, post: Post) -> None:
+        self._record(post, self.LIKE_WEIGHT)
+
+    def record_comment(self, post: Post) -> None:
+        self._record(post, self.COMMENT_WEIGHT)
+
+    def on_friendship_created(self, user: User, friend: User) -> None:
+        # Seed each user's graph index with the new friend's best posts so far
+        for reader, author in ((user, friend), (friend, user)):
+            if self.feed_repository.is_celebrity(author):
+                continue
+            reader_index = self.engagement_repository.get_user_graph_index(reader.get_id())
+            for post in self.engagement_repository.get_author_index(author.get_id()).top(EngagementRepository.AUTHOR_TOP_K):
+                reader_index.offer(post, self.engagement_repository.get_score(post.get_id()))
+
+    def get_trending(self, count: int) -> list[Post]:
+        return self.engagement_repository.get_global_index().top(count)
+
+    def get_popular_for_user(self, user: User, count: int) -> list[Post]:
+        friends = user.friends
+        # The index may still hold posts of users who are no longer friends; skip them lazily
+        graph_index = self.engagement_repository.get_user_graph_index(user.get_id())
+        top_posts = graph_index.top(count)
+        candidates = [post for post in top_posts if post.get_author() in friends]
+        if len(candidates) < len(top_posts):
+            # Some were skipped: read the rest of the index so the page is still full
+            candidates = [post for post in graph_index.top(EngagementRepository.USER_GRAPH_TOP_K) if post.get_author() in friends]
+        # Celebrity posts are not fanned out to friends' indexes; read their author index instead
+        for celebrity in self.feed_repository.get_celebrity_friends(user):
+            candidates.extend(self.engagement_repository.get_author_index(celebrity.get_id()).top(count))
+        candidates.extend(self._friends_of_friends_posts(user))
+        unique_posts = {post.get_id(): post for post in candidates}.values()
+        return sorted(unique_posts, key=lambda post: (self.engagement_repository.get_score(post.get_id()), post.get_sequence()), reverse=True)[:count]
+
+    def _friends_of_friends_posts(self, user: User) -> list[Post]:
+        posts: list[Post] = []
+        friends = user.friends
+        for friend in islice(friends, self.MAX_FRIENDS_SCANNED):
+            for friend_of_friend in friend.friends:
+                if friend_of_friend != user and friend_of_friend not in friends:
+                    posts.extend(self.engagement_repository.get_author_index(friend_of_friend.get_id()).top(self.POSTS_PER_FRIEND_OF_FRIEND))
+                if len(posts) >= self.MAX_FRIENDS_OF_FRIENDS_POSTS:
+                    return posts[: self.MAX_FRIENDS_OF_FRIENDS_POSTS]
+        return posts
+
+    def _record(self, post: Post, weight: float) -> None:
+        score = self.engagement_repository.add_to_score(post.get_id(), weight * self._decay_weight())
+        author = post.get_author()
+
+        self.engagement_repository.get_global_index().offer(post, score)
+        self.engagement_repository.get_author_index(author.get_id()).offer(post, score)
+        if self.feed_repository.is_celebrity(author):
+            return
+        for friend in author.get_friends():
+            self.engagement_repository.get_user_graph_index(friend.get_id()).offer(post, score)
+
+    def _decay_weight(self) -> float:
+        repository = self.engagement_repository
+        now = time.time()
+        exponent = (now - repository.get_landmark()) / self.tau
+        if exponent > self.MAX_EXPONENT:
+            with repository.landmark_lock:
+                exponent = (now - repository.get_landmark()) / self.tau
+                if exponent > self.MAX_EXPONENT:
+                    # Moving the landmark scales every stored score by the same factor, so order is preserved
+                    repository.rescale(math.exp(-exponent))
+                    repository.set_landmark(now)
+                    exponent = 0.0
+        return math.exp(exponent)
@@ -1,15 +1,41 @@
-from app.strategies.feed_generation_strategy import NewsFeedGenerationStrategy, ChronologicalStrategy
+from app.strategies.feed_generation_strategy import NewsFeedGenerationStrategy, FanOutOnWriteStrategy
+from app.repositories.feed_repository import FeedRepository
 from app.models.user import User
 from app.models.post import Post
+from app.models.feed_page import FeedPage
+from typing import Optional
 
 
 class FeedService:
+    # Authors with at least this many friends are served by fan-out-on-read instead of fan-out-on-write
+    CELEBRITY_FRIEND_THRESHOLD = 1000
+
     def __init__(self):
+        self.feed_repository = FeedRepository.get_instance()
         # default strategy
-        self.strategy = ChronologicalStrategy()
+        self.strategy = FanOutOnWriteStrategy()
 
     def set_strategy(self, strategy: NewsFeedGenerationStrategy):
         self.strategy = strategy
 
     def get_feed(self, user: User) -> list[Post]:
         return self.strategy.generate_feed(user)
+
+    def get_feed_page(self, user: User, cursor: Optional[str] = None, page_size: int = NewsFeedGenerationStrategy.DEFAULT_PAGE_SIZE) -> FeedPage:
+        return self.strategy.generate_feed_page(user, cursor, page_size)
+
+    def publish_post(self, post: Post) -> None:
+        author = post.get_author()
+        if self.feed_repository.is_celebrity(author) or len(author.friends) >= self.CELEBRITY_FRIEND_THRESHOLD:
+            # Pushing to every follower would make one write cost O(friends); readers pull these posts instead
+            self.feed_repository.mark_celebrity(author)
+            return
+        self.feed_repository.push([friend.get_id() for friend in author.get_friends()], post)
+
+    def on_friendship_created(self, user: User, friend: User) -> None:
+        # New friends have no fanned-out history in each other's inbox, so backfill their recent posts
+        inbox_size = self.feed_repository.inbox_size
+        if not self.feed_repository.is_celebrity(friend):
+            self.feed_repository.merge_into(user.get_id(), friend.get_posts()[-inbox_size:])
+        if not self.feed_repository.is_celebrity(user):
+            self.feed_repository.merge_into(friend.get_id(), user.get_posts()[-inbox_size:])
@@ -1,5 +1,7 @@
 from app.repositories.post_repository import PostRepository
 from app.repositories.user_repository import UserRepository
+from app.services.feed_service import FeedService
+from app.services.engagement_service import EngagementService
 from app.models.user import User
 from app.models.post import Post
 from app.models.comment import Comment
@@ -7,9 +9,11 @@ from app.models.like import Like
 
 
 class PostService:
-    def __init__(self):
+    def __init__(self, feed_service: FeedService = None, engagement_service: EngagementService = None):
         self.post_repository = PostRepository.get_instance()
         self.user_repository = UserRepository.get_instance()
+        self.feed_service = feed_service if feed_service else FeedService()
+        self.engagement_service = engagement_service if engagement_service else EngagementService()
 
     def create_post(self, user_id: str, content: str) -> Post:
         user = self.user_repository.get_user_by_id(user_id)
@@ -18,6 +22,8 @@ class PostService:
         post = Post(user, content)
         self.post_repository.add_post(post)
         user.add_post(post)  # Add post to user's post list
+        self.feed_service.publish_post(post)  # Fan out to friends' feed inboxes
+        self.engagement_service.record_post(post)
         return post
 
     def like_post(self, user_id: str, post_id: str) -> None:
@@ -29,6 +35,8 @@ class PostService:
             raise ValueError(f"Post with ID {post_id} not found")
         like = Like(user, post)
         post.add_like(like)
+        user.add_liked_post(post)
+        self.engagement_service.record_like(post)
 
     def add_comment(self, user_id: str, post_id: str, content: str) -> None:
         user = self.user_repository.get_user_by_id(user_id)
@@ -39,6 +47,7 @@ class PostService:
             raise ValueError(f"Post with ID {post_id} not found")
         comment = Comment(user, content)
         post.add_comment(comment)
+        self.engagement_service.record_comment(post)
 
     def get_post_by_id(self, post_id: str) -> Post:
         return self.post_repository.get_post_by_id(post_id)
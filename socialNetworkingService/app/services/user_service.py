@@ -1,4 +1,6 @@
 from app.repositories.user_repository import UserRepository
+from app.services.feed_service import FeedService
+from app.services.engagement_service import EngagementService
 from app.models.user import User
 from app.models.connection import Connection
 from app.models.notification import Notification
@@ -6,8 +8,10 @@ from app.exceptions.permission import PermissionError
 
 
 class UserService:
-    def __init__(self):
+    def __init__(self, feed_service: FeedService = None, engagement_service: EngagementService = None):
         self.user_repository = UserRepository.get_instance()
+        self.feed_service = feed_service if feed_service else FeedService()
+        self.engagement_service = engagement_service if engagement_service else EngagementService()
 
     def get_user_by_id(self, user_id: str) -> User:
         return self.user_repository.get_user_by_id(user_id)
@@ -49,6 +53,8 @@ class UserService:
         if connection.get_to_user().get_id() != to_user_id:
             raise ValueError(f"{to_user.get_name()} is not authorized to accept the connection request with {connection.get_from_user().get_name()}")
         connection.accept_request()
+        self.feed_service.on_friendship_created(connection.get_from_user(), connection.get_to_user())
+        self.engagement_service.on_friendship_created(connection.get_from_user(), connection.get_to_user())
         return connection
 
     def reject_connection_request(self, connection: Connection, to_user_id: str) -> None:
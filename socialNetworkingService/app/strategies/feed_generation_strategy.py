@@ -1,28 +1,90 @@
 from abc import ABC, abstractmethod
+from bisect import bisect_left
+from heapq import heapify, heappop, heapreplace, merge, nlargest
+from itertools import islice
 from app.models.user import User
-from typing import List
+from typing import Callable, Iterable, Iterator, List, Optional
 from app.models.post import Post
+from app.models.feed_page import FeedCursor, FeedPage
+from app.repositories.feed_repository import FeedRepository
+from app.services.engagement_service import EngagementService
 
 
 class NewsFeedGenerationStrategy(ABC):
-    @abstractmethod
+    DEFAULT_PAGE_SIZE = 10
+
     def generate_feed(self, user: User) -> List[Post]:
-        raise NotImplementedError("generate_feed method is not implemented")
+        return self.generate_feed_page(user).get_posts()
+
+    @abstractmethod
+    def generate_feed_page(self, user: User, cursor: Optional[str] = None, page_size: int = DEFAULT_PAGE_SIZE) -> FeedPage:
+        raise NotImplementedError("generate_feed_page method is not implemented")
+
+    @staticmethod
+    def _newest_first(posts: List[Post], before_sequence: Optional[int] = None) -> Iterator[Post]:
+        # Author post lists are append-only in creation order, so the resume point is a binary search
+        end = len(posts) if before_sequence is None else bisect_left(posts, before_sequence, key=Post.get_sequence)
+        return (posts[index] for index in range(end - 1, -1, -1))
+
+    @staticmethod
+    def _newest(posts: List[Post], count: int) -> List[Post]:
+        return posts[-count:] if count else []
+
+    @staticmethod
+    def _time_ordered_page(posts: Iterable[Post], page_size: int) -> FeedPage:
+        # Fetch one extra post to know whether another page exists
+        page = list(islice(posts, page_size + 1))
+        if len(page) <= page_size:
+            return FeedPage(page)
+        page = page[:page_size]
+        return FeedPage(page, FeedCursor(sequence=page[-1].get_sequence()).encode())
+
+    @staticmethod
+    def _ranked_page(candidates: List[Post], score: Callable[[Post], tuple], cursor: Optional[FeedCursor], page_size: int) -> FeedPage:
+        # Partial selection of the first offset + page_size + 1 posts instead of sorting every candidate
+        offset = cursor.get_offset() if cursor else 0
+        ranked = nlargest(offset + page_size + 1, candidates, key=score)
+        page = ranked[offset : offset + page_size]
+        next_cursor = FeedCursor(offset=offset + page_size).encode() if len(ranked) > offset + page_size else None
+        return FeedPage(page, next_cursor)
+
+    def _collect_candidates(self, user: User, posts_per_friend: int) -> List[Post]:
+        candidates: list[Post] = []
+        for friend in user.friends:
+            candidates.extend(self._newest(friend.get_posts(), posts_per_friend))
+        return candidates
 
 
 class ChronologicalStrategy(NewsFeedGenerationStrategy):
-    def generate_feed(self, user: User) -> List[Post]:
-        friends = user.get_friends()
-        feed: list[Post] = []
+    """
+    K-way merge over every friend's time-ordered post list
+    Building the heap is O(friends); each post of the page then costs O(log friends)
+    """
+
+    def generate_feed_page(self, user: User, cursor: Optional[str] = None, page_size: int = NewsFeedGenerationStrategy.DEFAULT_PAGE_SIZE) -> FeedPage:
+        decoded_cursor = FeedCursor.decode(cursor)
+        before_sequence = decoded_cursor.get_sequence() if decoded_cursor else None
 
-        for friend in friends:
-            feed.extend(friend.get_posts()[:10])
+        # One heap entry per friend pointing at their newest unread post: (-sequence, position, post list)
+        heap = []
+        for friend in user.friends:
+            posts = friend.get_posts()
+            end = len(posts) if before_sequence is None else bisect_left(posts, before_sequence, key=Post.get_sequence)
+            if end:
+                heap.append((-posts[end - 1].get_sequence(), end - 1, posts))
+        heapify(heap)
 
-        # Sort posts by timestamp in reverse (most recent first)
-        feed.sort(key=lambda p: p.get_timestamp(), reverse=True)
+        return self._time_ordered_page(self._pop_newest(heap), page_size)
 
-        # Return top 10 posts
-        return feed[:10]
+    @staticmethod
+    def _pop_newest(heap: list) -> Iterator[Post]:
+        while heap:
+            _, position, posts = heap[0]
+            yield posts[position]
+            if position:
+                heapreplace(heap, (-posts[position - 1].get_sequence(), position - 1, posts))
+            else:
+                heappop(heap)
 
 
 class EngagementBasedStrategy(NewsFeedGenerationStrategy):
@@ -31,24 +93,16 @@ class EngagementBasedStrategy(NewsFeedGenerationStrategy):
     Priority: Posts with higher engagement from friends
     """
 
-    def generate_feed(self, user: User) -> List[Post]:
-        friends = user.get_friends()
-        feed: list[Post] = []
-
-        for friend in friends:
-            feed.extend(friend.get_posts()[:20])  # Get more posts to score
+    POSTS_PER_FRIEND = 20
 
-        # Score posts based on engagement (likes + comments)
-        scored_posts = []
-        for post in feed:
-            engagement_score = len(post.get_likes()) + len(post.get_comments())
-            scored_posts.append((post, engagement_score))
+    def generate_feed_page(self, user: User, cursor: Optional[str] = None, page_size: int = NewsFeedGenerationStrategy.DEFAULT_PAGE_SIZE) -> FeedPage:
+        candidates = self._collect_candidates(user, self.POSTS_PER_FRIEND)
+        return self._ranked_page(candidates, self.score, FeedCursor.decode(cursor), page_size)
 
-        # Sort by engagement score (descending)
-        scored_posts.sort(key=lambda x: x[1], reverse=True)
-
-        # Return top 10 most engaging posts
-        return [post for post, score in scored_posts][:10]
+    @staticmethod
+    def score(post: Post) -> tuple:
+        # Engagement (likes + comments) first, recency breaks ties
+        return (post.get_like_count() + post.get_comment_count(), post.get_sequence())
 
 
 class InterestBasedStrategy(NewsFeedGenerationStrategy):
@@ -57,27 +111,22 @@ class InterestBasedStrategy(NewsFeedGenerationStrategy):
     Priority: Posts containing keywords user has engaged with before
     """
 
-    def generate_feed(self, user: User) -> List[Post]:
-        friends = user.get_friends()
-        feed: list[Post] = []
+    POSTS_PER_FRIEND = 15
 
-        # Collect user's interests based on past likes/comments
-        user_interests = self._extract_user_interests(user)
+    def generate_feed_page(self, user: User, cursor: Optional[str] = None, page_size: int = NewsFeedGenerationStrategy.DEFAULT_PAGE_SIZE) -> FeedPage:
+        candidates = self._collect_candidates(user, self.POSTS_PER_FRIEND)
+        return self._ranked_page(candidates, self.scorer(user), FeedCursor.decode(cursor), page_size)
 
-        for friend in friends:
-            feed.extend(friend.get_posts()[:15])
+    def scorer(self, user: User) -> Callable[[Post], tuple]:
+        # Collect user's interests based on past likes/comments
+        user_interests = [interest.lower() for interest in self._extract_user_interests(user)]
 
-        # Score posts based on interest matching
-        scored_posts = []
-        for post in feed:
+        def score(post: Post) -> tuple:
+            # Interest score first, then recency
             content = post.get_content().lower()
-            interest_score = sum(1 for interest in user_interests if interest.lower() in content)
-            scored_posts.append((post, interest_score))
+            return (sum(1 for interest in user_interests if interest in content), post.get_sequence())
 
-        # Sort by interest score (descending), then by recency
-        scored_posts.sort(key=lambda x: (x[1], x[0].get_timestamp()), reverse=True)
-
-        return [post for post, score in scored_posts][:10]
+        return score
 
     def _extract_user_interests(self, user: User) -> List[str]:
         """Extract user's interests from liked posts and comments"""
@@ -99,67 +148,103 @@ class InterestBasedStrategy(NewsFeedGenerationStrategy):
 
 class PopularityBasedStrategy(NewsFeedGenerationStrategy):
     """
-    Recommends posts based on overall popularity across the platform
-    Priority: Posts with highest likes/comments regardless of friendship
+    Recommends the most popular posts of the user's graph
+    Priority: Time-decayed likes/comments score, read from the incrementally maintained top-K index
     """
 
-    def generate_feed(self, user: User) -> List[Post]:
-        friends = user.get_friends()
-        feed: list[Post] = []
-
-        for friend in friends:
-            feed.extend(friend.get_posts()[:15])
-
-        # Also include some posts from friends of friends for broader reach
-        friends_of_friends_posts = []
-        for friend in friends:
-            for friend_of_friend in friend.get_friends():
-                if friend_of_friend != user and friend_of_friend not in friends:
-                    friends_of_friends_posts.extend(friend_of_friend.get_posts()[:5])
-
-        feed.extend(friends_of_friends_posts[:10])  # Limit to avoid too many posts
-
-        # Score posts based on total engagement
-        scored_posts = []
-        for post in feed:
-            popularity_score = len(post.get_likes()) * 2 + len(post.get_comments()) * 3  # Weight comments higher
-            scored_posts.append((post, popularity_score))
-
-        # Sort by popularity score (descending)
-        scored_posts.sort(key=lambda x: x[1], reverse=True)
+    def __init__(self):
+        self.engagement_service = EngagementService()
 
-        return [post for post, score in scored_posts][:10]
+    def generate_feed_page(self, user: User, cursor: Optional[str] = None, page_size: int = NewsFeedGenerationStrategy.DEFAULT_PAGE_SIZE) -> FeedPage:
+        decoded_cursor = FeedCursor.decode(cursor)
+        offset = decoded_cursor.get_offset() if decoded_cursor else 0
+        # The index is already ranked, so only offset + page_size + 1 posts are read and nothing is rescored
+        ranked = self.engagement_service.get_popular_for_user(user, offset + page_size + 1)
+        page = ranked[offset : offset + page_size]
+        next_cursor = FeedCursor(offset=offset + page_size).encode() if len(ranked) > offset + page_size else None
+        return FeedPage(page, next_cursor)
 
 
 class MixedStrategy(NewsFeedGenerationStrategy):
     """
     Combines multiple strategies for balanced recommendations
     Uses 40% chronological, 30% engagement, 30% interest-based
+    The candidate set is collected once and ranked three ways instead of running three full strategies
     """
 
+    POSTS_PER_FRIEND = 20
+    WEIGHTS = (4, 3, 3)  # chronological, engagement, interest per 10 posts
+
     def __init__(self):
-        self.chronological = ChronologicalStrategy()
         self.engagement = EngagementBasedStrategy()
         self.interest = InterestBasedStrategy()
 
-    def generate_feed(self, user: User) -> List[Post]:
-        # Get feeds from different strategies
-        chrono_feed = self.chronological.generate_feed(user)
-        engage_feed = self.engagement.generate_feed(user)
-        interest_feed = self.interest.generate_feed(user)
-
-        # Combine with weights
-        combined_feed = []
-        combined_feed.extend(chrono_feed[:4])  # 40% chronological
-        combined_feed.extend(engage_feed[:3])  # 30% engagement
-        combined_feed.extend(interest_feed[:3])  # 30% interest
-
-        # Remove duplicates while preserving order
+    def generate_feed_page(self, user: User, cursor: Optional[str] = None, page_size: int = NewsFeedGenerationStrategy.DEFAULT_PAGE_SIZE) -> FeedPage:
+        decoded_cursor = FeedCursor.decode(cursor)
+        offset = decoded_cursor.get_offset() if decoded_cursor else 0
+        needed = offset + page_size + 1
+
+        candidates = self._collect_candidates(user, self.POSTS_PER_FRIEND)
+        rankings = [
+            nlargest(needed, candidates, key=Post.get_sequence),
+            nlargest(needed, candidates, key=self.engagement.score),
+            nlargest(needed, candidates, key=self.interest.scorer(user)),
+        ]
+
+        # Interleave the rankings in 4/3/3 blocks, removing duplicates while preserving order
+        combined: list[Post] = []
+        seen = set()
+        positions = [0] * len(rankings)
+        while len(combined) < needed and any(position < len(ranking) for position, ranking in zip(positions, rankings)):
+            for index, (ranking, weight) in enumerate(zip(rankings, self.WEIGHTS)):
+                taken = 0
+                while taken < weight and positions[index] < len(ranking):
+                    post = ranking[positions[index]]
+                    positions[index] += 1
+                    if post.get_id() not in seen:
+                        seen.add(post.get_id())
+                        combined.append(post)
+                        taken += 1
+
+        page = combined[offset : offset + page_size]
+        next_cursor = FeedCursor(offset=offset + page_size).encode() if len(combined) > offset + page_size else None
+        return FeedPage(page, next_cursor)
+
+
+class FanOutOnWriteStrategy(NewsFeedGenerationStrategy):
+    """
+    Reads the user's materialized inbox (filled by FeedService.publish_post when a post is created)
+    Celebrity friends are not fanned out on write, so their latest posts are merged in at read time
+    Cost is O(page size * (1 + celebrity friends)) instead of O(friends * posts)
+    """
+
+    def __init__(self):
+        self.feed_repository = FeedRepository.get_instance()
+
+    def generate_feed_page(self, user: User, cursor: Optional[str] = None, page_size: int = NewsFeedGenerationStrategy.DEFAULT_PAGE_SIZE) -> FeedPage:
+        decoded_cursor = FeedCursor.decode(cursor)
+        before_sequence = decoded_cursor.get_sequence() if decoded_cursor else None
+
+        friends = user.friends
+        fetch_count = page_size + 1
+        while True:
+            recent_posts = self.feed_repository.get_recent(user.get_id(), fetch_count, before_sequence)
+            # Inbox may still hold posts of users who are no longer friends; skip them lazily
+            inbox_posts = [post for post in recent_posts if post.get_author() in friends]
+            if len(inbox_posts) > page_size or len(recent_posts) < fetch_count:
+                break
+            fetch_count *= 2
+
+        celebrity_posts = [self._newest_first(celebrity.get_posts(), before_sequence) for celebrity in self.feed_repository.get_celebrity_friends(user)]
+
+        # Inbox and each celebrity's post list are already newest first, so a lazy merge is enough
+        return self._time_ordered_page(self._unique(merge(inbox_posts, *celebrity_posts, key=Post.get_sequence, reverse=True)), page_size)
+
+    @staticmethod
+    def _unique(posts: Iterable[Post]) -> Iterator[Post]:
+        # A celebrity's posts from before they crossed the threshold are also in the inbox
         seen = set()
-        unique_feed = []
-        for post in combined_feed:
+        for post in posts:
             if post.get_id() not in seen:
                 seen.add(post.get_id())
-                unique_feed.append(post)
-
-        return unique_feed[:10]
+                yield post
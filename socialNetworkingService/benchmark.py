@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Social Networking Service Benchmarks
+Measures feed read latency for a user with a large friend list, comparing the
+k-way merge ChronologicalStrategy with the materialized FanOutOnWriteStrategy and the
+rescoring EngagementBasedStrategy with the top-K index backed PopularityBasedStrategy,
+and UserRepository index lookups at 1M users.
+
+Usage: python benchmark.py [feed|users|all]
+"""
+
+import random
+import statistics
+import sys
+import time
+from app.models.like import Like
+from app.models.post import Post
+from app.models.user import User
+from app.repositories.feed_repository import FeedRepository
+from app.repositories.user_repository import UserRepository
+from app.services.engagement_service import EngagementService
+from app.services.feed_service import FeedService
+from app.strategies.feed_generation_strategy import ChronologicalStrategy, EngagementBasedStrategy, FanOutOnWriteStrategy, NewsFeedGenerationStrategy, PopularityBasedStrategy
+
+
+class SocialNetworkingBenchmark:
+    FRIEND_COUNT = 5000
+    POSTS_PER_FRIEND = 20
+    CELEBRITY_FRIENDS = 5
+    READS = 200
+    USER_COUNT = 1_000_000
+    LOOKUPS = 100_000
+    LINEAR_SCAN_LOOKUPS = 20
+
+    @staticmethod
+    def main():
+        print("=" * 60)
+        print("SOCIAL NETWORKING SERVICE BENCHMARK")
+        print("=" * 60)
+
+        section = sys.argv[1] if len(sys.argv) > 1 else "all"
+        if section in ("feed", "all"):
+            reader = SocialNetworkingBenchmark.build_friend_graph()
+            SocialNetworkingBenchmark.benchmark_feed_reads(reader)
+        if section in ("users", "all"):
+            SocialNetworkingBenchmark.benchmark_user_lookups()
+
+    @staticmethod
+    def build_friend_graph() -> User:
+        """Creates one reader with FRIEND_COUNT friends and fans out every friend's posts"""
+        start_time = time.perf_counter()
+        feed_service = FeedService()
+        engagement_service = EngagementService()
+        feed_repository = FeedRepository.get_instance()
+
+        reader = User("Reader", "reader@example.com", "password", "reader")
+        friends = [User(f"Friend{i}", f"friend{i}@example.com", "password", f"friend{i}") for i in range(SocialNetworkingBenchmark.FRIEND_COUNT)]
+        for friend in friends:
+            # Wire the graph directly: connection requests would print a notification per edge
+            reader.add_friend(friend)
+            friend.add_friend(reader)
+        for friend in friends[: SocialNetworkingBenchmark.CELEBRITY_FRIENDS]:
+            feed_repository.mark_celebrity(friend)
+
+        for round_number in range(SocialNetworkingBenchmark.POSTS_PER_FRIEND):
+            for friend in friends:
+                post = Post(friend, f"Post {round_number} from {friend.get_name()}")
+                friend.add_post(post)
+                feed_service.publish_post(post)
+                engagement_service.record_post(post)
+                if round_number % 2:
+                    # A single like per post: further likes would print a notification to earlier likers
+                    post.add_like(Like(reader, post))
+                    engagement_service.record_like(post)
+
+        total_posts = SocialNetworkingBenchmark.FRIEND_COUNT * SocialNetworkingBenchmark.POSTS_PER_FRIEND
+        print(f"\nBuilt graph: {SocialNetworkingBenchmark.FRIEND_COUNT} friends, {total_posts} posts in {time.perf_counter() - start_time:.2f}s")
+        return reader
+
+    @staticmethod
+    def benchmark_feed_reads(reader: User):
+        print(f"\n--- Feed read latency ({SocialNetworkingBenchmark.READS} reads, {SocialNetworkingBenchmark.FRIEND_COUNT} friends) ---")
+        for strategy in [ChronologicalStrategy(), FanOutOnWriteStrategy(), EngagementBasedStrategy(), PopularityBasedStrategy()]:
+            SocialNetworkingBenchmark.measure(strategy, reader)
+
+    @staticmethod
+    def measure(strategy: NewsFeedGenerationStrategy, reader: User):
+        latencies = []
+        for _ in range(SocialNetworkingBenchmark.READS):
+            start_time = time.perf_counter()
+            strategy.generate_feed(reader)
+            latencies.append((time.perf_counter() - start_time) * 1000)
+        latencies.sort()
+        p99 = latencies[int(len(latencies) * 0.99) - 1]
+        print(f"{type(strategy).__name__:<24} mean {statistics.mean(latencies):8.3f} ms   p50 {statistics.median(latencies):8.3f} ms   p99 {p99:8.3f} ms")
+
+    @staticmethod
+    def benchmark_user_lookups():
+        print(f"\n--- UserRepository lookups ({SocialNetworkingBenchmark.USER_COUNT} users) ---")
+        user_repository = UserRepository.get_instance()
+
+        users = [User(f"User{i}", f"user{i}@example.com", "password", f"user_{i}") for i in range(SocialNetworkingBenchmark.USER_COUNT)]
+        start_time = time.perf_counter()
+        user_repository.add_users(users)
+        print(f"Bulk loaded {len(users)} users in {time.perf_counter() - start_time:.2f}s")
+
+        samples = [random.choice(users) for _ in range(SocialNetworkingBenchmark.LOOKUPS)]
+        lookups = [
+            ("get_user_by_id", lambda user: user_repository.get_user_by_id(user.get_id())),
+            ("get_user_by_username", lambda user: user_repository.get_user_by_username(user.get_username().upper())),
+            ("get_user_by_email", lambda user: user_repository.get_user_by_email(user.get_email())),
+        ]
+        for name, lookup in lookups:
+            start_time = time.perf_counter()
+            for user in samples:
+                lookup(user)
+            elapsed = time.perf_counter() - start_time
+            print(f"{name:<24} {elapsed / len(samples) * 1_000_000:8.3f} us/lookup")
+
+        # Reference: the linear scan the indexes replaced
+        start_time = time.perf_counter()
+        for user in samples[: SocialNetworkingBenchmark.LINEAR_SCAN_LOOKUPS]:
+            next((candidate for candidate in users if candidate.get_id() == user.get_id()), None)
+        elapsed = time.perf_counter() - start_time
+        print(f"{'linear scan (by id)':<24} {elapsed / SocialNetworkingBenchmark.LINEAR_SCAN_LOOKUPS * 1_000_000:8.3f} us/lookup")
+
+
+if __name__ == "__main__":
+    SocialNetworkingBenchmark.main()
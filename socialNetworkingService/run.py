@@ -306,7 +306,7 @@ class SocialNetworkingServiceDemo:
         # Register users
         users = []
         users.append(snm.register_user("Amit Kumar", "amit@example.com", "pass1", "amit_k"))
-        users.append(snm.register_user("Sneha Singh", "sneha@example.com", "pass2", "sneha_s"))
+        users.append(snm.register_user("Sneha Singh", "sneha.singh@example.com", "pass2", "sneha_s"))
         users.append(snm.register_user("Rahul Verma", "rahul@example.com", "pass3", "rahul_v"))
 
         print(f"✓ Registered {len(users)} users")
@@ -1,6 +1,7 @@
 from app.services.user_service import UserService
 from app.services.post_service import PostService
 from app.services.feed_service import FeedService
+from app.services.engagement_service import EngagementService
 from threading import Lock
 from app.models.user import User
 from app.models.post import Post
@@ -24,9 +25,10 @@ class SocialNetworkManager:
     def __init__(self):
         if hasattr(self, "has_initialized"):
             return
-        self.user_service = UserService()
-        self.post_service = PostService()
         self.feed_service = FeedService()
+        self.engagement_service = EngagementService()
+        self.user_service = UserService(self.feed_service, self.engagement_service)
+        self.post_service = PostService(self.feed_service, self.engagement_service)
         self.has_initialized = True
 
     @classmethod
@@ -78,5 +80,8 @@ class SocialNetworkManager:
     def get_all_comments(self, post_id: str) -> list[Comment]:
         return self.post_service.get_all_comments(post_id)
 
+    def get_trending_posts(self, count: int = 10) -> list[Post]:
+        return self.engagement_service.get_trending(count)
+
     def get_all_likes(self, post_id: str) -> list[Like]:
         return self.post_service.get_all_likes(post_id)
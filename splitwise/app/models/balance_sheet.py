@@ -24,6 +24,16 @@ class BalanceSheet:
             if self.balances[user] == 0:
                 del self.balances[user]
 
+    def adjust_balances(self, deltas: dict["User", float]):
+        """Apply many adjustments under one lock hold, as a bulk import does per balance sheet"""
+        with self.lock:
+            for user, amount in deltas.items():
+                if user == self.owner or amount == 0:
+                    continue
+                self.balances[user] = self.balances.get(user, 0) + amount
+                if self.balances[user] == 0:
+                    del self.balances[user]
+
     def show_balances(self):
         print(f"\nBalance Sheet for {self.owner.get_name()}:")
         if len(self.balances) == 0:
@@ -1,5 +1,5 @@
 from datetime import datetime
-from app.strategies.split_strategy import SplitStrategy
+from app.strategies.split_strategy import EqualSplitStrategy, ExactSplitStrategy, PercentSplitStrategy, SplitStrategy
 from app.models.split import Split
 from app.observers.expense_observer import ExpenseSubject
 from typing import Optional, TYPE_CHECKING
@@ -48,6 +48,29 @@ class Expense(ExpenseSubject):
     def get_splits(self) -> list[Split]:
         return self.split_strategy.calculate_splits(self.amount, self.paid_by, self.participants, self.split_values)
 
+    def get_minor_unit_shares(self) -> list[tuple["User", int]]:
+        """Each participant's share in paise (the payer included); for the built-in strategies the shares add up to the amount exactly"""
+        total = round(self.amount * 100)
+        strategy = self.split_strategy
+        if isinstance(strategy, EqualSplitStrategy):
+            base, remainder = divmod(total, len(self.participants))
+            # The first `remainder` participants carry the leftover paise
+            return [(participant, base + (index < remainder)) for index, participant in enumerate(self.participants)]
+        if isinstance(strategy, PercentSplitStrategy):
+            if not strategy.validate_split_values(self.split_values, self.participants):
+                raise ValueError("Invalid split values")
+            shares = [round(total * value / 100) for value in self.split_values]
+        elif isinstance(strategy, ExactSplitStrategy):
+            if not strategy.validate_split_values(self.split_values, self.participants, self.amount):
+                raise ValueError("Invalid split values")
+            shares = [round(value * 100) for value in self.split_values]
+        else:
+            # Other strategies only say what the non-payers owe; each share is rounded on its own
+            return [(split.get_user(), round(split.get_amount() * 100)) for split in self.get_splits()]
+        # Rounding leftovers (at most a few paise) go to the last participant
+        shares[-1] += total - sum(shares)
+        return list(zip(self.participants, shares))
+
     def get_split_strategy(self) -> SplitStrategy:
         return self.split_strategy
 
@@ -3,6 +3,8 @@ from app.observers.group_observer import GroupSubject
 from app.models.expense import Expense
 from uuid import uuid4
 from heapq import heappush, heappop
+from threading import Lock
+from typing import Optional
 from app.models.transaction import Transaction
 
 
@@ -13,9 +15,15 @@ class Group(GroupSubject):
         self.name = name
         self.members: list[User] = members
         self.expenses: list[Expense] = []
+        # Running net balance per member in paise (positive: is owed money), kept up to date by every expense and settle-up
+        self.net_balances: dict[User, int] = {}
+        # Simplified transactions for the current net balances; None once a balance changes
+        self.simplified_transactions: Optional[list[Transaction]] = None
+        self.lock = Lock()
         # Add all the members as observers
         for member in members:
             self.add_observer(member)
+            member.add_group(self)
 
     def get_id(self) -> str:
         return self.id
@@ -29,24 +37,32 @@ class Group(GroupSubject):
     def add_member(self, member: User):
         self.members.append(member)
         self.add_observer(member)
+        member.add_group(self)
         self.notify_observers(message=f"New member '{member.get_name()}' added to group '{self.get_name()}'")
 
     def remove_member(self, member: User):
         self.members.remove(member)
         self.remove_observer(member)
+        member.remove_group(self)
         # Notify the observers about the removed member
         self.notify_observers(message=f"Member '{member.get_name()}' removed from group '{self.get_name()}'")
 
-    def add_expense(self, expense: Expense):
-        self.expenses.append(expense)
+    @staticmethod
+    def to_minor_units(amount: float) -> int:
+        return round(amount * 100)
 
-        # Update balance sheets based on expense splits
-        splits = expense.get_splits()
+    def add_expense(self, expense: Expense):
+        # Shares in paise that add up to the amount, so net balances, balance sheets and bulk imports all agree
         paid_by = expense.get_paid_by()
+        shares = [(participant, minor_units) for participant, minor_units in expense.get_minor_unit_shares() if participant != paid_by and minor_units]
 
-        for split in splits:
-            participant = split.get_user()
-            amount = split.get_amount()
+        with self.lock:
+            self.expenses.append(expense)
+            for participant, minor_units in shares:
+                self._adjust_net_balance(paid_by, participant, minor_units)
+
+        for participant, minor_units in shares:
+            amount = minor_units / 100
 
             # The participant owes the paid_by user this amount
             participant.get_balance_sheet().adjust_balance(paid_by, amount)
@@ -56,21 +72,43 @@ class Group(GroupSubject):
         # Notify only the expense participants, not all group members
         expense.notify_observers(expense, f"New expense '{expense.get_description()}' added to group '{self.get_name()}'")
 
+    def add_imported_expenses(self, expenses: list[Expense], net_deltas: dict[User, int]):
+        """
+        Add a batch of expenses whose balance sheets were already updated by the importer, with the batch's
+        net balance change per member in paise. Members are notified once for the whole batch
+        """
+        with self.lock:
+            self.expenses.extend(expenses)
+            for user, minor_units in net_deltas.items():
+                self.net_balances[user] = self.net_balances.get(user, 0) + minor_units
+            self.simplified_transactions = None
+        self.notify_observers(message=f"{len(expenses)} expenses imported into group '{self.get_name()}'")
+
     def get_expenses(self) -> list[Expense]:
         return self.expenses.copy()
 
+    def _adjust_net_balance(self, creditor: User, debtor: User, minor_units: int) -> None:
+        # Callers hold self.lock
+        self.net_balances[creditor] = self.net_balances.get(creditor, 0) + minor_units
+        self.net_balances[debtor] = self.net_balances.get(debtor, 0) - minor_units
+        self.simplified_transactions = None
+
+    def get_net_balance(self, user: User) -> float:
+        return self.net_balances.get(user, 0) / 100
+
+    def record_settlement(self, payer: User, payee: User, amount: float):
+        # Paying back is a reverse expense, like on the balance sheets: the payer is owed what they paid, the payee owed that much less
+        with self.lock:
+            self._adjust_net_balance(payer, payee, self.to_minor_units(amount))
+
     def simplify_expenses(self):
-        # First create the net balances for each member
-        net_balances: dict[User, float] = {}
-        for expense in self.expenses:
-            paid_by = expense.get_paid_by()
-            for split in expense.get_splits():
-                participant = split.get_user()
-                amount = split.get_amount()
-                if participant != paid_by:
-                    net_balances[paid_by] = net_balances.get(paid_by, 0) + amount
-                    net_balances[participant] = net_balances.get(participant, 0) - amount
+        with self.lock:
+            if self.simplified_transactions is None:
+                self.simplified_transactions = self._simplify(self.net_balances)
+            return list(self.simplified_transactions)
 
+    @staticmethod
+    def _simplify(net_balances: dict[User, int]) -> list[Transaction]:
         # create two max-heap for creditors and debtors (Since python heapq is a min-heap, we need to negate the balance)
         creditors = []
         debtors = []
@@ -91,7 +129,7 @@ class Group(GroupSubject):
             creditor = heappop(creditors)
             debtor = heappop(debtors)
             amount = min(-1 * creditor[0], -1 * debtor[0])  # -1 is multiplied to make the value positive for debtor
-            transaction = Transaction(debtor[2], creditor[2], amount)
+            transaction = Transaction(debtor[2], creditor[2], amount / 100)
             transactions.append(transaction)
 
             # Re-insert to the heap if there is remaining balance
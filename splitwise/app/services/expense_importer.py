@@ -0,0 +1,123 @@
+from array import array
+from csv import DictReader
+from math import isfinite
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, TextIO, Union
+from uuid import uuid4
+from app.models.enums import SplitType
+from app.models.expense import Expense
+from app.strategies.split_strategy import EqualSplitStrategy, ExactSplitStrategy, PercentSplitStrategy
+
+if TYPE_CHECKING:
+    from app.models.group import Group
+    from app.models.user import User
+
+
+class ExpenseImporter:
+    """
+    Bulk expense import from CSV into a group
+
+    Columns: description, amount, paid_by, participants, split_type, split_values. Users are given by email,
+    `participants` and `split_values` are `;`-separated, and `split_type` is EQUAL (default), PERCENT or EXACT.
+
+    Rows are read as a stream and handled in batches:
+    - Splits for the whole batch are computed into flat columns (debtor, creditor, paise), without a Split object per participant
+    - The columns are netted per pair of users, then every touched BalanceSheet is updated in one locked pass
+    - The group gets its expenses and net-balance deltas in one call and notifies its members once per batch
+    Rows that fail validation are skipped and reported with their line number.
+    """
+
+    BATCH_SIZE = 1_000
+    MAX_AMOUNT = 1_000_000_000.0  # per expense; keeps paise well inside the 64-bit split columns
+    STRATEGIES = {SplitType.EQUAL: EqualSplitStrategy(), SplitType.PERCENT: PercentSplitStrategy(), SplitType.EXACT: ExactSplitStrategy()}
+
+    def __init__(self, batch_size: int = BATCH_SIZE):
+        if batch_size <= 0:
+            raise ValueError("Batch size must be positive")
+        self.batch_size = batch_size
+
+    def import_csv(self, group: "Group", source: Union[str, TextIO, Iterable[str]]) -> dict[str, Any]:
+        """Import every row of `source` (a path, an open file or lines of CSV) into `group`"""
+        if isinstance(source, str):
+            with open(source, newline="") as file:
+                return self.import_csv(group, file)
+
+        members = {member.get_email(): member for member in group.get_members()}
+        summary: dict[str, Any] = {"imported": 0, "batches": 0, "errors": []}
+        for batch in self._batches(DictReader(source)):
+            expenses = []
+            debtors, creditors, amounts = array("i"), array("i"), array("q")  # one entry per split
+            user_index: dict["User", int] = {}  # user -> value in the debtor/creditor columns
+            for line, row in batch:
+                try:
+                    expense = self._build_expense(row, members)
+                    shares = expense.get_minor_unit_shares()
+                except (ArithmeticError, KeyError, TypeError, ValueError) as error:
+                    summary["errors"].append({"line": line, "error": str(error)})
+                    continue
+                expenses.append(expense)
+                creditor = user_index.setdefault(expense.get_paid_by(), len(user_index))
+                for participant, paise in shares:
+                    if participant != expense.get_paid_by() and paise:
+                        debtors.append(user_index.setdefault(participant, len(user_index)))
+                        creditors.append(creditor)
+                        amounts.append(paise)
+            if not expenses:
+                continue
+            self._apply_batch(group, expenses, list(user_index), debtors, creditors, amounts)
+            summary["imported"] += len(expenses)
+            summary["batches"] += 1
+        return summary
+
+    def _batches(self, reader: DictReader) -> Iterator[list[tuple[int, dict[str, str]]]]:
+        batch = []
+        for row in reader:
+            batch.append((reader.line_num, row))
+            if len(batch) == self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _build_expense(self, row: dict[str, str], members: dict[str, "User"]) -> Expense:
+        def member(email: str) -> "User":
+            if email.strip() not in members:
+                raise ValueError(f"Unknown group member '{email.strip()}'")
+            return members[email.strip()]
+
+        split_type = SplitType((row.get("split_type") or "EQUAL").strip().upper())
+        participants = [member(email) for email in (row.get("participants") or "").split(";") if email.strip()]
+        if not participants:
+            raise ValueError("An expense needs at least one participant")
+        split_values = [float(value) for value in row["split_values"].split(";")] if (row.get("split_values") or "").strip() else None
+        if split_type != SplitType.EQUAL and (split_values is None or len(split_values) != len(participants)):
+            raise ValueError("Split values must be the same length as participants")
+        # float() accepts inf and nan, which would overflow or poison the paise columns
+        if split_values is not None and not all(isfinite(value) and value >= 0 for value in split_values):
+            raise ValueError("Split values must be finite and not negative")
+        amount = float(row["amount"])
+        if not isfinite(amount) or not 0 < amount <= self.MAX_AMOUNT:
+            raise ValueError(f"Amount must be a positive number up to {self.MAX_AMOUNT:,.0f}")
+        return Expense(str(uuid4()), row["description"], amount, member(row.get("paid_by") or ""), participants, self.STRATEGIES[split_type], split_values)
+
+    @staticmethod
+    def _apply_batch(group: "Group", expenses: list[Expense], users: list["User"], debtors: array, creditors: array, amounts: array) -> None:
+        # Net the batch per (debtor, creditor) pair, then per balance sheet owner
+        pair_totals: dict[tuple[int, int], int] = {}
+        for debtor, creditor, paise in zip(debtors, creditors, amounts):
+            pair_totals[debtor, creditor] = pair_totals.get((debtor, creditor), 0) + paise
+
+        sheet_deltas: dict["User", dict["User", float]] = {}
+        net_deltas: dict["User", int] = {}
+        for (debtor, creditor), paise in pair_totals.items():
+            debtor_user, creditor_user = users[debtor], users[creditor]
+            # Same directions as Group.add_expense: the participant's sheet goes up, the payer's goes down
+            debtor_sheet = sheet_deltas.setdefault(debtor_user, {})
+            debtor_sheet[creditor_user] = debtor_sheet.get(creditor_user, 0) + paise / 100
+            creditor_sheet = sheet_deltas.setdefault(creditor_user, {})
+            creditor_sheet[debtor_user] = creditor_sheet.get(debtor_user, 0) - paise / 100
+            net_deltas[creditor_user] = net_deltas.get(creditor_user, 0) + paise
+            net_deltas[debtor_user] = net_deltas.get(debtor_user, 0) - paise
+
+        for owner, deltas in sheet_deltas.items():
+            owner.get_balance_sheet().adjust_balances(deltas)
+        group.add_imported_expenses(expenses, net_deltas)
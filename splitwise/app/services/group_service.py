@@ -1,13 +1,15 @@
 from app.models.group import Group
 from app.models.user import User
-from typing import Optional
+from typing import Any, Optional, TextIO, Union
 from app.models.transaction import Transaction
 from app.models.expense import Expense
+from app.services.expense_importer import ExpenseImporter
 
 
 class GroupService:
     def __init__(self):
         self.groups: dict[str, Group] = {}
+        self.expense_importer = ExpenseImporter()
 
     def create_group(self, name: str, members: list[User]) -> Group:
         group = Group(name, members)
@@ -26,6 +28,11 @@ class GroupService:
         group = self.groups[group_id]
         return group.simplify_expenses()
 
+    def import_expenses(self, group_id: str, source: Union[str, TextIO]) -> dict[str, Any]:
+        if group_id not in self.groups:
+            raise ValueError(f"Group with id {group_id} not found")
+        return self.expense_importer.import_csv(self.groups[group_id], source)
+
     def add_expense(self, group_id: str, expense: Expense) -> None:
         if group_id not in self.groups:
             raise ValueError(f"Group with id {group_id} not found")
@@ -3,6 +3,7 @@ from app.services.group_service import GroupService
 from app.models.user import User
 from app.models.group import Group
 import threading
+from typing import Any, TextIO, Union
 from app.models.expense import Expense
 from app.models.balance_sheet import BalanceSheet
 
@@ -44,6 +45,10 @@ class SplitWiseService:
     def add_expense_to_group(self, group_id: str, expense: Expense) -> None:
         self.group_service.add_expense(group_id, expense)
 
+    def import_expenses_to_group(self, group_id: str, source: Union[str, TextIO]) -> dict[str, Any]:
+        """Bulk import expenses from a CSV file path or open file"""
+        return self.group_service.import_expenses(group_id, source)
+
     def show_user_balance_sheet(self, user_id: str) -> None:
         self.user_service.show_balance_sheet(user_id)
 
@@ -28,6 +28,11 @@ class UserService:
         user1.get_balance_sheet().adjust_balance(user2, -1 * amount)
         user2.get_balance_sheet().adjust_balance(user1, amount)
 
+        # The whole amount goes to one shared group, the one where user1 owes the most, so group balances match the balance sheets
+        shared_groups = [group for group in user1.groups if user2 in group.get_members()]
+        if shared_groups:
+            min(shared_groups, key=lambda group: group.get_net_balance(user1)).record_settlement(user1, user2, amount)
+
     def show_balance_sheet(self, user_id: str):
         if user_id not in self.users:
             raise ValueError(f"User with id {user_id} not found")
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Splitwise Benchmarks
+
+Usage: python benchmark.py [simplify|import|all]
+"""
+
+import csv
+import io
+import os
+import random
+import statistics
+import sys
+import time
+from contextlib import redirect_stdout
+from app.builders.expense_builder import ExpenseBuilder
+from app.models.group import Group
+from app.models.user import User
+from app.services.split_wise_service import SplitWiseService
+from app.strategies.split_strategy import EqualSplitStrategy, ExactSplitStrategy, PercentSplitStrategy
+
+
+class SplitwiseBenchmark:
+    GROUP_MEMBERS = 50
+    EXPENSES = 20_000
+    SIMPLIFY_CALLS = 200
+    FULL_SCAN_CALLS = 5
+    IMPORT_MEMBERS = 20
+    IMPORT_ROWS = 50_000  # a year of a busy shared household
+
+    @staticmethod
+    def main():
+        section = sys.argv[1] if len(sys.argv) > 1 else "all"
+
+        print("=" * 60)
+        print("SPLITWISE BENCHMARK")
+        print("=" * 60)
+
+        if section in ("simplify", "all"):
+            SplitwiseBenchmark.benchmark_simplify()
+        if section in ("import", "all"):
+            SplitwiseBenchmark.benchmark_import()
+
+    @staticmethod
+    def measure(name: str, samples: list, run) -> None:
+        latencies = []
+        for sample in samples:
+            start_time = time.perf_counter()
+            run(sample)
+            latencies.append((time.perf_counter() - start_time) * 1_000_000)
+        latencies.sort()
+        print(f"{name:<34} mean {statistics.mean(latencies):10.1f} us   p50 {statistics.median(latencies):10.1f} us   p99 {latencies[int(len(latencies) * 0.99) - 1]:10.1f} us")
+
+    @staticmethod
+    def random_expense(rng: random.Random, members: list[User]):
+        participants = rng.sample(members, rng.randint(2, 8))
+        paid_by = rng.choice(participants)
+        amount = float(rng.randint(100, 100_000)) / 100
+        builder = ExpenseBuilder().set_description("Household").set_amount(amount).set_paid_by(paid_by).set_participants(participants)
+        kind = rng.random()
+        if kind < 0.6:
+            return builder.set_split_strategy(EqualSplitStrategy()).build()
+        if kind < 0.8:
+            share = 100 / len(participants)
+            return builder.set_split_strategy(PercentSplitStrategy()).set_split_values([share] * len(participants)).build()
+        exact = [round(amount / len(participants), 2)] * len(participants)
+        exact[-1] = round(amount - sum(exact[:-1]), 2)
+        return builder.set_split_strategy(ExactSplitStrategy()).set_split_values(exact).build()
+
+    @staticmethod
+    def full_scan_net_balances(group: Group) -> dict:
+        """The old simplify_expenses first step: every split of every expense, in floats"""
+        net_balances: dict = {}
+        for expense in group.get_expenses():
+            paid_by = expense.get_paid_by()
+            for split in expense.get_splits():
+                participant = split.get_user()
+                if participant != paid_by:
+                    net_balances[paid_by] = net_balances.get(paid_by, 0) + split.get_amount()
+                    net_balances[participant] = net_balances.get(participant, 0) - split.get_amount()
+        return net_balances
+
+    @staticmethod
+    def benchmark_simplify():
+        """Settle-up suggestions for a long-lived group: running net balances against rebuilding them from history"""
+        benchmark = SplitwiseBenchmark
+        rng = random.Random(23)
+        service = SplitWiseService.get_instance()
+        members = [service.add_user(f"Member {index}", f"member{index}@example.com") for index in range(benchmark.GROUP_MEMBERS)]
+
+        print(f"\n--- Simplify ({benchmark.EXPENSES:,} expenses, {benchmark.GROUP_MEMBERS} members) ---")
+        # Expense and group notifications print per member; keep the benchmark output readable
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            group = service.add_group("Shared flat", members)
+            expenses = [benchmark.random_expense(rng, members) for _ in range(benchmark.EXPENSES)]
+            start_time = time.perf_counter()
+            for expense in expenses:
+                service.add_expense_to_group(group.get_id(), expense)
+            elapsed = time.perf_counter() - start_time
+        print(f"{'add_expense':<34} {elapsed / benchmark.EXPENSES * 1_000_000:10.1f} us/expense")
+
+        scanned = benchmark.full_scan_net_balances(group)
+        drift = max(abs(total - group.get_net_balance(member)) for member, total in scanned.items())
+        print(f"Net balances sum to {sum(group.net_balances.values())} paise; the old float rebuild differs by up to ₹{drift:.2f} (its equal shares are not paise)")
+        # A balance sheet holds what each other user owes its owner, so the owner's net is minus its total
+        sheet_drift = max(abs(group.get_net_balance(member) + sum(member.get_balance_sheet().get_balances().values())) for member in members)
+        print(f"Balance sheets differ from the net balances by up to ₹{sheet_drift:.2f}")
+
+        benchmark.measure("simplify, cached", range(benchmark.SIMPLIFY_CALLS), lambda _: group.simplify_expenses())
+
+        def simplify_after_change(_):
+            group.record_settlement(debtor, creditor, 0.01)
+            group.simplify_expenses()
+
+        debtor, creditor = min(members, key=group.get_net_balance), max(members, key=group.get_net_balance)
+        benchmark.measure("simplify after a settle-up", range(benchmark.SIMPLIFY_CALLS), simplify_after_change)
+        benchmark.measure("old full rebuild (net balances)", range(benchmark.FULL_SCAN_CALLS), lambda _: benchmark.full_scan_net_balances(group))
+
+    @staticmethod
+    def benchmark_import():
+        """A year of expenses from CSV: the bulk importer against building and adding each expense on its own"""
+        benchmark = SplitwiseBenchmark
+        rng = random.Random(29)
+        service = SplitWiseService.get_instance()
+        members = [service.add_user(f"Flatmate {index}", f"flatmate{index}@example.com") for index in range(benchmark.IMPORT_MEMBERS)]
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(["description", "amount", "paid_by", "participants", "split_type", "split_values"])
+        for expense in (benchmark.random_expense(rng, members) for _ in range(benchmark.IMPORT_ROWS)):
+            split_type = {EqualSplitStrategy: "EQUAL", PercentSplitStrategy: "PERCENT", ExactSplitStrategy: "EXACT"}[type(expense.get_split_strategy())]
+            split_values = ";".join(map(str, expense.split_values)) if expense.split_values else ""
+            writer.writerow([expense.get_description(), expense.get_amount(), expense.get_paid_by().get_email(), ";".join(user.get_email() for user in expense.get_participants()), split_type, split_values])
+        text = buffer.getvalue()
+
+        print(f"\n--- CSV import ({benchmark.IMPORT_ROWS:,} rows, {benchmark.IMPORT_MEMBERS} members) ---")
+        by_email = {member.get_email(): member for member in members}
+        strategies = {"EQUAL": EqualSplitStrategy(), "PERCENT": PercentSplitStrategy(), "EXACT": ExactSplitStrategy()}
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            one_by_one = service.add_group("Flat, one by one", members)
+            start_time = time.perf_counter()
+            for row in csv.DictReader(io.StringIO(text)):
+                builder = ExpenseBuilder().set_description(row["description"]).set_amount(float(row["amount"])).set_paid_by(by_email[row["paid_by"]])
+                builder.set_participants([by_email[email] for email in row["participants"].split(";")]).set_split_strategy(strategies[row["split_type"]])
+                if row["split_values"]:
+                    builder.set_split_values([float(value) for value in row["split_values"].split(";")])
+                service.add_expense_to_group(one_by_one.get_id(), builder.build())
+            one_by_one_elapsed = time.perf_counter() - start_time
+
+            bulk = service.add_group("Flat, bulk import", members)
+            start_time = time.perf_counter()
+            summary = service.import_expenses_to_group(bulk.get_id(), io.StringIO(text))
+            bulk_elapsed = time.perf_counter() - start_time
+
+        print(f"{'add_expense per row':<34} {benchmark.IMPORT_ROWS / one_by_one_elapsed:>10,.0f} rows/s")
+        print(f"{'bulk import':<34} {benchmark.IMPORT_ROWS / bulk_elapsed:>10,.0f} rows/s   {summary['imported']:,} imported in {summary['batches']} batches, {len(summary['errors'])} errors")
+        difference = max(abs(one_by_one.get_net_balance(member) - bulk.get_net_balance(member)) for member in members)
+        print(f"Largest net balance difference between the two groups: ₹{difference:.2f} (both split in exact paise)")
+
+
+if __name__ == "__main__":
+    SplitwiseBenchmark.main()
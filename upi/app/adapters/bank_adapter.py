@@ -89,17 +89,18 @@ class HDFCAdapter(BankAPIAdapter):
             hdfc_transaction_id = f"HDFC_{hash(str(request_data)) % 1000000:06d}"
 
             if transaction_type == "DEBIT":
-                # Check sufficient funds and debit
-                if account.get_balance() < amount:
-                    return {
-                        "responseCode": "99",
-                        "responseMessage": "Insufficient funds",
-                        "transactionId": "",
-                        "referenceNumber": "",
-                        "hdfcReference": "",
-                        "error": "Insufficient funds",
-                    }
-                account.withdraw(amount)
+                # Check sufficient funds and debit under one lock hold, so a concurrent debit cannot slip in between
+                with account.lock:
+                    if account.get_balance() < amount:
+                        return {
+                            "responseCode": "99",
+                            "responseMessage": "Insufficient funds",
+                            "transactionId": "",
+                            "referenceNumber": "",
+                            "hdfcReference": "",
+                            "error": "Insufficient funds",
+                        }
+                    account.withdraw(amount)
 
             elif transaction_type == "CREDIT":
                 # Credit the amount
@@ -268,16 +269,17 @@ class SBIAdapter(BankAPIAdapter):
             sbi_transaction_id = f"SBI_{hash(str(request_data)) % 1000000:06d}"
 
             if transaction_type == "DEBIT":
-                # Check sufficient funds and debit
-                if account.get_balance() < amount:
-                    return {
-                        "statusCode": "500",
-                        "statusMessage": "Insufficient funds",
-                        "sbiTransactionId": "",
-                        "sbiReferenceId": "",
-                        "error": "Insufficient funds",
-                    }
-                account.withdraw(amount)
+                # Check sufficient funds and debit under one lock hold, so a concurrent debit cannot slip in between
+                with account.lock:
+                    if account.get_balance() < amount:
+                        return {
+                            "statusCode": "500",
+                            "statusMessage": "Insufficient funds",
+                            "sbiTransactionId": "",
+                            "sbiReferenceId": "",
+                            "error": "Insufficient funds",
+                        }
+                    account.withdraw(amount)
 
             elif transaction_type == "CREDIT":
                 # Credit the amount
@@ -429,15 +431,16 @@ class ICICIAdapter(BankAPIAdapter):
             icici_transaction_id = f"ICICI_{hash(str(request_data)) % 1000000:06d}"
 
             if transaction_type == "DEBIT":
-                # Check sufficient funds and debit
-                if account.get_balance() < amount:
-                    return {
-                        "status": "FAILED",
-                        "message": "Insufficient funds",
-                        "transactionId": "",
-                        "error": "Insufficient funds",
-                    }
-                account.withdraw(amount)
+                # Check sufficient funds and debit under one lock hold, so a concurrent debit cannot slip in between
+                with account.lock:
+                    if account.get_balance() < amount:
+                        return {
+                            "status": "FAILED",
+                            "message": "Insufficient funds",
+                            "transactionId": "",
+                            "error": "Insufficient funds",
+                        }
+                    account.withdraw(amount)
 
             elif transaction_type == "CREDIT":
                 # Credit the amount
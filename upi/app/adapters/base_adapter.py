@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
 from app.repositories.account_repository import AccountRepository
+from app.exceptions.insufficient_fund import InsufficientFundsException
 
 
 @dataclass
@@ -11,6 +12,7 @@ class StandardizedResponse:
     success: bool
     amount: float
     status: str
+    transaction_id: Optional[str] = None
 
 
 class BankAPIAdapter(ABC):
@@ -38,3 +40,25 @@ class BankAPIAdapter(ABC):
     def get_transaction_status(self, transaction_id: str) -> StandardizedResponse:
         """Get transaction status"""
         raise NotImplementedError("get_transaction_status method must be implemented")
+
+    def process_bulk_postings(self, postings: List[Dict[str, Any]]) -> List[StandardizedResponse]:
+        """
+        Apply a settlement batch in one call: one net posting per account, a negative amount is a debit
+        Returns one response per posting, in order
+        """
+        responses = []
+        for posting in postings:
+            amount = posting["amount"]
+            account = self.account_repository.get_account(posting["account_number"])
+            if account is None:
+                responses.append(StandardizedResponse(success=False, amount=abs(amount), status="ACCOUNT_NOT_FOUND"))
+                continue
+            try:
+                if amount < 0:
+                    account.withdraw(-amount)
+                else:
+                    account.deposit(amount)
+                responses.append(StandardizedResponse(success=True, amount=abs(amount), status="SUCCESS"))
+            except InsufficientFundsException:
+                responses.append(StandardizedResponse(success=False, amount=abs(amount), status="INSUFFICIENT_FUNDS"))
+        return responses
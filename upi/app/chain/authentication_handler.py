@@ -1,4 +1,4 @@
-from app.chain.base_handler import PaymentHandler
+from app.chain.base_handler import HANDLER_PASSED, PaymentHandler
 from app.adapters.base_adapter import StandardizedResponse
 from app.proxies.secure_bank_proxy import SecureBankProxy
 from app.decorators.payment_processor_impl import ConcretePaymentProcessor
@@ -19,6 +19,8 @@ class AuthenticationHandler(PaymentHandler):
     - Follows Single Responsibility Principle
     """
 
+    SUCCESS_STATUS = "AUTHENTICATED"
+
     def _process(self, payment: "Payment") -> StandardizedResponse:
         amount = payment.get_amount()
         payer_account = payment.get_payer_account()
@@ -26,4 +28,4 @@ class AuthenticationHandler(PaymentHandler):
         if not payer_account:
             return StandardizedResponse(success=False, amount=amount, status="UNAUTHORIZED")
 
-        return StandardizedResponse(success=True, amount=amount, status="AUTHENTICATED")
+        return HANDLER_PASSED
@@ -6,9 +6,15 @@ if TYPE_CHECKING:
     from app.models.payment import Payment
 
 
+# Returned by every stage that passes: a chain of n stages allocates one response, not n
+HANDLER_PASSED = StandardizedResponse(success=True, amount=0.0, status="PASSED")
+
+
 class PaymentHandler(ABC):
     """Base handler for Chain of Responsibility pattern"""
 
+    SUCCESS_STATUS = "PASSED"  # status of the chain's response when this handler is the last one
+
     def __init__(self):
         self._next_handler: Optional["PaymentHandler"] = None
 
@@ -18,22 +24,35 @@ class PaymentHandler(ABC):
         return handler
 
     def handle(self, payment: "Payment") -> StandardizedResponse:
-        """Handle payment or pass to next handler"""
-
-        # Process current handler
-        response = self._process(payment)
-
-        # If current handler failed, return failure
-        if not response.success:
-            return response
-
-        # If there's a next handler, pass to it
-        if self._next_handler:
-            return self._next_handler.handle(payment)
+        """Handle payment with this handler and every handler after it, stopping at the first failure"""
+        handler: Optional["PaymentHandler"] = self
+        while handler is not None:
+            response = handler._process(payment)
+            if not response.success:
+                return response
+            last, handler = handler, handler._next_handler
 
         # No more handlers, return success
+        return last.complete(payment, response)
+
+    def complete(self, payment: "Payment", response: StandardizedResponse) -> StandardizedResponse:
+        """The chain's success response, when this handler was the last one to run"""
+        if response is HANDLER_PASSED:
+            return StandardizedResponse(success=True, amount=payment.get_amount(), status=self.get_success_status(payment))
         return response
 
+    def get_success_status(self, payment: "Payment") -> str:
+        return self.SUCCESS_STATUS
+
+    def get_chain(self) -> list["PaymentHandler"]:
+        """This handler and every handler after it, in order"""
+        handlers: list["PaymentHandler"] = []
+        handler: Optional["PaymentHandler"] = self
+        while handler is not None:
+            handlers.append(handler)
+            handler = handler._next_handler
+        return handlers
+
     @abstractmethod
     def _process(self, payment: "Payment") -> StandardizedResponse:
         """Process payment in this handler"""
@@ -1,4 +1,4 @@
-from app.chain.base_handler import PaymentHandler
+from app.chain.payment_pipeline import PaymentPipeline
 from app.chain.validation_handler import ValidationHandler
 from app.chain.authentication_handler import AuthenticationHandler
 from app.chain.fraud_handler import FraudHandler
@@ -7,10 +7,10 @@ from app.chain.settlement_handler import SettlementHandler
 
 
 class PaymentChainFactory:
-    """Factory to create payment processing chains"""
+    """Factory to create payment processing chains, flattened into instrumented pipelines"""
 
     @staticmethod
-    def create_full_chain() -> PaymentHandler:
+    def create_full_chain() -> PaymentPipeline:
         """Create complete payment processing chain"""
 
         # Create handlers
@@ -23,10 +23,10 @@ class PaymentChainFactory:
         # Build chain: validation → authentication → fraud → routing → settlement
         validation.set_next(authentication).set_next(fraud).set_next(routing).set_next(settlement)
 
-        return validation
+        return PaymentPipeline.from_chain(validation)
 
     @staticmethod
-    def create_basic_chain() -> PaymentHandler:
+    def create_basic_chain() -> PaymentPipeline:
         """Create basic payment processing chain (validation + routing)"""
 
         validation = ValidationHandler()
@@ -34,10 +34,10 @@ class PaymentChainFactory:
 
         validation.set_next(routing)
 
-        return validation
+        return PaymentPipeline.from_chain(validation)
 
     @staticmethod
-    def create_secure_chain() -> PaymentHandler:
+    def create_secure_chain() -> PaymentPipeline:
         """Create secure payment processing chain (validation + auth + fraud + routing)"""
 
         validation = ValidationHandler()
@@ -47,10 +47,10 @@ class PaymentChainFactory:
 
         validation.set_next(authentication).set_next(fraud).set_next(routing)
 
-        return validation
+        return PaymentPipeline.from_chain(validation)
 
     @staticmethod
-    def create_custom_chain(*handler_types: str) -> PaymentHandler:
+    def create_custom_chain(*handler_types: str) -> PaymentPipeline:
         """Create custom chain with specified handlers"""
 
         handler_map = {
@@ -75,4 +75,4 @@ class PaymentChainFactory:
         for i in range(len(handlers) - 1):
             handlers[i].set_next(handlers[i + 1])
 
-        return handlers[0]
+        return PaymentPipeline(handlers)
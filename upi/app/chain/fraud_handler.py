@@ -1,4 +1,4 @@
-from app.chain.base_handler import PaymentHandler
+from app.chain.base_handler import HANDLER_PASSED, PaymentHandler
 from app.adapters.base_adapter import StandardizedResponse
 from app.decorators.fraud_check_decorator import FraudCheckDecorator
 from app.decorators.payment_processor_impl import ConcretePaymentProcessor
@@ -19,10 +19,12 @@ class FraudHandler(PaymentHandler):
     - Follows Single Responsibility Principle
     """
 
+    SUCCESS_STATUS = "FRAUD_CHECK_PASSED"
+
     def _process(self, payment: "Payment") -> StandardizedResponse:
         amount = payment.get_amount()
 
         if amount > 50000:
             return StandardizedResponse(success=False, amount=amount, status="FRAUD_DETECTED")
 
-        return StandardizedResponse(success=True, amount=amount, status="FRAUD_CHECK_PASSED")
+        return HANDLER_PASSED
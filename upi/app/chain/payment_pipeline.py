@@ -0,0 +1,134 @@
+from array import array
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Dict, List
+import time
+from app.adapters.base_adapter import StandardizedResponse
+from app.chain.base_handler import HANDLER_PASSED, PaymentHandler
+
+if TYPE_CHECKING:
+    from app.models.payment import Payment
+
+
+class HandlerMetrics:
+    """
+    Call counters and a latency histogram for one pipeline stage
+
+    Buckets are log-linear: each power of two is split into 4 buckets, so a percentile is accurate to within 25%
+    """
+
+    BUCKETS = 256
+
+    def __init__(self, name: str):
+        self.name = name
+        self.lock = Lock()
+        self.histogram = array("q", bytes(self.BUCKETS * 8))
+        self.calls = 0
+        self.failures = 0
+        self.errors = 0  # raised instead of returning a response
+        self.total_ns = 0
+        self.max_ns = 0
+
+    @staticmethod
+    def _bucket(elapsed_ns: int) -> int:
+        if elapsed_ns < 8:
+            return max(elapsed_ns, 0)
+        shift = elapsed_ns.bit_length() - 3
+        return min(shift * 4 + (elapsed_ns >> shift), HandlerMetrics.BUCKETS - 1)
+
+    @staticmethod
+    def _bucket_upper_bound(bucket: int) -> int:
+        if bucket < 8:
+            return bucket
+        shift = bucket // 4 - 1
+        return ((bucket % 4 + 5) << shift) - 1
+
+    def record(self, elapsed_ns: int, succeeded: bool, raised: bool = False) -> None:
+        bucket = self._bucket(elapsed_ns)
+        with self.lock:
+            self.histogram[bucket] += 1
+            self.calls += 1
+            self.failures += not succeeded
+            self.errors += raised
+            self.total_ns += elapsed_ns
+            if elapsed_ns > self.max_ns:
+                self.max_ns = elapsed_ns
+
+    def percentile(self, fraction: float) -> float:
+        """Latency in microseconds below which `fraction` of the calls fall (bucket upper bound)"""
+        with self.lock:
+            if not self.calls:
+                return 0.0
+            rank = max(1, round(self.calls * fraction))
+            seen = 0
+            for bucket, count in enumerate(self.histogram):
+                seen += count
+                if seen >= rank:
+                    return min(self._bucket_upper_bound(bucket), self.max_ns) / 1000
+        return self.max_ns / 1000
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "errors": self.errors,
+            "mean_us": self.total_ns / self.calls / 1000 if self.calls else 0.0,
+            "p50_us": self.percentile(0.50),
+            "p99_us": self.percentile(0.99),
+            "max_us": self.max_ns / 1000,
+        }
+
+    def reset(self) -> None:
+        with self.lock:
+            self.histogram = array("q", bytes(self.BUCKETS * 8))
+            self.calls = self.failures = self.errors = self.total_ns = self.max_ns = 0
+
+
+class PaymentPipeline:
+    """
+    A handler chain flattened into a list of stages, run in a loop instead of by recursion
+
+    Every stage is timed into its own HandlerMetrics; `get_metrics` shows which stage is slow or failing
+    """
+
+    def __init__(self, handlers: List[PaymentHandler]):
+        if not handlers:
+            raise ValueError("A pipeline needs at least one handler")
+        self.handlers = handlers
+        self.metrics: List[HandlerMetrics] = []
+        names: Dict[str, int] = {}
+        for handler in handlers:
+            name = handler.get_handler_name()
+            names[name] = names.get(name, 0) + 1
+            # The same handler type twice in one chain gets its own entry
+            self.metrics.append(HandlerMetrics(name if names[name] == 1 else f"{name}#{names[name]}"))
+        self.stages = list(zip(handlers, self.metrics))
+
+    @classmethod
+    def from_chain(cls, head: PaymentHandler) -> "PaymentPipeline":
+        return cls(head.get_chain())
+
+    def handle(self, payment: "Payment") -> StandardizedResponse:
+        response = HANDLER_PASSED
+        clock = time.perf_counter_ns
+        for handler, metrics in self.stages:
+            start_ns = clock()
+            try:
+                response = handler._process(payment)
+            except Exception:
+                metrics.record(clock() - start_ns, False, raised=True)
+                raise
+            metrics.record(clock() - start_ns, response.success)
+            if not response.success:
+                return response
+        return self.handlers[-1].complete(payment, response)
+
+    def get_handlers(self) -> List[PaymentHandler]:
+        return list(self.handlers)
+
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Per-stage counters and latency percentiles, in chain order"""
+        return {metrics.name: metrics.snapshot() for metrics in self.metrics}
+
+    def reset_metrics(self) -> None:
+        for metrics in self.metrics:
+            metrics.reset()
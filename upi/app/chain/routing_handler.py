@@ -1,4 +1,4 @@
-from app.chain.base_handler import PaymentHandler
+from app.chain.base_handler import HANDLER_PASSED, PaymentHandler
 from app.adapters.base_adapter import StandardizedResponse
 from app.models.enums import PaymentMethod
 from typing import TYPE_CHECKING
@@ -10,52 +10,57 @@ if TYPE_CHECKING:
 class RoutingHandler(PaymentHandler):
     """Handler for payment routing and processing"""
 
+    def __init__(self):
+        super().__init__()
+        # Built once: a dict lookup per payment instead of walking an if/elif ladder
+        self.routes = {
+            PaymentMethod.UPI_PUSH: self._process_upi_push,
+            PaymentMethod.UPI_PULL: self._process_upi_pull,
+            PaymentMethod.CREDIT_CARD: self._process_credit_card,
+            PaymentMethod.DEBIT_CARD: self._process_debit_card,
+            PaymentMethod.NET_BANKING: self._process_net_banking,
+            PaymentMethod.WALLET: self._process_wallet,
+        }
+
     def _process(self, payment: "Payment") -> StandardizedResponse:
         """Route payment based on payment method"""
 
-        payment_method = payment.get_payment_method()
         amount = payment.get_amount()
 
         try:
             # Route based on payment method
-            if payment_method == PaymentMethod.UPI_PUSH:
-                return self._process_upi_push(payment)
-            elif payment_method == PaymentMethod.UPI_PULL:
-                return self._process_upi_pull(payment)
-            elif payment_method == PaymentMethod.CREDIT_CARD:
-                return self._process_credit_card(payment)
-            elif payment_method == PaymentMethod.DEBIT_CARD:
-                return self._process_debit_card(payment)
-            elif payment_method == PaymentMethod.NET_BANKING:
-                return self._process_net_banking(payment)
-            elif payment_method == PaymentMethod.WALLET:
-                return self._process_wallet(payment)
-            else:
+            route = self.routes.get(payment.get_payment_method())
+            if route is None:
                 return StandardizedResponse(success=False, amount=amount, status="UNSUPPORTED_PAYMENT_METHOD")
+            return route(payment)
 
         except Exception as e:
             return StandardizedResponse(success=False, amount=amount, status="ROUTING_ERROR")
 
+    def get_success_status(self, payment: "Payment") -> str:
+        # UPI_PUSH_SUCCESS, CREDIT_CARD_SUCCESS, ...
+        return f"{payment.get_payment_method().name}_SUCCESS"
+
     def _process_upi_push(self, payment: "Payment") -> StandardizedResponse:
         """Process UPI Push payment"""
-        return StandardizedResponse(success=True, amount=payment.get_amount(), status="UPI_PUSH_SUCCESS")
+        return HANDLER_PASSED
 
     def _process_upi_pull(self, payment: "Payment") -> StandardizedResponse:
         """Process UPI Pull payment"""
-        return StandardizedResponse(success=True, amount=payment.get_amount(), status="UPI_PULL_SUCCESS")
+        return HANDLER_PASSED
 
     def _process_credit_card(self, payment: "Payment") -> StandardizedResponse:
         """Process Credit Card payment"""
-        return StandardizedResponse(success=True, amount=payment.get_amount(), status="CREDIT_CARD_SUCCESS")
+        return HANDLER_PASSED
 
     def _process_debit_card(self, payment: "Payment") -> StandardizedResponse:
         """Process Debit Card payment"""
-        return StandardizedResponse(success=True, amount=payment.get_amount(), status="DEBIT_CARD_SUCCESS")
+        return HANDLER_PASSED
 
     def _process_net_banking(self, payment: "Payment") -> StandardizedResponse:
         """Process Net Banking payment"""
-        return StandardizedResponse(success=True, amount=payment.get_amount(), status="NET_BANKING_SUCCESS")
+        return HANDLER_PASSED
 
     def _process_wallet(self, payment: "Payment") -> StandardizedResponse:
         """Process Wallet payment"""
-        return StandardizedResponse(success=True, amount=payment.get_amount(), status="WALLET_SUCCESS")
+        return HANDLER_PASSED
@@ -1,4 +1,4 @@
-from app.chain.base_handler import PaymentHandler
+from app.chain.base_handler import HANDLER_PASSED, PaymentHandler
 from app.adapters.base_adapter import StandardizedResponse
 from app.models.enums import PaymentStatus, TransactionStatus
 from app.models.transaction import Transaction
@@ -12,6 +12,8 @@ if TYPE_CHECKING:
 class SettlementHandler(PaymentHandler):
     """Handler for payment settlement and final processing"""
 
+    SUCCESS_STATUS = "SETTLED"
+
     def _process(self, payment: "Payment") -> StandardizedResponse:
         """Handle payment settlement with actual money transfer"""
 
@@ -40,7 +42,7 @@ class SettlementHandler(PaymentHandler):
 
             payment.set_status(PaymentStatus.COMPLETED)
 
-            return StandardizedResponse(success=True, amount=amount, status="SETTLED")
+            return HANDLER_PASSED
 
         except Exception as e:
             payment.set_status(PaymentStatus.FAILED)
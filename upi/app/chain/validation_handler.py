@@ -1,4 +1,4 @@
-from app.chain.base_handler import PaymentHandler
+from app.chain.base_handler import HANDLER_PASSED, PaymentHandler
 from app.adapters.base_adapter import StandardizedResponse
 from typing import TYPE_CHECKING
 
@@ -9,6 +9,8 @@ if TYPE_CHECKING:
 class ValidationHandler(PaymentHandler):
     """Handler for payment validation"""
 
+    SUCCESS_STATUS = "VALIDATED"
+
     def _process(self, payment: "Payment") -> StandardizedResponse:
         """Validate payment request"""
 
@@ -36,4 +38,4 @@ class ValidationHandler(PaymentHandler):
             return StandardizedResponse(success=False, amount=payment.get_amount(), status="SAME_ACCOUNT")
 
         # Validation passed
-        return StandardizedResponse(success=True, amount=payment.get_amount(), status="VALIDATED")
+        return HANDLER_PASSED
@@ -1,52 +1,126 @@
-from typing import List, Dict, Any
+from concurrent.futures import Future, ThreadPoolExecutor
+from heapq import heappop, heappush
+from itertools import count
+from threading import Condition, Lock, Thread
+from typing import Callable, List, Dict, Any, Optional
+from uuid import uuid4
 from app.commands.base_command import Command
 from app.models.enums import CommandStatus
 import time
 
 
-class CommandInvoker:
-    """Invoker for executing commands with retry and rollback capabilities"""
+class _RetryQueue:
+    """Delay queue: runs each callback once its due time has passed, on a single timer thread"""
 
     def __init__(self):
+        self.entries: list = []  # heap of (due time, sequence, callback)
+        self.sequence = count()
+        self.condition = Condition()
+        self.timer_thread: Optional[Thread] = None
+
+    def schedule(self, delay: float, callback: Callable[[], None]) -> None:
+        with self.condition:
+            heappush(self.entries, (time.monotonic() + delay, next(self.sequence), callback))
+            if self.timer_thread is None:
+                self.timer_thread = Thread(target=self._run, name="command-retry-timer", daemon=True)
+                self.timer_thread.start()
+            self.condition.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self.condition:
+                while not self.entries or self.entries[0][0] > time.monotonic():
+                    self.condition.wait(self.entries[0][0] - time.monotonic() if self.entries else None)
+                _, _, callback = heappop(self.entries)
+            callback()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+class CommandInvoker:
+    """
+    Invoker for executing commands with retry and rollback capabilities
+
+    - Commands run on a worker pool, so independent commands execute concurrently
+    - A failed attempt is rescheduled on a delay queue with exponential backoff; no thread sleeps while it waits
+    - Commands submitted under a saga id can be rolled back together, without touching other sagas
+    """
+
+    RETRY_BASE_DELAY = 0.1  # seconds before the first retry, doubled for every further one
+    RETRY_MAX_DELAY = 2.0
+
+    def __init__(self, max_workers: int = 32):
         self.executed_commands: List[Command] = []
         self.failed_commands: List[Command] = []
+        self.saga_commands: Dict[str, List[Command]] = {}  # saga id -> its executed commands, in completion order
+        self.history_lock = Lock()
+        self.workers = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="command-invoker")
+        self.retry_queue = _RetryQueue()
 
-    def execute_command(self, command: Command) -> bool:
-        """Execute a single command with retry logic"""
+    def begin_saga(self) -> str:
+        saga_id = str(uuid4())
+        with self.history_lock:
+            self.saga_commands[saga_id] = []
+        return saga_id
+
+    def submit_command(self, command: Command, saga_id: Optional[str] = None) -> "Future[bool]":
+        """Execute a command on the worker pool; the Future resolves once it succeeds or runs out of retries"""
         print(f"Executing command: {command.__class__.__name__} - {command.get_command_id()}")
+        future: "Future[bool]" = Future()
+        self.workers.submit(self._attempt, command, future, saga_id)
+        return future
 
-        while command.can_retry() or command.get_status() == CommandStatus.PENDING:
-            try:
-                if command.execute():
-                    self.executed_commands.append(command)
-                    print(f"Command executed successfully: {command.get_command_id()}")
-                    return True
-                else:
-                    command.increment_retry()
-                    if command.can_retry():
-                        print(f"Command failed, retrying... ({command.retry_count}/{command.max_retries})")
-                        time.sleep(1)  # Wait before retry
-                    else:
-                        self.failed_commands.append(command)
-                        command.set_status(CommandStatus.FAILED)
-                        print(f"Command failed permanently: {command.get_command_id()}")
-                        return False
-            except Exception as e:
-                command.set_error(str(e))
-                command.increment_retry()
-                if not command.can_retry():
-                    self.failed_commands.append(command)
-                    print(f"Command failed with exception: {str(e)}")
-                    return False
-
-        return False
-
-    def execute_commands(self, commands: List[Command]) -> Dict[str, Any]:
-        """Execute multiple commands"""
+    def execute_command(self, command: Command, saga_id: Optional[str] = None) -> bool:
+        """Execute a single command with retry logic"""
+        return self.submit_command(command, saga_id).result()
+
+    def _attempt(self, command: Command, future: "Future[bool]", saga_id: Optional[str]) -> None:
+        try:
+            succeeded = command.execute()
+        except Exception as e:
+            command.set_error(str(e))
+            succeeded = False
+
+        if succeeded:
+            with self.history_lock:
+                self.executed_commands.append(command)
+                if saga_id is not None:
+                    self.saga_commands.setdefault(saga_id, []).append(command)
+            print(f"Command executed successfully: {command.get_command_id()}")
+            future.set_result(True)
+            return
+
+        command.increment_retry()
+        command.set_status(CommandStatus.FAILED)
+        if command.can_retry():
+            delay = min(self.RETRY_BASE_DELAY * 2 ** (command.retry_count - 1), self.RETRY_MAX_DELAY)
+            print(f"Command failed, retrying in {delay:.1f}s... ({command.retry_count}/{command.max_retries})")
+            self.retry_queue.schedule(delay, lambda: self._resubmit(command, future, saga_id))
+            return
+
+        with self.history_lock:
+            self.failed_commands.append(command)
+        print(f"Command failed permanently: {command.get_command_id()} {command.error_message or ''}".rstrip())
+        future.set_result(False)
+
+    def _resubmit(self, command: Command, future: "Future[bool]", saga_id: Optional[str]) -> None:
+        try:
+            self.workers.submit(self._attempt, command, future, saga_id)
+        except RuntimeError:
+            # The invoker was shut down while the retry was waiting
+            command.set_error("Invoker shut down before retry")
+            with self.history_lock:
+                self.failed_commands.append(command)
+            future.set_result(False)
+
+    def execute_commands(self, commands: List[Command], saga_id: Optional[str] = None) -> Dict[str, Any]:
+        """Execute multiple independent commands concurrently"""
         results = {"successful": [], "failed": [], "total": len(commands)}
 
-        for command in commands:
-            if self.execute_command(command):
+        futures = [self.submit_command(command, saga_id) for command in commands]
+        for command, future in zip(commands, futures):
+            if future.result():
                 results["successful"].append(command.get_command_id())
             else:
                 results["failed"].append(command.get_command_id())
@@ -55,11 +129,15 @@ class CommandInvoker:
 
     def rollback_last_command(self) -> bool:
         """Rollback the last executed command"""
-        if not self.executed_commands:
-            print("No commands to rollback")
-            return False
+        with self.history_lock:
+            if not self.executed_commands:
+                print("No commands to rollback")
+                return False
+            last_command = self.executed_commands.pop()
+            for commands in self.saga_commands.values():
+                if last_command in commands:
+                    commands.remove(last_command)
 
-        last_command = self.executed_commands.pop()
         print(f"Rolling back command: {last_command.__class__.__name__}")
 
         if last_command.undo():
@@ -69,16 +147,37 @@ class CommandInvoker:
             print("Rollback failed")
             return False
 
+    def rollback_saga(self, saga_id: str) -> Dict[str, Any]:
+        """Rollback the executed commands of one saga in reverse order"""
+        with self.history_lock:
+            commands = self.saga_commands.pop(saga_id, [])
+            executed = set(map(id, commands))
+            self.executed_commands = [command for command in self.executed_commands if id(command) not in executed]
+        return self._undo_all(commands)
+
     def rollback_all_commands(self) -> Dict[str, Any]:
         """Rollback all executed commands in reverse order"""
-        rollback_results = {"successful": [], "failed": [], "total": len(self.executed_commands)}
+        with self.history_lock:
+            commands = self.executed_commands
+            self.executed_commands = []
+            self.saga_commands.clear()
+        return self._undo_all(commands)
+
+    @staticmethod
+    def _undo_all(commands: List[Command]) -> Dict[str, Any]:
+        rollback_results = {"successful": [], "failed": [], "total": len(commands)}
 
         # Rollback in reverse order
-        for command in reversed(self.executed_commands):
+        for command in reversed(commands):
             if command.undo():
                 rollback_results["successful"].append(command.get_command_id())
             else:
                 rollback_results["failed"].append(command.get_command_id())
 
-        self.executed_commands.clear()
         return rollback_results
+
+    def get_pending_retry_count(self) -> int:
+        return len(self.retry_queue)
+
+    def shutdown(self) -> None:
+        self.workers.shutdown(wait=True)
@@ -1,8 +1,8 @@
 from typing import Dict, Set, TYPE_CHECKING
-from datetime import datetime, timedelta
 from app.decorators.base_decorator import PaymentProcessorDecorator
 from app.adapters.base_adapter import StandardizedResponse
 from app.models.enums import PaymentMethod
+from app.services.fraud_feature_store import FraudFeatureStore
 
 if TYPE_CHECKING:
     from app.models.payment import Payment
@@ -15,13 +15,15 @@ class FraudCheckDecorator(PaymentProcessorDecorator):
         super().__init__(processor)
         # Track suspicious activities
         self.suspicious_vpas: Set[str] = set()
-        self.transaction_history: Dict[str, list] = {}  # VPA -> list of transactions
+        # Sliding-window counters per VPA, shared with every other fraud check
+        self.feature_store = FraudFeatureStore.get_instance()
         self.blocked_vpas: Set[str] = set()
 
         # Fraud detection thresholds
         self.MAX_DAILY_AMOUNT = 100000.0  # ₹1 lakh per day
         self.MAX_HOURLY_TRANSACTIONS = 10  # 10 transactions per hour
         self.SUSPICIOUS_AMOUNT_THRESHOLD = 50000.0  # ₹50k single transaction
+        self.MAX_TRANSACTIONS_PER_FIVE_MINUTES = 3
 
     def process_payment(self, payment) -> StandardizedResponse:
         """Process payment with fraud checks"""
@@ -51,7 +53,7 @@ class FraudCheckDecorator(PaymentProcessorDecorator):
         """Perform comprehensive fraud checks"""
         payer_vpa = payment.get_payer_account().get_vpa()
         amount = payment.get_amount()
-        current_time = datetime.now()
+        current_time = self.feature_store.now()
 
         # Check 1: Suspicious amount threshold
         if amount > self.SUSPICIOUS_AMOUNT_THRESHOLD:
@@ -77,33 +79,13 @@ class FraudCheckDecorator(PaymentProcessorDecorator):
 
         return {"is_safe": True, "severity": "NONE", "reason": "All checks passed"}
 
-    def _get_daily_transaction_amount(self, vpa: str, current_time: datetime) -> float:
-        """Get total transaction amount for the day"""
-        if vpa not in self.transaction_history:
-            return 0.0
+    def _get_daily_transaction_amount(self, vpa: str, current_time: int) -> float:
+        """Get total transaction amount over the last 24 hours"""
+        return self.feature_store.get_amount(vpa, FraudFeatureStore.ONE_DAY, current_time)
 
-        today_start = current_time.replace(hour=0, minute=0, second=0, microsecond=0)
-        daily_amount = 0.0
-
-        for transaction in self.transaction_history[vpa]:
-            if transaction["timestamp"] >= today_start:
-                daily_amount += transaction["amount"]
-
-        return daily_amount
-
-    def _get_hourly_transaction_count(self, vpa: str, current_time: datetime) -> int:
+    def _get_hourly_transaction_count(self, vpa: str, current_time: int) -> int:
         """Get transaction count in the last hour"""
-        if vpa not in self.transaction_history:
-            return 0
-
-        hour_start = current_time - timedelta(hours=1)
-        count = 0
-
-        for transaction in self.transaction_history[vpa]:
-            if transaction["timestamp"] >= hour_start:
-                count += 1
-
-        return count
+        return self.feature_store.get_count(vpa, FraudFeatureStore.ONE_HOUR, current_time)
 
     def _is_payment_method_safe(self, payment_method: PaymentMethod) -> bool:
         """Check if payment method is considered safe"""
@@ -111,47 +93,21 @@ class FraudCheckDecorator(PaymentProcessorDecorator):
         safe_methods = {PaymentMethod.UPI_PUSH, PaymentMethod.UPI_PULL}
         return payment_method in safe_methods
 
-    def _is_velocity_suspicious(self, vpa: str, current_time: datetime) -> bool:
+    def _is_velocity_suspicious(self, vpa: str, current_time: int) -> bool:
         """Check for suspicious transaction velocity"""
-        if vpa not in self.transaction_history:
-            return False
-
-        # Check for more than 3 transactions in last 5 minutes
-        five_minutes_ago = current_time - timedelta(minutes=5)
-        recent_count = 0
-
-        for transaction in self.transaction_history[vpa]:
-            if transaction["timestamp"] >= five_minutes_ago:
-                recent_count += 1
-
-        return recent_count >= 3
+        # 3 or more transactions in the last 5 minutes
+        return self.feature_store.get_count(vpa, FraudFeatureStore.FIVE_MINUTES, current_time) >= self.MAX_TRANSACTIONS_PER_FIVE_MINUTES
 
     def _update_transaction_history(self, payment) -> None:
         """Update transaction history for fraud analysis"""
-        payer_vpa = payment.get_payer_account().get_vpa()
-
-        if payer_vpa not in self.transaction_history:
-            self.transaction_history[payer_vpa] = []
-
-        self.transaction_history[payer_vpa].append(
-            {
-                "timestamp": datetime.now(),
-                "amount": payment.get_amount(),
-                "payee_vpa": payment.get_payee_account().get_vpa(),
-                "payment_method": payment.get_payment_method().value,
-            }
-        )
-
-        # Keep only last 100 transactions per VPA to manage memory
-        if len(self.transaction_history[payer_vpa]) > 100:
-            self.transaction_history[payer_vpa] = self.transaction_history[payer_vpa][-100:]
+        self.feature_store.record(payment.get_payer_account().get_vpa(), payment.get_amount())
 
     def get_fraud_stats(self) -> Dict[str, any]:
         """Get fraud detection statistics"""
         return {
             "suspicious_vpas_count": len(self.suspicious_vpas),
             "blocked_vpas_count": len(self.blocked_vpas),
-            "total_tracked_vpas": len(self.transaction_history),
+            "total_tracked_vpas": self.feature_store.get_tracked_vpa_count(),
             "suspicious_vpas": list(self.suspicious_vpas),
             "blocked_vpas": list(self.blocked_vpas),
         }
@@ -1,8 +1,11 @@
 from app.models.enums import AccountType, PaymentType
 from app.models.transaction import Transaction
 from app.observers.account_observer import AccountSubject
-from typing import TYPE_CHECKING
-from threading import Lock
+from app.services.transaction_history import TransactionHistory
+from collections import deque
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict
+from threading import RLock
 from app.exceptions.insufficient_fund import InsufficientFundsException
 
 if TYPE_CHECKING:
@@ -10,6 +13,8 @@ if TYPE_CHECKING:
 
 
 class Account(AccountSubject):
+    RECENT_TRANSACTIONS = 100  # Transaction objects kept for get_transaction_history; statements come from self.history
+
     def __init__(self, account_number: str, account_type: AccountType, balance: float, user: "User", bank_name: str):
         super().__init__()
         self.account_number = account_number
@@ -17,8 +22,13 @@ class Account(AccountSubject):
         self.balance = balance
         self.user = user
         self.bank_name = bank_name
-        self.transactions: list[Transaction] = []
-        self.lock = Lock()
+        # Built once: it is compared on every lookup and names do not change
+        self.vpa = f"{user.get_name()}@{bank_name}"
+        self.transactions: deque[Transaction] = deque(maxlen=self.RECENT_TRANSACTIONS)
+        # Every balance change, for statements over any date range
+        self.history = TransactionHistory(balance)
+        # Reentrant: payment executors and bank adapters hold it across a balance check and withdraw()
+        self.lock = RLock()
 
     def get_account_number(self) -> str:
         return self.account_number
@@ -33,7 +43,7 @@ class Account(AccountSubject):
         return self.user
 
     def get_vpa(self) -> str:
-        return f"{self.user.get_name()}@{self.get_bank_name()}"
+        return self.vpa
 
     def get_bank_name(self) -> str:
         return self.bank_name
@@ -43,18 +53,26 @@ class Account(AccountSubject):
             self.transactions.append(transaction)
 
     def get_transaction_history(self) -> list[Transaction]:
-        return self.transactions
+        return list(self.transactions)
+
+    def get_statement(self, start: datetime, end: datetime) -> Dict[str, Any]:
+        return self.history.get_statement(start, end)
+
+    def get_mini_statement(self, count: int = 10) -> list[Dict[str, Any]]:
+        return self.history.get_mini_statement(count)
 
     def withdraw(self, amount: float) -> None:
         with self.lock:
             if self.balance < amount:
                 raise InsufficientFundsException()
             self.balance -= amount
+            self.history.record(amount, PaymentType.DEBIT)
             self.notify_observers(self, amount, PaymentType.DEBIT)
 
     def deposit(self, amount: float) -> None:
         with self.lock:
             self.balance += amount
+            self.history.record(amount, PaymentType.CREDIT)
             self.notify_observers(self, amount, PaymentType.CREDIT)
 
     def get_balance(self) -> float:
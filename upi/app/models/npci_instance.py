@@ -5,6 +5,8 @@ from threading import Lock
 from app.models.enums import PaymentMethod
 from app.adapters.base_adapter import StandardizedResponse, BankAPIAdapter
 from app.adapters.bank_adapter import HDFCAdapter, SBIAdapter, ICICIAdapter
+from app.services.settlement_engine import NettingSettlementEngine
+from app.services.vpa_directory import VPADirectory
 
 
 class NPCI:
@@ -28,8 +30,11 @@ class NPCI:
                 "sbi": self._create_enhanced_adapter(SBIAdapter()),
                 "icici": self._create_enhanced_adapter(ICICIAdapter()),
             }
-            # VPA to account mapping (in real implementation, this would be a database)
-            self.vpa_registry = self._initialize_vpa_registry()
+            # VPA to account mapping, backed by the account repository
+            self.vpa_directory = VPADirectory.get_instance()
+            # High-volume merchants are paid through the intraday ledger and settled in netted batches
+            self.settlement_engine = NettingSettlementEngine(self.bank_adapters)
+            self.netted_merchant_vpas: set[str] = set()
             self._initialized = True
 
     def _create_enhanced_adapter(self, adapter: BankAPIAdapter) -> BankAPIAdapter:
@@ -60,12 +65,25 @@ class NPCI:
             if not payer_info or not payee_info:
                 return self._create_error_response("VPA resolution failed", amount)
 
-            # Step 3: Process inter-bank payment with enhanced adapters
+            # Step 3: Acknowledge from the ledger for netted merchants, otherwise process with enhanced adapters
+            if payee_vpa in self.netted_merchant_vpas:
+                return self.settlement_engine.submit(payer_info, payee_info, amount)
             return self._process_inter_bank_payment(payer_info, payee_info, amount)
 
         except Exception as e:
             return self._create_error_response(f"Payment processing failed: {str(e)}", amount)
 
+    def enable_netted_settlement(self, merchant_vpa: str) -> None:
+        """Route payments to this merchant through the netting ledger instead of real-time debit/credit calls"""
+        self.netted_merchant_vpas.add(merchant_vpa)
+
+    def disable_netted_settlement(self, merchant_vpa: str) -> None:
+        self.netted_merchant_vpas.discard(merchant_vpa)
+
+    def settle_netted_payments(self) -> Optional[Dict[str, Any]]:
+        """Settle the open netting batch now; returns the settlement report"""
+        return self.settlement_engine.settle()
+
     def process_refund(self, original_transaction_id: str, amount: float, payer_vpa: str, payee_vpa: str) -> StandardizedResponse:
         """Process refund through NPCI - reverse the original payment"""
 
@@ -104,7 +122,18 @@ class NPCI:
             # Step 1: Debit from payer's bank (with decorator)
             payer_adapter = self.bank_adapters[payer_bank]
             debit_request = {"account_number": payer_account, "amount": amount, "transaction_type": "DEBIT", "transaction_id": transaction_id}
-            debit_response = payer_adapter.process_payment(debit_request)
+            payer = self.settlement_engine.account_repository.get_account(payer_account)
+            if payer is None:
+                return self._create_error_response("Debit failed", amount)
+            # Money promised to netted merchants but not yet posted stays in the account
+            with payer.lock:
+                reserved = self.settlement_engine.get_reserved_amount(payer_account)
+                balance = payer.get_balance()
+                # Only reserved funds are reported here; a plain shortfall is left to the bank's own check
+                if reserved > 0 and balance >= amount and balance - reserved < amount:
+                    print(f"❌ Debit failed from {payer_bank.upper()}: funds reserved for netted settlement")
+                    return self._create_error_response("Debit failed", amount)
+                debit_response = payer_adapter.process_payment(debit_request)
 
             if not debit_response.success:
                 print(f"❌ Debit failed from {payer_bank.upper()}")
@@ -118,7 +147,13 @@ class NPCI:
             credit_response = payee_adapter.process_payment(credit_request)
 
             if not credit_response.success:
-                print(f"❌ Credit failed to {payee_bank.upper()}")
+                print(f"❌ Credit failed to {payee_bank.upper()}, reversing debit")
+                # Compensate: the payer's money must not disappear with the failed credit
+                reversal_request = {"account_number": payer_account, "amount": amount, "transaction_type": "CREDIT", "transaction_id": f"{transaction_id}_REV"}
+                reversal_response = payer_adapter.process_payment(reversal_request)
+                if not reversal_response.success:
+                    print(f"🚨 Reversal of {transaction_id} failed at {payer_bank.upper()}: ₹{amount} needs manual reconciliation")
+                    return StandardizedResponse(success=False, amount=amount, status="REVERSAL_FAILED", transaction_id=transaction_id)
                 return self._create_error_response("Credit failed", amount)
 
             print(f"✅ Credit successful to {payee_bank.upper()}")
@@ -133,19 +168,9 @@ class NPCI:
         except Exception as e:
             return self._create_error_response(f"Inter-bank payment failed: {str(e)}", amount)
 
-    def _initialize_vpa_registry(self) -> Dict[str, Dict[str, Any]]:
-        """Initialize VPA to account mapping registry"""
-        return {
-            # Demo users with proper VPAs
-            "Rahul Sharma@HDFC": {"account_number": "1234567890", "bank": "hdfc", "account_holder": "Rahul Sharma"},
-            "Priya Patel@SBI": {"account_number": "0987654321", "bank": "sbi", "account_holder": "Priya Patel"},
-            "Amit Kumar@HDFC": {"account_number": "1122334455", "bank": "hdfc", "account_holder": "Amit Kumar"},
-            "Kavya Reddy@ICICI": {"account_number": "5566778899", "bank": "icici", "account_holder": "Kavya Reddy"},
-        }
-
     def _resolve_vpa_to_account_info(self, vpa: str) -> Optional[Dict[str, Any]]:
         """Resolve VPA to complete account information"""
-        return self.vpa_registry.get(vpa)
+        return self.vpa_directory.resolve(vpa)
 
     def _create_error_response(self, message: str, amount: float) -> StandardizedResponse:
         """Create standardized error response"""
@@ -200,3 +225,11 @@ class BankAdapterDecorator(BankAPIAdapter):
         response = self._bank_adapter.get_transaction_status(transaction_id)
         print(f"✅ Bank Adapter Decorator: Status check completed")
         return response
+
+    def process_bulk_postings(self, postings: list) -> list:
+        """Enhanced bulk settlement with decorator functionality: one log line per batch, not per posting"""
+        print(f"🔧 Bank Adapter Decorator: Applying {len(postings)} settlement postings")
+        responses = self._bank_adapter.process_bulk_postings(postings)
+        failed = sum(1 for response in responses if not response.success)
+        print(f"{'✅' if not failed else '❌'} Bank Adapter Decorator: Settlement batch applied ({failed} failed)")
+        return responses
@@ -1,6 +1,6 @@
 from app.models.account import Account
 from threading import Lock
-from typing import Optional
+from typing import Callable, Optional
 
 
 class AccountRepository:
@@ -17,33 +17,99 @@ class AccountRepository:
     def __init__(self) -> None:
         if hasattr(self, "accounts"):
             return
+        self.process_lock = Lock()
         # Account_number -> Account
         self.accounts: dict[str, Account] = {}
+        # Secondary indexes, maintained on add/update/delete
+        self.accounts_by_vpa: dict[str, Account] = {}
+        self.accounts_by_user: dict[str, dict[str, Account]] = {}  # user id -> account number -> Account
+        self.accounts_by_bank: dict[str, dict[str, Account]] = {}  # bank name -> account number -> Account
+        self.index_keys: dict[str, tuple[str, str, str]] = {}  # account number -> (vpa, user id, bank) it is indexed under
+        # Called with a VPA whenever the account it resolves to changes
+        self.vpa_listeners: list[Callable[[str], None]] = []
 
     @classmethod
     def get_instance(cls) -> "AccountRepository":
         return cls._instance or cls()
 
+    def add_vpa_listener(self, listener: Callable[[str], None]) -> None:
+        self.vpa_listeners.append(listener)
+
+    @staticmethod
+    def _index_key(account: Account) -> tuple[str, str, str]:
+        return account.get_vpa(), account.get_user().get_id(), account.get_bank_name()
+
+    def _index(self, account: Account) -> list[str]:
+        """(Re)index an account; returns the VPAs whose resolution changed"""
+        account_number = account.get_account_number()
+        key = self._index_key(account)
+        old_key = self.index_keys.get(account_number)
+        if old_key == key and self.accounts.get(account_number) is account:
+            # Balance updates from the bank adapters land here on every payment: nothing to reindex
+            return []
+        changed = self._unindex(account_number)
+        vpa, user_id, bank_name = key
+        self.accounts[account_number] = account
+        # The first account registered under a VPA keeps it, as the old linear scan did
+        self.accounts_by_vpa.setdefault(vpa, account)
+        self.accounts_by_user.setdefault(user_id, {})[account_number] = account
+        self.accounts_by_bank.setdefault(bank_name, {})[account_number] = account
+        self.index_keys[account_number] = key
+        return changed + [vpa]
+
+    def _unindex(self, account_number: str) -> list[str]:
+        key = self.index_keys.pop(account_number, None)
+        self.accounts.pop(account_number, None)
+        if key is None:
+            return []
+        vpa, user_id, bank_name = key
+        owner = self.accounts_by_vpa.get(vpa)
+        if owner is not None and owner.get_account_number() == account_number:
+            del self.accounts_by_vpa[vpa]
+            # Hand the VPA over to another account of the same user and bank, if any
+            for other in self.accounts_by_user.get(user_id, {}).values():
+                if other.get_account_number() != account_number and other.get_vpa() == vpa:
+                    self.accounts_by_vpa[vpa] = other
+                    break
+        for index, value in ((self.accounts_by_user, user_id), (self.accounts_by_bank, bank_name)):
+            accounts = index.get(value)
+            if accounts is not None:
+                accounts.pop(account_number, None)
+                if not accounts:
+                    del index[value]
+        return [vpa]
+
+    def _notify(self, vpas: list[str]) -> None:
+        for vpa in vpas:
+            for listener in self.vpa_listeners:
+                listener(vpa)
+
     def add_account(self, account: Account) -> None:
-        self.accounts[account.get_account_number()] = account
+        with self.process_lock:
+            changed = self._index(account)
+        self._notify(changed)
 
     def get_account(self, account_number: str) -> Optional[Account]:
         return self.accounts.get(account_number)
 
     def get_account_by_vpa(self, vpa: str) -> Optional[Account]:
-        return next((account for account in self.accounts.values() if account.get_vpa() == vpa), None)
+        return self.accounts_by_vpa.get(vpa)
 
     def update_account(self, account: Account) -> None:
-        self.accounts[account.get_account_number()] = account
+        with self.process_lock:
+            changed = self._index(account)
+        self._notify(changed)
 
     def delete_account(self, account_number: str) -> None:
-        self.accounts.pop(account_number, None)
+        with self.process_lock:
+            changed = self._unindex(account_number)
+        self._notify(changed)
 
     def get_all_accounts(self) -> list[Account]:
         return list(self.accounts.values())
 
     def get_all_account_for_a_user(self, user_id: str) -> list[Account]:
-        return [account for account in self.accounts.values() if account.get_user().get_id() == user_id]
+        return list(self.accounts_by_user.get(user_id, {}).values())
 
     def get_all_accounts_for_a_bank(self, bank_name: str) -> list[Account]:
-        return [account for account in self.accounts.values() if account.get_bank_name() == bank_name]
+        return list(self.accounts_by_bank.get(bank_name, {}).values())
@@ -0,0 +1,166 @@
+from array import array
+from threading import Lock
+from typing import Dict, Optional
+import time
+
+
+class _RingWindow:
+    """
+    Sliding window of `bucket_count` time buckets per VPA slot, stored column-wise so a million VPAs
+    cost a few flat arrays instead of a million lists
+
+    Each slot keeps running totals next to its ring: recording adds to the current bucket and the totals,
+    advancing the ring subtracts the buckets that fell out of the window. Both are O(1) amortized
+    """
+
+    def __init__(self, length: int, bucket_count: int):
+        self.length = length
+        self.bucket_count = bucket_count
+        self.bucket_width = length // bucket_count
+        self.heads = array("q")  # newest bucket index per slot
+        self.total_counts = array("i")
+        self.total_amounts = array("q")  # paise
+        self.counts = array("i")  # slot * bucket_count + bucket % bucket_count
+        self.amounts = array("q")
+        self.empty_counts = array("i", [0] * bucket_count)
+        self.empty_amounts = array("q", [0] * bucket_count)
+
+    def grow(self, slots: int) -> None:
+        for column, size in ((self.heads, slots), (self.total_counts, slots), (self.total_amounts, slots), (self.counts, slots * self.bucket_count), (self.amounts, slots * self.bucket_count)):
+            # Zero-filled from raw bytes, without building a Python list first
+            column.frombytes(bytes(size * column.itemsize))
+
+    def _advance(self, slot: int, bucket: int) -> int:
+        head = self.heads[slot]
+        if bucket <= head:
+            return head
+        base = slot * self.bucket_count
+        if bucket - head >= self.bucket_count:
+            # Idle for a whole window (or never seen): everything expired
+            self.counts[base : base + self.bucket_count] = self.empty_counts
+            self.amounts[base : base + self.bucket_count] = self.empty_amounts
+            self.total_counts[slot] = 0
+            self.total_amounts[slot] = 0
+            self.heads[slot] = bucket
+            return bucket
+        for expired in range(head + 1, bucket + 1):
+            position = base + expired % self.bucket_count
+            self.total_counts[slot] -= self.counts[position]
+            self.total_amounts[slot] -= self.amounts[position]
+            self.counts[position] = 0
+            self.amounts[position] = 0
+        self.heads[slot] = bucket
+        return bucket
+
+    def record(self, slot: int, timestamp: int, amount: int) -> None:
+        bucket = timestamp // self.bucket_width
+        if bucket < self.heads[slot] - self.bucket_count + 1:
+            return  # older than the whole window
+        self._advance(slot, bucket)
+        position = slot * self.bucket_count + bucket % self.bucket_count
+        self.counts[position] += 1
+        self.amounts[position] += amount
+        self.total_counts[slot] += 1
+        self.total_amounts[slot] += amount
+
+    def totals(self, slot: int, timestamp: int) -> tuple[int, int]:
+        self._advance(slot, timestamp // self.bucket_width)
+        return self.total_counts[slot], self.total_amounts[slot]
+
+
+class FraudFeatureStore:
+    """
+    Per-VPA transaction count and amount over the last 5 minutes, hour and day, shared by every
+    fraud check (FraudCheckDecorator, NPCIProxy) and every worker thread
+
+    Windows are bucketed, so a window of length W covers between W - W/buckets and W seconds of history
+    """
+
+    FIVE_MINUTES = 5 * 60
+    ONE_HOUR = 60 * 60
+    ONE_DAY = 24 * 60 * 60
+    BUCKETS = {FIVE_MINUTES: 10, ONE_HOUR: 12, ONE_DAY: 24}  # 30 s, 5 min and 1 h buckets
+    LOCK_STRIPES = 64
+    INITIAL_CAPACITY = 1024  # slots; the columns double when full
+
+    _instance: Optional["FraudFeatureStore"] = None
+    _lock = Lock()
+
+    def __new__(cls) -> "FraudFeatureStore":
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self) -> None:
+        if hasattr(self, "_initialized"):
+            return
+        self.windows: Dict[int, _RingWindow] = {length: _RingWindow(length, buckets) for length, buckets in self.BUCKETS.items()}
+        self.slots: Dict[str, int] = {}  # VPA -> column slot
+        self.capacity = 0
+        self.slot_lock = Lock()
+        # Updates of different VPAs only contend when their slots share a stripe
+        self.stripes = [Lock() for _ in range(self.LOCK_STRIPES)]
+        self._initialized = True
+
+    @classmethod
+    def get_instance(cls) -> "FraudFeatureStore":
+        return cls._instance or cls()
+
+    @staticmethod
+    def now() -> int:
+        return int(time.time())
+
+    @staticmethod
+    def _to_paise(amount: float) -> int:
+        return round(amount * 100)
+
+    def _get_slot(self, vpa: str) -> int:
+        slot = self.slots.get(vpa)
+        if slot is not None:
+            return slot
+        with self.slot_lock:
+            slot = self.slots.get(vpa)
+            if slot is None:
+                slot = len(self.slots)
+                if slot == self.capacity:
+                    added = self.capacity or self.INITIAL_CAPACITY
+                    for window in self.windows.values():
+                        window.grow(added)
+                    self.capacity += added
+                self.slots[vpa] = slot
+            return slot
+
+    def _get_window(self, length: int) -> _RingWindow:
+        window = self.windows.get(length)
+        if window is None:
+            raise ValueError(f"Unsupported window {length}s, expected one of {sorted(self.windows)}")
+        return window
+
+    def record(self, vpa: str, amount: float, timestamp: Optional[int] = None) -> None:
+        """Count one transaction of `amount` for the VPA in every window"""
+        timestamp = self.now() if timestamp is None else timestamp
+        paise = self._to_paise(amount)
+        slot = self._get_slot(vpa)
+        with self.stripes[slot % self.LOCK_STRIPES]:
+            for window in self.windows.values():
+                window.record(slot, timestamp, paise)
+
+    def get_count(self, vpa: str, window: int, timestamp: Optional[int] = None) -> int:
+        return self._get_totals(vpa, window, timestamp)[0]
+
+    def get_amount(self, vpa: str, window: int, timestamp: Optional[int] = None) -> float:
+        return self._get_totals(vpa, window, timestamp)[1] / 100
+
+    def _get_totals(self, vpa: str, length: int, timestamp: Optional[int]) -> tuple[int, int]:
+        window = self._get_window(length)
+        slot = self.slots.get(vpa)
+        if slot is None:
+            return 0, 0
+        timestamp = self.now() if timestamp is None else timestamp
+        with self.stripes[slot % self.LOCK_STRIPES]:
+            return window.totals(slot, timestamp)
+
+    def get_tracked_vpa_count(self) -> int:
+        return len(self.slots)
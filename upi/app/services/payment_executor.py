@@ -0,0 +1,109 @@
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
+from typing import Optional, Union
+from app.adapters.base_adapter import StandardizedResponse
+from app.exceptions.insufficient_fund import InsufficientFundsException
+from app.models.account import Account
+from app.repositories.account_repository import AccountRepository
+
+
+class ConcurrentPaymentExecutor:
+    """
+    Executes account-to-account payments from many threads at once
+
+    - Both account locks are taken in account-number order, so two opposite payments cannot deadlock
+    - Debit and credit happen under both locks; if the credit fails the debit is reversed before unlocking
+    - A transaction id is executed at most once: retries get the original (or in-flight) result
+    - `submit` runs payments on a worker pool and returns a Future; `execute` runs in the caller's thread
+    """
+
+    IDEMPOTENCY_TABLE_SIZE = 1_000_000  # completed transaction ids remembered, oldest forgotten first
+
+    def __init__(self, max_workers: int = 32):
+        self.account_repository = AccountRepository.get_instance()
+        self.workers = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="payment-executor")
+        # transaction id -> Future while running, StandardizedResponse once done
+        self.results: "OrderedDict[str, Union[Future, StandardizedResponse]]" = OrderedDict()
+        self.results_lock = Lock()
+
+    def submit(self, transaction_id: str, payer_vpa: str, payee_vpa: str, amount: float) -> Future:
+        future, owner = self._claim(transaction_id)
+        if owner:
+            self.workers.submit(self._run, future, transaction_id, payer_vpa, payee_vpa, amount)
+        return future
+
+    def execute(self, transaction_id: str, payer_vpa: str, payee_vpa: str, amount: float) -> StandardizedResponse:
+        future, owner = self._claim(transaction_id)
+        if owner:
+            self._run(future, transaction_id, payer_vpa, payee_vpa, amount)
+        return future.result()
+
+    def get_result(self, transaction_id: str) -> Optional[StandardizedResponse]:
+        with self.results_lock:
+            result = self.results.get(transaction_id)
+        if isinstance(result, Future):
+            return None  # still running
+        return result
+
+    def shutdown(self) -> None:
+        self.workers.shutdown(wait=True)
+
+    def _claim(self, transaction_id: str) -> tuple[Future, bool]:
+        """The Future for this transaction id, and whether the caller is the one who must run it"""
+        with self.results_lock:
+            existing = self.results.get(transaction_id)
+            if isinstance(existing, Future):
+                return existing, False
+            if existing is not None:
+                done: Future = Future()
+                done.set_result(existing)
+                return done, False
+            future: Future = Future()
+            self.results[transaction_id] = future
+            return future, True
+
+    def _run(self, future: Future, transaction_id: str, payer_vpa: str, payee_vpa: str, amount: float) -> None:
+        try:
+            response = self._transfer(transaction_id, payer_vpa, payee_vpa, amount)
+        except Exception:
+            response = StandardizedResponse(success=False, amount=amount, status="FAILED", transaction_id=transaction_id)
+        with self.results_lock:
+            # Only the small completed response is kept, not the Future
+            self.results[transaction_id] = response
+            if len(self.results) > self.IDEMPOTENCY_TABLE_SIZE:
+                self.results.popitem(last=False)
+        future.set_result(response)
+
+    def _transfer(self, transaction_id: str, payer_vpa: str, payee_vpa: str, amount: float) -> StandardizedResponse:
+        if amount <= 0:
+            return StandardizedResponse(success=False, amount=amount, status="INVALID_AMOUNT", transaction_id=transaction_id)
+        payer = self.account_repository.get_account_by_vpa(payer_vpa)
+        payee = self.account_repository.get_account_by_vpa(payee_vpa)
+        if payer is None or payee is None:
+            return StandardizedResponse(success=False, amount=amount, status="ACCOUNT_NOT_FOUND", transaction_id=transaction_id)
+        if payer is payee:
+            return StandardizedResponse(success=False, amount=amount, status="SAME_ACCOUNT", transaction_id=transaction_id)
+
+        first, second = sorted((payer, payee), key=Account.get_account_number)
+        with first.lock, second.lock:
+            try:
+                self._debit(payer, amount)
+            except InsufficientFundsException:
+                return StandardizedResponse(success=False, amount=amount, status="INSUFFICIENT_FUNDS", transaction_id=transaction_id)
+            try:
+                self._credit(payee, amount)
+            except Exception:
+                # Compensate while both locks are still held: nobody can observe the half-done transfer
+                self._reverse_debit(payer, amount)
+                return StandardizedResponse(success=False, amount=amount, status="CREDIT_FAILED_REVERSED", transaction_id=transaction_id)
+        return StandardizedResponse(success=True, amount=amount, status="SUCCESS", transaction_id=transaction_id)
+
+    def _debit(self, account: Account, amount: float) -> None:
+        account.withdraw(amount)
+
+    def _credit(self, account: Account, amount: float) -> None:
+        account.deposit(amount)
+
+    def _reverse_debit(self, account: Account, amount: float) -> None:
+        account.deposit(amount)
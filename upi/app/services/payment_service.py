@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Dict
 from app.chain.chain_factory import PaymentChainFactory
 from app.adapters.base_adapter import StandardizedResponse
 
@@ -16,3 +16,7 @@ class PaymentService:
     def process_payment(self, payment: "Payment") -> StandardizedResponse:
         """Process payment through chain"""
         return self.payment_chain.handle(payment)
+
+    def get_chain_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Per-handler call counts and latency percentiles of the payment chain"""
+        return self.payment_chain.get_metrics()
@@ -0,0 +1,171 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, List, Optional, Type
+import time
+
+
+class RateLimitAlgorithm(ABC):
+    """
+    One limit tier: at most `limit` requests per `period_ns`
+    State is a small list of integers owned by the caller, so a tier costs no object per key
+    """
+
+    def __init__(self, limit: int, period_ns: int):
+        if limit <= 0 or period_ns <= 0:
+            raise ValueError("Rate limit and period must be positive")
+        self.limit = limit
+        self.period_ns = period_ns
+
+    @abstractmethod
+    def new_state(self, now: int) -> List[int]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def allows(self, state: List[int], now: int) -> bool:
+        """Bring the state up to `now` and tell whether one more request fits"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def consume(self, state: List[int]) -> None:
+        """Count one request; only called right after `allows` returned True"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def remaining(self, state: List[int], now: int) -> int:
+        raise NotImplementedError
+
+
+class TokenBucket(RateLimitAlgorithm):
+    """
+    Bucket of `limit` tokens refilled continuously over the period; allows short bursts up to the limit
+    Tokens are scaled by period_ns so refilling stays in exact integer arithmetic
+    """
+
+    def new_state(self, now: int) -> List[int]:
+        return [self.limit * self.period_ns, now]  # [scaled tokens, last refill]
+
+    def allows(self, state: List[int], now: int) -> bool:
+        if now > state[1]:
+            state[0] = min(self.limit * self.period_ns, state[0] + (now - state[1]) * self.limit)
+            state[1] = now
+        return state[0] >= self.period_ns
+
+    def consume(self, state: List[int]) -> None:
+        state[0] -= self.period_ns
+
+    def remaining(self, state: List[int], now: int) -> int:
+        self.allows(state, now)
+        return state[0] // self.period_ns
+
+
+class SlidingWindowCounter(RateLimitAlgorithm):
+    """
+    Fixed-window counts for the current and previous period; the previous one is weighted by how much
+    of it still overlaps the sliding window. O(1) state instead of a log of request timestamps
+    """
+
+    def new_state(self, now: int) -> List[int]:
+        return [now // self.period_ns, 0, 0]  # [current window, current count, previous count]
+
+    def _roll(self, state: List[int], now: int) -> int:
+        window = now // self.period_ns
+        if window != state[0]:
+            state[2] = state[1] if window == state[0] + 1 else 0
+            state[1] = 0
+            state[0] = window
+        return now - window * self.period_ns
+
+    def _weighted_count(self, state: List[int], elapsed: int) -> int:
+        # Scaled by period_ns: previous * overlap + current * period
+        return state[2] * (self.period_ns - elapsed) + state[1] * self.period_ns
+
+    def allows(self, state: List[int], now: int) -> bool:
+        elapsed = self._roll(state, now)
+        return self._weighted_count(state, elapsed) + self.period_ns <= self.limit * self.period_ns
+
+    def consume(self, state: List[int]) -> None:
+        state[1] += 1
+
+    def remaining(self, state: List[int], now: int) -> int:
+        elapsed = self._roll(state, now)
+        return max(0, (self.limit * self.period_ns - self._weighted_count(state, elapsed)) // self.period_ns)
+
+
+class RateLimiter:
+    """
+    Multi-tier rate limiter keyed by caller (VPA, IP, API key, ...), shared by any proxy that needs one
+
+    - Limits use the existing config shape, e.g. {"per_minute": 5, "per_hour": 50, "per_day": 200}
+    - One `try_acquire` checks every tier in O(1) and only consumes if all of them allow the request
+    - Timestamps are monotonic integer nanoseconds
+    - Keys idle for longer than the longest period carry no state worth keeping and are evicted lazily
+    """
+
+    PERIODS = {"per_second": 1, "per_minute": 60, "per_hour": 60 * 60, "per_day": 24 * 60 * 60}
+    NANOS_PER_SECOND = 1_000_000_000
+
+    def __init__(self, limits: Dict[str, int], algorithm: Type[RateLimitAlgorithm] = SlidingWindowCounter):
+        unknown = set(limits) - set(self.PERIODS)
+        if unknown:
+            raise ValueError(f"Unknown rate limit tiers {sorted(unknown)}, expected {list(self.PERIODS)}")
+        self.tier_names = list(limits)
+        self.tiers = [algorithm(limit, self.PERIODS[name] * self.NANOS_PER_SECOND) for name, limit in limits.items()]
+        self.idle_after_ns = max(tier.period_ns for tier in self.tiers)
+        # key -> [last seen, tier states...], least recently seen first
+        self.states: "OrderedDict[str, list]" = OrderedDict()
+        self.lock = Lock()
+
+    @staticmethod
+    def now() -> int:
+        return time.monotonic_ns()
+
+    def _get_state(self, key: str, now: int) -> list:
+        state = self.states.get(key)
+        if state is None:
+            state = self.states[key] = [now] + [tier.new_state(now) for tier in self.tiers]
+        else:
+            state[0] = now
+            self.states.move_to_end(key)
+        self._evict_idle(now)
+        return state
+
+    def _evict_idle(self, now: int) -> None:
+        # Oldest first, so this stops at the first key that is still active
+        while self.states:
+            key, state = next(iter(self.states.items()))
+            if now - state[0] <= self.idle_after_ns:
+                break
+            del self.states[key]
+
+    def try_acquire(self, key: str, now: Optional[int] = None) -> bool:
+        """Record one request for the key if every tier allows it"""
+        now = self.now() if now is None else now
+        with self.lock:
+            state = self._get_state(key, now)
+            for tier, tier_state in zip(self.tiers, state[1:]):
+                if not tier.allows(tier_state, now):
+                    return False
+            for tier, tier_state in zip(self.tiers, state[1:]):
+                tier.consume(tier_state)
+            return True
+
+    def get_remaining(self, key: str, now: Optional[int] = None) -> Dict[str, int]:
+        """Requests still allowed per tier"""
+        now = self.now() if now is None else now
+        with self.lock:
+            state = self.states.get(key)
+            if state is None:
+                return {name: tier.limit for name, tier in zip(self.tier_names, self.tiers)}
+            return {name: tier.remaining(tier_state, now) for name, tier, tier_state in zip(self.tier_names, self.tiers, state[1:])}
+
+    def reset(self, key: Optional[str] = None) -> None:
+        """Forget one key, or every key"""
+        with self.lock:
+            if key is None:
+                self.states.clear()
+            else:
+                self.states.pop(key, None)
+
+    def get_tracked_key_count(self) -> int:
+        return len(self.states)
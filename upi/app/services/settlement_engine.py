@@ -0,0 +1,179 @@
+from threading import Event, Lock, Thread
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+from app.adapters.base_adapter import BankAPIAdapter, StandardizedResponse
+from app.repositories.account_repository import AccountRepository
+
+
+class _SettlementBatch:
+    """Payments accepted since the last settlement, already reduced to running net positions"""
+
+    def __init__(self, batch_id: int):
+        self.batch_id = batch_id
+        self.payment_count = 0
+        self.gross = 0  # paise
+        self.account_nets: Dict[str, int] = {}  # account number -> net paise (negative: owes)
+        self.account_banks: Dict[str, str] = {}  # account number -> bank
+        self.bank_pair_flows: Dict[tuple, int] = {}  # (payer bank, payee bank) -> paise
+
+
+class NettingSettlementEngine:
+    """
+    Deferred net settlement for high-volume payments
+
+    - `submit` validates the payer's funds against the intraday ledger and acknowledges immediately;
+      no bank adapter is called per payment
+    - The ledger keeps running net positions per account and gross flows per bank pair, so a payment is O(1)
+    - `settle` closes the batch and sends each bank one bulk call with one net posting per account
+    - `start` settles periodically on a background thread
+
+    A payer can spend what the open batch owes them, never more than their balance plus that. Real-time debits
+    through NPCI must leave `get_reserved_amount` in the account, so every debit posting stays covered as long as
+    the account is not debited outside NPCI before settlement
+    """
+
+    def __init__(self, bank_adapters: Dict[str, BankAPIAdapter]):
+        self.bank_adapters = bank_adapters
+        self.account_repository = AccountRepository.get_instance()
+        self.lock = Lock()
+        self.batch = _SettlementBatch(1)
+        self.transaction_batches: Dict[str, int] = {}  # transaction id -> batch id
+        # Debits of the batch being posted: not necessarily in the balances yet, so still counted against payers
+        self.settling_debits: Dict[str, int] = {}
+        self.settled_batch_id = 0
+        self.settlement_reports: List[Dict[str, Any]] = []
+        self.settle_lock = Lock()  # one settlement at a time, in batch order
+        self.stop_event = Event()
+        self.settlement_thread: Optional[Thread] = None
+
+    @staticmethod
+    def _to_paise(amount: float) -> int:
+        return round(amount * 100)
+
+    def submit(self, payer_info: Dict[str, Any], payee_info: Dict[str, Any], amount: float) -> StandardizedResponse:
+        """Accept a payment into the open batch; the response is the ledger's acknowledgement"""
+        paise = self._to_paise(amount)
+        if paise <= 0:
+            return StandardizedResponse(success=False, amount=amount, status="INVALID_AMOUNT")
+        payer_account = self.account_repository.get_account(payer_info["account_number"])
+        if payer_account is None:
+            return StandardizedResponse(success=False, amount=amount, status="ACCOUNT_NOT_FOUND")
+
+        payer_number, payee_number = payer_info["account_number"], payee_info["account_number"]
+        payer_bank, payee_bank = payer_info["bank"], payee_info["bank"]
+        # The account lock keeps a real-time debit from landing between the funds check and the reservation
+        with payer_account.lock, self.lock:
+            batch = self.batch
+            payer_net = batch.account_nets.get(payer_number, 0)
+            available = self._to_paise(payer_account.get_balance()) + payer_net + self.settling_debits.get(payer_number, 0)
+            if available < paise:
+                return StandardizedResponse(success=False, amount=amount, status="INSUFFICIENT_FUNDS")
+            batch.account_nets[payer_number] = payer_net - paise
+            batch.account_nets[payee_number] = batch.account_nets.get(payee_number, 0) + paise
+            batch.account_banks[payer_number] = payer_bank
+            batch.account_banks[payee_number] = payee_bank
+            pair = (payer_bank, payee_bank)
+            batch.bank_pair_flows[pair] = batch.bank_pair_flows.get(pair, 0) + paise
+            batch.payment_count += 1
+            batch.gross += paise
+            transaction_id = f"NPCI_{uuid4().hex[:8].upper()}"
+            self.transaction_batches[transaction_id] = batch.batch_id
+        return StandardizedResponse(success=True, amount=amount, status="ACCEPTED", transaction_id=transaction_id)
+
+    def get_reserved_amount(self, account_number: str) -> float:
+        """What the account still owes through the ledger (open batch and the batch being posted)"""
+        with self.lock:
+            net = self.batch.account_nets.get(account_number, 0) + self.settling_debits.get(account_number, 0)
+        return max(0, -net) / 100
+
+    def get_payment_status(self, transaction_id: str) -> Optional[str]:
+        batch_id = self.transaction_batches.get(transaction_id)
+        if batch_id is None:
+            return None
+        return "SETTLED" if batch_id <= self.settled_batch_id else "PENDING_SETTLEMENT"
+
+    def get_open_positions(self) -> Dict[str, float]:
+        """Multilateral net position per bank in the open batch (positive: the bank is owed money)"""
+        with self.lock:
+            return self._net_positions(self.batch)
+
+    @staticmethod
+    def _net_positions(batch: _SettlementBatch) -> Dict[str, float]:
+        positions: Dict[str, int] = {}
+        for (payer_bank, payee_bank), paise in batch.bank_pair_flows.items():
+            positions[payer_bank] = positions.get(payer_bank, 0) - paise
+            positions[payee_bank] = positions.get(payee_bank, 0) + paise
+        return {bank: paise / 100 for bank, paise in positions.items()}
+
+    @staticmethod
+    def _bilateral_positions(batch: _SettlementBatch) -> Dict[str, float]:
+        # Flows in both directions between two banks cancel out; only the difference changes hands
+        positions: Dict[str, float] = {}
+        for first, second in sorted({tuple(sorted(pair)) for pair in batch.bank_pair_flows}):
+            if first == second:
+                continue
+            net = batch.bank_pair_flows.get((first, second), 0) - batch.bank_pair_flows.get((second, first), 0)
+            positions[f"{first}->{second}" if net >= 0 else f"{second}->{first}"] = abs(net) / 100
+        return positions
+
+    def settle(self) -> Optional[Dict[str, Any]]:
+        """Close the open batch and post it: one bulk call per bank. Returns the settlement report"""
+        with self.settle_lock:
+            with self.lock:
+                batch = self.batch
+                if not batch.payment_count:
+                    return None
+                self.batch = _SettlementBatch(batch.batch_id + 1)
+                self.settling_debits = {account_number: paise for account_number, paise in batch.account_nets.items() if paise < 0}
+
+            postings_by_bank: Dict[str, List[Dict[str, Any]]] = {}
+            for account_number, paise in batch.account_nets.items():
+                if paise:
+                    postings_by_bank.setdefault(batch.account_banks[account_number], []).append({"account_number": account_number, "amount": paise / 100})
+
+            failed_postings = []
+            try:
+                for bank, postings in postings_by_bank.items():
+                    try:
+                        responses = self.bank_adapters[bank].process_bulk_postings(postings)
+                    except Exception:
+                        # The bank's whole batch is unposted; report it instead of losing the closed batch
+                        failed_postings.extend({**posting, "status": "BANK_ERROR"} for posting in postings)
+                        continue
+                    failed_postings.extend({**posting, "status": response.status} for posting, response in zip(postings, responses) if not response.success)
+            finally:
+                with self.lock:
+                    self.settling_debits = {}
+            self.settled_batch_id = batch.batch_id
+            report = {
+                "batch_id": batch.batch_id,
+                "payments": batch.payment_count,
+                "gross_amount": batch.gross / 100,
+                "net_positions": self._net_positions(batch),
+                "bilateral_positions": self._bilateral_positions(batch),
+                "postings": sum(len(postings) for postings in postings_by_bank.values()),
+                "failed_postings": failed_postings,
+            }
+            self.settlement_reports.append(report)
+            print(f"🏦 NPCI Settlement: batch {batch.batch_id} settled {batch.payment_count} payments (₹{batch.gross / 100}) with {report['postings']} postings")
+            return report
+
+    def start(self, interval_seconds: float) -> None:
+        """Settle every `interval_seconds` on a background thread until `stop`"""
+        if self.settlement_thread is not None:
+            raise ValueError("Periodic settlement is already running")
+        self.stop_event.clear()
+        self.settlement_thread = Thread(target=self._run, args=(interval_seconds,), daemon=True)
+        self.settlement_thread.start()
+
+    def _run(self, interval_seconds: float) -> None:
+        while not self.stop_event.wait(interval_seconds):
+            self.settle()
+
+    def stop(self) -> Optional[Dict[str, Any]]:
+        """Stop periodic settlement and settle whatever is still open"""
+        if self.settlement_thread is not None:
+            self.stop_event.set()
+            self.settlement_thread.join()
+            self.settlement_thread = None
+        return self.settle()
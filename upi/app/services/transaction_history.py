@@ -0,0 +1,172 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from threading import Lock
+from typing import Any, Dict, List, Optional
+import os
+import shutil
+import tempfile
+import time
+import weakref
+from app.models.enums import PaymentType
+
+
+class _Segment:
+    """
+    Up to SEGMENT_SIZE consecutive postings, stored column-wise
+
+    `opening_balance` is the running balance checkpoint before the segment's first posting, so the balance at
+    any posting is the checkpoint plus the amounts before it in the same segment
+    """
+
+    def __init__(self, opening_balance: int):
+        self.opening_balance = opening_balance  # paise
+        self.closing_balance = opening_balance
+        self.count = 0
+        self.first_timestamp = 0.0
+        self.timestamps = array("d")  # seconds since the epoch, non-decreasing
+        self.amounts = array("q")  # paise, negative for debits
+        self.types = array("b")  # index into TransactionHistory.TYPES
+        self.spill_path: Optional[str] = None  # set once the columns live on disk instead
+
+    def spill(self, path: str) -> None:
+        with open(path, "wb") as file:
+            for column in (self.timestamps, self.amounts, self.types):
+                column.tofile(file)
+        self.spill_path = path
+        self.timestamps = self.amounts = self.types = None
+
+    def columns(self) -> tuple[array, array, array]:
+        if self.spill_path is None:
+            return self.timestamps, self.amounts, self.types
+        timestamps, amounts, types = array("d"), array("q"), array("b")
+        with open(self.spill_path, "rb") as file:
+            for column in (timestamps, amounts, types):
+                column.fromfile(file, self.count)
+        return timestamps, amounts, types
+
+
+class TransactionHistory:
+    """
+    Append-only record of an account's postings (every withdraw and deposit) for statements
+
+    - Postings are kept column-wise (timestamps, amounts and types in arrays) in segments of SEGMENT_SIZE
+    - Only the newest HOT_SEGMENTS full segments stay in memory; older ones are spilled to disk and read back on demand
+    - Each segment starts with a running balance checkpoint, so the balance at any point needs one segment, not the whole history
+    - Time ranges are found by binary search over segment start times, then over the segment's timestamps
+    """
+
+    SEGMENT_SIZE = 4096
+    HOT_SEGMENTS = 4
+    TYPES = (PaymentType.DEBIT, PaymentType.CREDIT)
+
+    def __init__(self, opening_balance: float, spill_directory: Optional[str] = None):
+        self.lock = Lock()
+        self.opening_balance = self._to_paise(opening_balance)
+        self.segments: List[_Segment] = []
+        self.segment_starts: List[float] = []  # first timestamp per segment, for bisect
+        self.spill_directory = spill_directory
+        self.spilled_segments = 0
+
+    @staticmethod
+    def _to_paise(amount: float) -> int:
+        return round(amount * 100)
+
+    def record(self, amount: float, payment_type: PaymentType, timestamp: Optional[float] = None) -> None:
+        """Append a posting; `amount` is positive, `payment_type` gives its direction"""
+        paise = self._to_paise(amount)
+        if payment_type == PaymentType.DEBIT:
+            paise = -paise
+        timestamp = time.time() if timestamp is None else timestamp
+        with self.lock:
+            segment = self.segments[-1] if self.segments else None
+            if segment is None or segment.count == self.SEGMENT_SIZE:
+                segment = self._open_segment(segment.closing_balance if segment else self.opening_balance, timestamp)
+            # Keep timestamps sorted even if the clock steps back
+            timestamp = max(timestamp, segment.timestamps[-1]) if segment.count else timestamp
+            segment.timestamps.append(timestamp)
+            segment.amounts.append(paise)
+            segment.types.append(self.TYPES.index(payment_type))
+            segment.count += 1
+            segment.closing_balance += paise
+
+    def _open_segment(self, opening_balance: int, timestamp: float) -> _Segment:
+        if self.segments and self.segments[-1].count:
+            timestamp = max(timestamp, self.segments[-1].timestamps[-1])
+        segment = _Segment(opening_balance)
+        segment.first_timestamp = timestamp
+        self.segments.append(segment)
+        self.segment_starts.append(timestamp)
+        # The segment that just fell out of the hot set goes to disk
+        cold = len(self.segments) - self.HOT_SEGMENTS - 2
+        if cold >= 0 and self.segments[cold].spill_path is None:
+            self._spill(self.segments[cold], cold)
+        return segment
+
+    def _spill(self, segment: _Segment, index: int) -> None:
+        if self.spill_directory is None:
+            self.spill_directory = tempfile.mkdtemp(prefix="upi-history-")
+            # Spill files only matter while this history is alive
+            weakref.finalize(self, shutil.rmtree, self.spill_directory, True)
+        segment.spill(os.path.join(self.spill_directory, f"segment-{id(self):x}-{index}.bin"))
+        self.spilled_segments += 1
+
+    def _position(self, timestamp: float, after: bool) -> tuple[int, int]:
+        """(segment index, offset) of the first posting at or after `timestamp` (strictly after if `after`)"""
+        # Postings with equal timestamps can straddle a segment boundary, so start from the segment before
+        index = max(bisect_left(self.segment_starts, timestamp) - 1, 0)
+        while index < len(self.segments):
+            timestamps = self.segments[index].columns()[0]
+            offset = (bisect_right if after else bisect_left)(timestamps, timestamp)
+            if offset < self.segments[index].count:
+                return index, offset
+            index += 1
+        return len(self.segments), 0
+
+    def _balance_at_position(self, index: int, offset: int) -> int:
+        if index == len(self.segments):
+            return self.segments[-1].closing_balance if self.segments else self.opening_balance
+        segment = self.segments[index]
+        return segment.opening_balance + sum(segment.columns()[1][:offset])
+
+    def get_balance_at(self, moment: datetime) -> float:
+        """Balance after every posting up to and including `moment`"""
+        with self.lock:
+            return self._balance_at_position(*self._position(moment.timestamp(), after=True)) / 100
+
+    def get_statement(self, start: datetime, end: datetime) -> Dict[str, Any]:
+        """Postings in [start, end] with the running balance after each, plus opening and closing balances"""
+        with self.lock:
+            index, offset = self._position(start.timestamp(), after=False)
+            end_index, end_offset = self._position(end.timestamp(), after=True)
+            balance = self._balance_at_position(index, offset)
+            opening_balance = balance
+            entries = []
+            while (index, offset) < (end_index, end_offset):
+                timestamps, amounts, types = self.segments[index].columns()
+                stop = end_offset if index == end_index else self.segments[index].count
+                for position in range(offset, stop):
+                    balance += amounts[position]
+                    entries.append({"timestamp": datetime.fromtimestamp(timestamps[position]), "type": self.TYPES[types[position]], "amount": abs(amounts[position]) / 100, "balance": balance / 100})
+                index, offset = index + 1, 0
+        return {"opening_balance": opening_balance / 100, "closing_balance": balance / 100, "entries": entries}
+
+    def get_mini_statement(self, count: int = 10) -> List[Dict[str, Any]]:
+        """The newest `count` postings, newest first"""
+        entries = []
+        with self.lock:
+            for segment in reversed(self.segments):
+                timestamps, amounts, types = segment.columns()
+                balance = segment.closing_balance
+                for position in range(segment.count - 1, -1, -1):
+                    if len(entries) == count:
+                        return entries
+                    entries.append({"timestamp": datetime.fromtimestamp(timestamps[position]), "type": self.TYPES[types[position]], "amount": abs(amounts[position]) / 100, "balance": balance / 100})
+                    balance -= amounts[position]
+        return entries
+
+    def get_spilled_segment_count(self) -> int:
+        return self.spilled_segments
+
+    def __len__(self) -> int:
+        return sum(segment.count for segment in self.segments)
@@ -0,0 +1,73 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Optional
+from app.repositories.account_repository import AccountRepository
+
+
+class VPADirectory:
+    """
+    VPA -> account information, as NPCI needs it to route a payment
+
+    Backed by the AccountRepository VPA index, with a bounded LRU in front of it. Unknown VPAs are cached
+    too (negative caching), so repeated lookups of a mistyped VPA do not reach the repository. The repository
+    invalidates an entry whenever the account a VPA resolves to is added, changed or deleted
+    """
+
+    CACHE_SIZE = 100_000
+
+    _instance: Optional["VPADirectory"] = None
+    _lock = Lock()
+
+    def __new__(cls) -> "VPADirectory":
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self) -> None:
+        if hasattr(self, "_initialized"):
+            return
+        self.account_repository = AccountRepository.get_instance()
+        self.cache: "OrderedDict[str, Optional[Dict[str, Any]]]" = OrderedDict()  # least recently used first
+        self.cache_lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.account_repository.add_vpa_listener(self.invalidate)
+        self._initialized = True
+
+    @classmethod
+    def get_instance(cls) -> "VPADirectory":
+        return cls._instance or cls()
+
+    def resolve(self, vpa: str) -> Optional[Dict[str, Any]]:
+        """Account number, bank and holder for the VPA, or None if no account uses it"""
+        with self.cache_lock:
+            if vpa in self.cache:
+                self.hits += 1
+                self.cache.move_to_end(vpa)
+                return self.cache[vpa]
+            self.misses += 1
+            invalidations = self.invalidations
+
+        account = self.account_repository.get_account_by_vpa(vpa)
+        info = None
+        if account is not None:
+            info = {"account_number": account.get_account_number(), "bank": account.get_bank_name().lower(), "account_holder": account.get_user().get_name()}
+
+        with self.cache_lock:
+            if invalidations != self.invalidations:
+                return info  # the repository changed during the lookup; the result may already be stale
+            self.cache[vpa] = info
+            if len(self.cache) > self.CACHE_SIZE:
+                self.cache.popitem(last=False)
+        return info
+
+    def invalidate(self, vpa: str) -> None:
+        with self.cache_lock:
+            self.invalidations += 1
+            self.cache.pop(vpa, None)
+
+    def get_cache_stats(self) -> Dict[str, int]:
+        return {"size": len(self.cache), "capacity": self.CACHE_SIZE, "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,484 @@
+#!/usr/bin/env python3
+"""
+UPI Payment System Benchmarks
+
+Usage: python benchmark.py [fraud|ratelimit|vpa|settlement|stress|commands|history|chain|all]
+"""
+
+import os
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from app.chain.chain_factory import PaymentChainFactory
+from app.commands.base_command import Command
+from app.commands.command_invoker import CommandInvoker
+from app.models.account import Account
+from app.models.enums import AccountType, Currency, PaymentMethod, PaymentType
+from app.models.payment import Payment
+from app.models.npci_instance import NPCI
+from app.models.user import User
+from app.repositories.account_repository import AccountRepository
+from app.services.fraud_feature_store import FraudFeatureStore
+from app.services.payment_executor import ConcurrentPaymentExecutor
+from app.services.transaction_history import TransactionHistory
+from app.services.rate_limiter import RateLimiter, SlidingWindowCounter, TokenBucket
+from app.services.vpa_directory import VPADirectory
+
+
+class UPIBenchmark:
+    VPA_COUNT = 1_000_000
+    HEAVY_VPAS = 1_000
+    HEAVY_TRANSACTIONS = 2_000  # per heavy VPA over one day
+    CHECKS = 200_000
+    SCAN_CHECKS = 2_000
+    DAY = 24 * 60 * 60
+    RATE_LIMIT_KEYS = 100_000
+    RATE_LIMIT_CHECKS = 1_000_000
+    RATE_LIMITS = {"per_minute": 5, "per_hour": 50, "per_day": 200}
+    HOT_KEY_RATE = 20  # requests per second from one abusive VPA
+    ACCOUNT_COUNT = 1_000_000
+    BANKS = ("HDFC", "SBI", "ICICI")
+    LOOKUPS = 200_000
+    LINEAR_SCAN_LOOKUPS = 20
+    SETTLEMENT_CUSTOMERS = 10_000
+    SETTLEMENT_MERCHANTS = 20
+    SETTLEMENT_PAYMENTS = 50_000
+    SETTLEMENT_BATCH = 10_000  # payments per netting batch
+    STRESS_THREADS = 32
+    STRESS_ACCOUNTS = 200  # few accounts, so payments in opposite directions contend for the same locks
+    STRESS_PAYMENTS = 100_000
+    STRESS_DUPLICATE_RATE = 0.05  # retried transaction ids
+    STRESS_CREDIT_FAILURE_RATE = 0.01
+    COMMAND_BATCHES = 5
+    COMMAND_BATCH_SIZE = 10_000
+    COMMAND_FAILURE_RATE = 0.05  # attempts that fail and are retried
+    COMMAND_IO_SECONDS = 0.002  # simulated bank round trip per attempt
+    HISTORY_POSTINGS = 1_000_000  # one busy merchant account over a year
+    HISTORY_QUERIES = 200
+    CHAIN_ACCOUNTS = 1_000
+    CHAIN_PAYMENTS = 20_000
+    CHAIN_FRAUD_RATE = 0.05  # payments above the fraud limit, stopped at FraudHandler
+
+    @staticmethod
+    def main():
+        section = sys.argv[1] if len(sys.argv) > 1 else "all"
+
+        print("=" * 60)
+        print("UPI PAYMENT SYSTEM BENCHMARK")
+        print("=" * 60)
+
+        if section in ("fraud", "all"):
+            UPIBenchmark.benchmark_fraud_features()
+        if section in ("ratelimit", "all"):
+            UPIBenchmark.benchmark_rate_limiter()
+        if section in ("vpa", "all"):
+            UPIBenchmark.benchmark_vpa_resolution()
+        if section in ("settlement", "all"):
+            UPIBenchmark.benchmark_settlement()
+        if section in ("stress", "all"):
+            UPIBenchmark.benchmark_concurrent_payments()
+        if section in ("commands", "all"):
+            UPIBenchmark.benchmark_command_invoker()
+        if section in ("history", "all"):
+            UPIBenchmark.benchmark_transaction_history()
+        if section in ("chain", "all"):
+            UPIBenchmark.benchmark_payment_chain()
+
+    @staticmethod
+    def measure(name: str, samples: list, run) -> None:
+        latencies = []
+        for sample in samples:
+            start_time = time.perf_counter()
+            run(sample)
+            latencies.append((time.perf_counter() - start_time) * 1_000_000)
+        latencies.sort()
+        print(f"{name:<34} mean {statistics.mean(latencies):8.3f} us   p50 {statistics.median(latencies):8.3f} us   p99 {latencies[int(len(latencies) * 0.99) - 1]:8.3f} us")
+
+    @staticmethod
+    def scan_features(history: list, now: datetime) -> tuple:
+        """The per-payment work FraudCheckDecorator used to do: three passes over the VPA's history"""
+        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        daily_amount = sum(entry["amount"] for entry in history if entry["timestamp"] >= today_start)
+        hourly_count = sum(1 for entry in history if entry["timestamp"] >= now - timedelta(hours=1))
+        recent_count = sum(1 for entry in history if entry["timestamp"] >= now - timedelta(minutes=5))
+        return daily_amount, hourly_count, recent_count
+
+    @staticmethod
+    def benchmark_fraud_features():
+        """Feature store at VPA_COUNT VPAs: ingest, fraud-check reads, accuracy against a brute-force window and the old list scan"""
+        benchmark = UPIBenchmark
+        store = FraudFeatureStore.get_instance()
+        rng = random.Random(7)
+        start = int(time.time()) - benchmark.DAY
+        vpas = [f"user{index}@bank{index % 3}" for index in range(benchmark.VPA_COUNT)]
+
+        print(f"\n--- Fraud feature store ({benchmark.VPA_COUNT:,} VPAs, {benchmark.HEAVY_VPAS} heavy VPAs x {benchmark.HEAVY_TRANSACTIONS} payments) ---")
+        start_time = time.perf_counter()
+        for vpa in vpas:
+            store.record(vpa, rng.randint(1, 5_000), start + rng.randrange(benchmark.DAY))
+        elapsed = time.perf_counter() - start_time
+        print(f"Ingested one payment per VPA in {elapsed:.2f}s ({elapsed / len(vpas) * 1_000_000:.2f} us/record)")
+
+        # Heavy users pay through the day in time order, as the live system would see them
+        heavy = [f"merchant{index}@hdfc" for index in range(benchmark.HEAVY_VPAS)]
+        events: dict[str, list] = {vpa: [] for vpa in heavy}
+        for vpa in heavy:
+            for timestamp in sorted(start + rng.randrange(benchmark.DAY) for _ in range(benchmark.HEAVY_TRANSACTIONS)):
+                amount = rng.randint(1, 500)
+                events[vpa].append((timestamp, amount))
+        stream = sorted((timestamp, vpa, amount) for vpa in heavy for timestamp, amount in events[vpa])
+        start_time = time.perf_counter()
+        for timestamp, vpa, amount in stream:
+            store.record(vpa, amount, timestamp)
+        elapsed = time.perf_counter() - start_time
+        print(f"Ingested {len(stream):,} heavy-user payments in {elapsed:.2f}s ({elapsed / len(stream) * 1_000_000:.2f} us/record)")
+
+        memory = sum(column.buffer_info()[1] * column.itemsize for window in store.windows.values() for column in (window.heads, window.total_counts, window.total_amounts, window.counts, window.amounts))
+        print(f"Counter columns: {memory / 1024 / 1024:.0f} MiB ({memory / store.get_tracked_vpa_count():.0f} bytes/VPA)")
+
+        now = start + benchmark.DAY
+        samples = [rng.choice(heavy) if rng.random() < 0.5 else rng.choice(vpas) for _ in range(benchmark.CHECKS)]
+        benchmark.measure(
+            "fraud check (3 windows)",
+            samples,
+            lambda vpa: (
+                store.get_amount(vpa, FraudFeatureStore.ONE_DAY, now),
+                store.get_count(vpa, FraudFeatureStore.ONE_HOUR, now),
+                store.get_count(vpa, FraudFeatureStore.FIVE_MINUTES, now),
+            ),
+        )
+
+        # Reference: the old per-VPA list of dicts, kept complete so it answers the same question
+        now_datetime = datetime.fromtimestamp(now)
+        histories = {vpa: [{"timestamp": datetime.fromtimestamp(timestamp), "amount": amount} for timestamp, amount in events[vpa]] for vpa in heavy}
+        benchmark.measure("history scan (heavy VPA)", [rng.choice(heavy) for _ in range(benchmark.SCAN_CHECKS)], lambda vpa: benchmark.scan_features(histories[vpa], now_datetime))
+
+        # Accuracy: bucketed windows must agree with a brute-force count over the same bucket boundaries
+        mismatches = 0
+        for vpa in heavy:
+            for length, window in store.windows.items():
+                oldest_bucket = now // window.bucket_width - window.bucket_count + 1
+                expected = [amount for timestamp, amount in events[vpa] if timestamp // window.bucket_width >= oldest_bucket]
+                if store.get_count(vpa, length, now) != len(expected) or store.get_amount(vpa, length, now) != sum(expected):
+                    mismatches += 1
+        assert mismatches == 0, f"{mismatches} window totals disagree with the brute-force count"
+        print(f"Window totals match a brute-force count for all {len(heavy)} heavy VPAs")
+
+    @staticmethod
+    def benchmark_rate_limiter():
+        """Multi-tier checks per second for both algorithms, the old timestamp-list check and idle key eviction"""
+        benchmark = UPIBenchmark
+        rng = random.Random(7)
+        second = RateLimiter.NANOS_PER_SECOND
+        keys = [f"user{index}@bank{index % 3}" for index in range(benchmark.RATE_LIMIT_KEYS)]
+        # Simulated traffic over one hour: mostly random VPAs, a share from a few hot ones
+        traffic = sorted((rng.randrange(3600 * second), rng.choice(keys) if rng.random() < 0.9 else keys[rng.randrange(10)]) for _ in range(benchmark.RATE_LIMIT_CHECKS))
+
+        print(f"\n--- Rate limiter ({benchmark.RATE_LIMIT_CHECKS:,} checks over {benchmark.RATE_LIMIT_KEYS:,} VPAs, tiers {benchmark.RATE_LIMITS}) ---")
+        for algorithm in (SlidingWindowCounter, TokenBucket):
+            limiter = RateLimiter(benchmark.RATE_LIMITS, algorithm)
+            start_time = time.perf_counter()
+            allowed = sum(1 for now, key in traffic if limiter.try_acquire(key, now))
+            elapsed = time.perf_counter() - start_time
+            print(f"{algorithm.__name__:<24} {len(traffic) / elapsed:>12,.0f} checks/s   {elapsed / len(traffic) * 1_000_000:.2f} us/check   allowed {allowed:,}")
+
+        # Reference: the old per-minute list filter plus one-hour cleanup, for a VPA sending HOT_KEY_RATE requests/s
+        request_counts: dict = defaultdict(list)
+        start = datetime.now()
+        checks = 3600 * benchmark.HOT_KEY_RATE
+        start_time = time.perf_counter()
+        for index in range(checks):
+            now = start + timedelta(seconds=index / benchmark.HOT_KEY_RATE)
+            recent_requests = [request for request in request_counts["hot"] if now - request < timedelta(minutes=1)]
+            if len(recent_requests) < benchmark.RATE_LIMITS["per_minute"]:
+                request_counts["hot"].append(now)
+                cutoff = now - timedelta(hours=1)
+                request_counts["hot"] = [request for request in request_counts["hot"] if request > cutoff]
+        elapsed = time.perf_counter() - start_time
+        print(f"{'old list filter (hot VPA)':<24} {checks / elapsed:>12,.0f} checks/s   {elapsed / checks * 1_000_000:.2f} us/check")
+
+        limiter = RateLimiter(benchmark.RATE_LIMITS)
+        start_time = time.perf_counter()
+        for index in range(checks):
+            limiter.try_acquire("hot", index * second // benchmark.HOT_KEY_RATE)
+        elapsed = time.perf_counter() - start_time
+        print(f"{'RateLimiter (hot VPA)':<24} {checks / elapsed:>12,.0f} checks/s   {elapsed / checks * 1_000_000:.2f} us/check")
+
+        # Idle keys: everyone sends once, then a single VPA keeps going for two days
+        limiter = RateLimiter(benchmark.RATE_LIMITS)
+        for key in keys:
+            limiter.try_acquire(key, 0)
+        tracked = limiter.get_tracked_key_count()
+        limiter.try_acquire("late", 2 * benchmark.DAY * second)
+        print(f"Idle eviction: {tracked:,} keys tracked, {limiter.get_tracked_key_count()} after two idle days")
+
+    @staticmethod
+    def benchmark_vpa_resolution():
+        """VPA, user and bank lookups on ACCOUNT_COUNT accounts, the VPA directory cache and the linear scan it replaced"""
+        benchmark = UPIBenchmark
+        rng = random.Random(7)
+        repository = AccountRepository.get_instance()
+        directory = VPADirectory.get_instance()
+
+        print(f"\n--- VPA resolution ({benchmark.ACCOUNT_COUNT:,} accounts, directory cache {directory.CACHE_SIZE:,}) ---")
+        start_time = time.perf_counter()
+        users = [User(f"Customer {index}", f"9{index:09d}", f"customer{index}@example.com") for index in range(benchmark.ACCOUNT_COUNT // 2)]
+        accounts = [Account(f"ACC{index:010d}", AccountType.SAVINGS, 10000.0, users[index // 2], benchmark.BANKS[index % len(benchmark.BANKS)]) for index in range(benchmark.ACCOUNT_COUNT)]
+        for account in accounts:
+            repository.add_account(account)
+        print(f"Indexed {len(accounts):,} accounts in {time.perf_counter() - start_time:.2f}s")
+
+        vpas = [account.get_vpa() for account in rng.choices(accounts, k=benchmark.LOOKUPS)]
+        # A few popular merchants dominate real traffic; this is what the LRU is for
+        hot = [account.get_vpa() for account in accounts[: directory.CACHE_SIZE // 10]]
+        skewed = [rng.choice(hot) if rng.random() < 0.8 else vpa for vpa in vpas]
+        unknown = [f"Nobody {index % 100}@HDFC" for index in range(benchmark.LOOKUPS)]
+        for name, samples, lookup in [
+            ("get_account_by_vpa", vpas, repository.get_account_by_vpa),
+            ("directory resolve (uniform)", vpas, directory.resolve),
+            ("directory resolve (80% hot)", skewed, directory.resolve),
+            ("directory resolve (unknown VPA)", unknown, directory.resolve),
+        ]:
+            start_time = time.perf_counter()
+            for vpa in samples:
+                lookup(vpa)
+            elapsed = time.perf_counter() - start_time
+            print(f"{name:<38} {elapsed / len(samples) * 1_000_000:8.3f} us/lookup")
+        print(f"Directory cache: {directory.get_cache_stats()}")
+
+        user_ids = [rng.choice(users).get_id() for _ in range(benchmark.LOOKUPS)]
+        start_time = time.perf_counter()
+        for user_id in user_ids:
+            repository.get_all_account_for_a_user(user_id)
+        print(f"{'get_all_account_for_a_user':<38} {(time.perf_counter() - start_time) / len(user_ids) * 1_000_000:8.3f} us/lookup")
+
+        # Reference: the linear scan with the VPA rebuilt from the user's name on every comparison
+        start_time = time.perf_counter()
+        for vpa in vpas[: benchmark.LINEAR_SCAN_LOOKUPS]:
+            next((account for account in repository.accounts.values() if f"{account.get_user().get_name()}@{account.get_bank_name()}" == vpa), None)
+        elapsed = time.perf_counter() - start_time
+        print(f"{'linear scan (old get_account_by_vpa)':<38} {elapsed / benchmark.LINEAR_SCAN_LOOKUPS * 1_000_000:8.3f} us/lookup")
+
+    @staticmethod
+    def benchmark_settlement():
+        """Customer -> merchant payments through NPCI, real-time debit/credit calls against netted batch settlement"""
+        benchmark = UPIBenchmark
+        rng = random.Random(7)
+        repository = AccountRepository.get_instance()
+        npci = NPCI.get_instance()
+
+        customers = [Account(f"CUS{index:08d}", AccountType.SAVINGS, 1_000_000.0, User(f"Shopper {index}", "", ""), benchmark.BANKS[index % 3]) for index in range(benchmark.SETTLEMENT_CUSTOMERS)]
+        merchants = [Account(f"MER{index:08d}", AccountType.SAVINGS, 0.0, User(f"Merchant {index}", "", ""), benchmark.BANKS[index % 3]) for index in range(benchmark.SETTLEMENT_MERCHANTS)]
+        for account in customers + merchants:
+            repository.add_account(account)
+        payments = [(rng.choice(customers).get_vpa(), rng.choice(merchants).get_vpa(), float(rng.randint(10, 2_000))) for _ in range(benchmark.SETTLEMENT_PAYMENTS)]
+        total_before = sum(account.get_balance() for account in customers + merchants)
+
+        print(f"\n--- Settlement ({benchmark.SETTLEMENT_PAYMENTS:,} payments, {benchmark.SETTLEMENT_CUSTOMERS:,} customers -> {benchmark.SETTLEMENT_MERCHANTS} merchants) ---")
+        # NPCI narrates every call; keep the benchmark output readable
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            start_time = time.perf_counter()
+            realtime = sum(1 for payer, payee, amount in payments if npci.process_payment(payer, payee, amount, PaymentMethod.UPI_PUSH).success)
+            realtime_elapsed = time.perf_counter() - start_time
+
+            for merchant in merchants:
+                npci.enable_netted_settlement(merchant.get_vpa())
+            reports = []
+            start_time = time.perf_counter()
+            netted = 0
+            for index, (payer, payee, amount) in enumerate(payments, 1):
+                netted += npci.process_payment(payer, payee, amount, PaymentMethod.UPI_PUSH).success
+                if index % benchmark.SETTLEMENT_BATCH == 0:
+                    reports.append(npci.settle_netted_payments())
+            reports.append(npci.settle_netted_payments())
+            netted_elapsed = time.perf_counter() - start_time
+            for merchant in merchants:
+                npci.disable_netted_settlement(merchant.get_vpa())
+
+        reports = [report for report in reports if report]
+        postings = sum(report["postings"] for report in reports)
+        print(f"{'real-time (2 adapter calls each)':<34} {len(payments) / realtime_elapsed:>10,.0f} payments/s   {realtime:,} succeeded, {2 * realtime:,} adapter calls")
+        print(f"{'netted (incl. settlement)':<34} {len(payments) / netted_elapsed:>10,.0f} payments/s   {netted:,} succeeded, {len(reports)} batches, {postings:,} postings")
+        print(f"Last batch positions: {reports[-1]['bilateral_positions']}")
+
+        total_after = sum(account.get_balance() for account in customers + merchants)
+        failed = sum(len(report["failed_postings"]) for report in reports)
+        assert abs(total_before - total_after) < 0.01 and failed == 0, "Settlement lost money"
+        print(f"Money conserved across both modes (₹{total_before:,.2f}), {failed} failed postings")
+
+    @staticmethod
+    def benchmark_concurrent_payments():
+        """Many threads paying between a small set of accounts, with retries and failing credits"""
+        benchmark = UPIBenchmark
+        rng = random.Random(11)
+        repository = AccountRepository.get_instance()
+
+        class FlakyCreditExecutor(ConcurrentPaymentExecutor):
+            def _credit(self, account, amount):
+                if rng.random() < benchmark.STRESS_CREDIT_FAILURE_RATE:
+                    raise RuntimeError("Payee bank unavailable")
+                super()._credit(account, amount)
+
+        accounts = [Account(f"STR{index:07d}", AccountType.SAVINGS, 5_000.0, User(f"Stress {index}", "", ""), benchmark.BANKS[index % 3]) for index in range(benchmark.STRESS_ACCOUNTS)]
+        for account in accounts:
+            repository.add_account(account)
+        payments = []
+        for index in range(benchmark.STRESS_PAYMENTS):
+            payer, payee = rng.sample(accounts, 2)
+            payments.append((f"TXN{index:08d}", payer.get_vpa(), payee.get_vpa(), float(rng.randint(1, 500))))
+        retries = [payments[rng.randrange(len(payments))] for _ in range(int(benchmark.STRESS_PAYMENTS * benchmark.STRESS_DUPLICATE_RATE))]
+        workload = payments + retries
+        rng.shuffle(workload)
+        total_before = sum(account.get_balance() for account in accounts)
+
+        print(f"\n--- Concurrent payments ({benchmark.STRESS_THREADS} threads, {len(workload):,} requests, {benchmark.STRESS_ACCOUNTS} accounts) ---")
+        executor = FlakyCreditExecutor(max_workers=benchmark.STRESS_THREADS)
+        # Account observers narrate every balance change; keep the benchmark output readable
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            start_time = time.perf_counter()
+            futures = [executor.submit(*payment) for payment in workload]
+            responses = [future.result() for future in futures]
+            elapsed = time.perf_counter() - start_time
+        executor.shutdown()
+
+        statuses = defaultdict(int)
+        for transaction_id, *_ in payments:
+            statuses[executor.get_result(transaction_id).status] += 1
+        print(f"{'executor':<34} {len(workload) / elapsed:>10,.0f} requests/s   {dict(statuses)}")
+
+        total_after = sum(account.get_balance() for account in accounts)
+        negative = sum(1 for account in accounts if account.get_balance() < 0)
+        retried_consistently = all(response is executor.get_result(request[0]) for request, response in zip(workload, responses))
+        assert abs(total_before - total_after) < 0.01 and negative == 0, "Concurrent payments lost money"
+        assert retried_consistently, "A retried transaction id got a different result"
+        print(f"Money conserved (₹{total_before:,.2f}), {negative} negative balances, {len(retries):,} retries answered from the idempotency table")
+
+    @staticmethod
+    def benchmark_command_invoker():
+        """Batches of payment-like commands through CommandInvoker, with injected failures that get retried"""
+        benchmark = UPIBenchmark
+        rng = random.Random(13)
+
+        class FlakyPaymentCommand(Command):
+            def execute(self) -> bool:
+                time.sleep(benchmark.COMMAND_IO_SECONDS)  # waiting on the bank, as NPCI would
+                return rng.random() >= benchmark.COMMAND_FAILURE_RATE
+
+            def undo(self) -> bool:
+                return True
+
+        print(f"\n--- Command invoker ({benchmark.COMMAND_BATCHES} batches of {benchmark.COMMAND_BATCH_SIZE:,} commands, {benchmark.COMMAND_FAILURE_RATE:.0%} failed attempts) ---")
+        invoker = CommandInvoker()
+        latencies, batch_times = [], []
+        succeeded = retried = 0
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            for _ in range(benchmark.COMMAND_BATCHES):
+                saga_id = invoker.begin_saga()
+                commands = [FlakyPaymentCommand() for _ in range(benchmark.COMMAND_BATCH_SIZE)]
+                batch_start = time.perf_counter()
+                futures = []
+                for command in commands:
+                    submitted_at = time.perf_counter()
+                    future = invoker.submit_command(command, saga_id)
+                    future.add_done_callback(lambda _, submitted_at=submitted_at: latencies.append(time.perf_counter() - submitted_at))
+                    futures.append(future)
+                succeeded += sum(future.result() for future in futures)
+                batch_times.append(time.perf_counter() - batch_start)
+                retried += sum(1 for command in commands if command.retry_count)
+                invoker.rollback_saga(saga_id)
+        invoker.shutdown()
+
+        latencies.sort()
+        batch_times.sort()
+        total = benchmark.COMMAND_BATCHES * benchmark.COMMAND_BATCH_SIZE
+        print(f"{'command latency':<34} p50 {statistics.median(latencies) * 1000:8.1f} ms   p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:8.1f} ms")
+        print(f"{'batch of 10k':<34} p50 {statistics.median(batch_times):8.2f} s    max {batch_times[-1]:8.2f} s")
+        print(f"{succeeded:,}/{total:,} succeeded, {retried:,} needed a retry, every saga rolled back")
+        # The old invoker ran one command at a time and slept 1 s in the caller before each retry
+        sequential = benchmark.COMMAND_BATCH_SIZE * benchmark.COMMAND_IO_SECONDS * (1 + benchmark.COMMAND_FAILURE_RATE) + benchmark.COMMAND_BATCH_SIZE * benchmark.COMMAND_FAILURE_RATE
+        print(f"{'old sequential invoker (estimate)':<34} ~{sequential:,.0f} s per batch")
+
+    @staticmethod
+    def benchmark_transaction_history():
+        """Statements over a year of postings: columnar segments against scanning a list of every posting"""
+        benchmark = UPIBenchmark
+        rng = random.Random(17)
+        year_start = datetime(2025, 1, 1).timestamp()
+        step = 365 * benchmark.DAY / benchmark.HISTORY_POSTINGS
+        postings = [(year_start + index * step, float(rng.randint(1, 5_000)), PaymentType.CREDIT if rng.random() < 0.6 else PaymentType.DEBIT) for index in range(benchmark.HISTORY_POSTINGS)]
+
+        print(f"\n--- Transaction history ({benchmark.HISTORY_POSTINGS:,} postings over one year) ---")
+        history = TransactionHistory(0.0)
+        start_time = time.perf_counter()
+        for timestamp, amount, payment_type in postings:
+            history.record(amount, payment_type, timestamp)
+        elapsed = time.perf_counter() - start_time
+        hot = sum(segment.count for segment in history.segments if segment.spill_path is None)
+        print(f"{'record':<34} {elapsed / len(postings) * 1_000_000:8.3f} us/posting   {history.get_spilled_segment_count()} segments on disk, {hot:,} postings in memory")
+
+        days = [datetime.fromtimestamp(year_start + rng.randrange(364) * benchmark.DAY) for _ in range(benchmark.HISTORY_QUERIES)]
+        benchmark.measure("statement, one day", days, lambda day: history.get_statement(day, day + timedelta(days=1)))
+        benchmark.measure("balance at a moment", days, history.get_balance_at)
+        benchmark.measure("mini statement (10)", days[:50], lambda _: history.get_mini_statement(10))
+
+        # The old way: every posting kept in one list, filtered and summed from the start for each statement
+        signed = [(timestamp, amount if payment_type == PaymentType.CREDIT else -amount) for timestamp, amount, payment_type in postings]
+
+        def scan_statement(day):
+            start, end = day.timestamp(), (day + timedelta(days=1)).timestamp()
+            opening = sum(amount for timestamp, amount in signed if timestamp < start)
+            return opening, [entry for entry in signed if start <= entry[0] <= end]
+
+        benchmark.measure("list scan statement, one day", days[:20], scan_statement)
+
+    @staticmethod
+    def benchmark_payment_chain():
+        """Synthetic payments through the full handler chain, reporting the pipeline's per-stage metrics"""
+        benchmark = UPIBenchmark
+        rng = random.Random(19)
+        repository = AccountRepository.get_instance()
+        accounts = [Account(f"CHN{index:07d}", AccountType.SAVINGS, 10_000_000.0, User(f"Chain {index}", "", ""), benchmark.BANKS[index % 3]) for index in range(benchmark.CHAIN_ACCOUNTS)]
+        for account in accounts:
+            repository.add_account(account)
+
+        def synthetic_payments(count: int) -> list:
+            payments = []
+            for _ in range(count):
+                payer, payee = rng.sample(accounts, 2)
+                amount = float(rng.randint(50_001, 90_000) if rng.random() < benchmark.CHAIN_FRAUD_RATE else rng.randint(1, 5_000))
+                payment = Payment(PaymentType.DEBIT, rng.choice((PaymentMethod.UPI_PUSH, PaymentMethod.UPI_PULL)), amount, payer, payee, Currency.INR)
+                payment.expiry_timer.cancel()  # the harness drives payments faster than they expire
+                payments.append(payment)
+            return payments
+
+        print(f"\n--- Payment chain ({benchmark.CHAIN_PAYMENTS:,} synthetic payments, {benchmark.CHAIN_FRAUD_RATE:.0%} over the fraud limit) ---")
+        pipeline = PaymentChainFactory.create_full_chain()
+        chain_head = pipeline.get_handlers()[0]
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            payments = synthetic_payments(benchmark.CHAIN_PAYMENTS)
+            start_time = time.perf_counter()
+            statuses = defaultdict(int)
+            for payment in payments:
+                statuses[pipeline.handle(payment).status] += 1
+            pipeline_elapsed = time.perf_counter() - start_time
+
+            # Same handlers walked through their links, without instrumentation
+            payments = synthetic_payments(benchmark.CHAIN_PAYMENTS)
+            start_time = time.perf_counter()
+            for payment in payments:
+                chain_head.handle(payment)
+            linked_elapsed = time.perf_counter() - start_time
+
+        print(f"{'pipeline (instrumented)':<34} {benchmark.CHAIN_PAYMENTS / pipeline_elapsed:>10,.0f} payments/s   {dict(statuses)}")
+        print(f"{'linked handlers (no metrics)':<34} {benchmark.CHAIN_PAYMENTS / linked_elapsed:>10,.0f} payments/s")
+        print(f"{'stage':<26} {'calls':>8} {'failed':>7} {'mean us':>9} {'p50 us':>9} {'p99 us':>9}")
+        for name, stage in pipeline.get_metrics().items():
+            print(f"{name:<26} {stage['calls']:>8,} {stage['failures']:>7,} {stage['mean_us']:>9.2f} {stage['p50_us']:>9.2f} {stage['p99_us']:>9.2f}")
+
+
+if __name__ == "__main__":
+    UPIBenchmark.main()
@@ -8,9 +8,10 @@ from app.repositories.account_repository import AccountRepository
 from app.adapters.base_adapter import StandardizedResponse
 from app.commands.command_invoker import CommandInvoker
 from app.models.npci_instance import NPCI
-from typing import List, Optional, Dict
-from datetime import datetime, timedelta
-from collections import defaultdict
+from app.services.fraud_feature_store import FraudFeatureStore
+from app.services.rate_limiter import RateLimiter
+from typing import Any, List, Optional, Dict
+from datetime import datetime
 
 
 class NPCIProxy:
@@ -19,7 +20,9 @@ class NPCIProxy:
     def __init__(self, npci: NPCI):
         self._npci = npci
         self.fraud_threshold = 50000.0  # ₹50,000 threshold for fraud detection
+        self.rapid_transaction_count = 3  # payments within five minutes
         self.suspicious_transactions = []
+        self.feature_store = FraudFeatureStore.get_instance()
 
     def process_payment(self, payer_vpa: str, payee_vpa: str, amount: float, payment_method: PaymentMethod) -> StandardizedResponse:
         """Enhanced payment processing with fraud detection"""
@@ -47,7 +50,10 @@ class NPCIProxy:
 
         # Call actual NPCI
         print(f"🔄 NPCI Proxy: Forwarding to actual NPCI...")
-        return self._npci.process_payment(payer_vpa, payee_vpa, amount, payment_method)
+        response = self._npci.process_payment(payer_vpa, payee_vpa, amount, payment_method)
+        if response.success:
+            self.feature_store.record(payer_vpa, amount)
+        return response
 
     def _is_suspicious_transaction(self, payer_vpa: str, payee_vpa: str, amount: float) -> bool:
         """Check if transaction is suspicious"""
@@ -55,8 +61,7 @@ class NPCIProxy:
 
     def _is_rapid_transaction(self, payer_vpa: str) -> bool:
         """Check for rapid successive transactions"""
-        # Simple check - in real implementation, this would be more sophisticated
-        return False
+        return self.feature_store.get_count(payer_vpa, FraudFeatureStore.FIVE_MINUTES) >= self.rapid_transaction_count
 
     def get_suspicious_transactions(self) -> List[Dict]:
         """Get list of suspicious transactions"""
@@ -75,8 +80,8 @@ class UPIApp:
         self.npci_proxy = NPCIProxy(self.npci)
 
         # Rate limiting at application level
-        self.request_counts: Dict[str, List[datetime]] = defaultdict(list)
         self.rate_limits = {"per_minute": 5, "per_hour": 50}
+        self.rate_limiter = RateLimiter(self.rate_limits)
 
     def register_user(self, name: str, phone: str, email: str) -> str:
         user = User(name, phone, email)
@@ -94,13 +99,10 @@ class UPIApp:
     ) -> StandardizedResponse:
         print(f"📱 UPI App: User request to send ₹{amount} from {payer_vpa} to {payee_vpa}")
 
-        # Rate limiting check
-        if self._is_rate_limited(payer_vpa):
+        # Rate limiting check, recording the request when it is allowed
+        if not self.rate_limiter.try_acquire(payer_vpa):
             return StandardizedResponse(success=False, amount=amount, status="RATE_LIMITED")
 
-        # Record request
-        self._record_request(payer_vpa)
-
         # Process payment through proxy (User App → Proxy → NPCI → Bank)
         payer_account = self.account_repository.get_account_by_vpa(payer_vpa)
         payee_account = self.account_repository.get_account_by_vpa(payee_vpa)
@@ -122,6 +124,14 @@ class UPIApp:
         account = self.account_repository.get_account_by_vpa(vpa)
         return account.get_transaction_history()
 
+    def get_statement(self, vpa: str, start: datetime, end: datetime) -> Dict[str, Any]:
+        account = self.account_repository.get_account_by_vpa(vpa)
+        return account.get_statement(start, end)
+
+    def get_mini_statement(self, vpa: str, count: int = 10) -> List[Dict[str, Any]]:
+        account = self.account_repository.get_account_by_vpa(vpa)
+        return account.get_mini_statement(count)
+
     def get_user_info(self, user_id: str) -> Optional[dict]:
         user = self.user_repository.get_user(user_id)
         if not user:
@@ -140,21 +150,6 @@ class UPIApp:
             "user_name": account.get_user().get_name(),
         }
 
-    def _is_rate_limited(self, vpa: str) -> bool:
-        """Check if VPA exceeds rate limits"""
-        now = datetime.now()
-        recent_requests = [req for req in self.request_counts[vpa] if now - req < timedelta(minutes=1)]
-        return len(recent_requests) >= self.rate_limits["per_minute"]
-
-    def _record_request(self, vpa: str) -> None:
-        """Record request for rate limiting"""
-        now = datetime.now()
-        self.request_counts[vpa].append(now)
-
-        # Cleanup old requests
-        cutoff = now - timedelta(hours=1)
-        self.request_counts[vpa] = [req for req in self.request_counts[vpa] if req > cutoff]
-
     def get_suspicious_transactions(self) -> List[Dict]:
         """Get list of suspicious transactions detected by fraud detection proxy"""
         return self.npci_proxy.get_suspicious_transactions()
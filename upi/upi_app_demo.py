@@ -189,7 +189,7 @@ class RealisticUPIDemo:
         """Demo 11: Concurrent transactions with ThreadPoolExecutor"""
         print("\n⚡ DEMO 11: CONCURRENT TRANSACTIONS")
 
-        self.upi_app.request_counts.clear()
+        self.upi_app.rate_limiter.reset()
 
         arjun_id = self.upi_app.register_user("Arjun Singh", "9876543214", "arjun.singh@email.com")
         neha_id = self.upi_app.register_user("Neha Gupta", "9876543215", "neha.gupta@email.com")
@@ -199,17 +199,6 @@ class RealisticUPIDemo:
         neha_vpa = self.upi_app.create_account(neha_id, "SBI", "3344556677")
         vikram_vpa = self.upi_app.create_account(vikram_id, "ICICI", "4455667788")
 
-        from app.models.npci_instance import NPCI
-
-        npci = NPCI.get_instance()
-        npci.vpa_registry.update(
-            {
-                "Arjun Singh@HDFC": {"account_number": "2233445566", "bank": "hdfc", "account_holder": "Arjun Singh"},
-                "Neha Gupta@SBI": {"account_number": "3344556677", "bank": "sbi", "account_holder": "Neha Gupta"},
-                "Vikram Joshi@ICICI": {"account_number": "4455667788", "bank": "icici", "account_holder": "Vikram Joshi"},
-            }
-        )
-
         all_users = [
             ("Rahul", self.rahul_vpa),
             ("Priya", self.priya_vpa),
@@ -285,6 +274,31 @@ class RealisticUPIDemo:
             "execution_time": execution_time,
         }
 
+    def demo_netted_settlement(self):
+        """Demo 12: High-volume merchant paid through the NPCI netting ledger"""
+        print("\n🧾 DEMO 12: NETTED SETTLEMENT")
+
+        npci = NPCI.get_instance()
+        npci.enable_netted_settlement(self.kavya_vpa)
+        self.upi_app.rate_limiter.reset()
+
+        before = {vpa: self.upi_app.check_balance(vpa) for vpa in (self.rahul_vpa, self.priya_vpa, self.amit_vpa, self.kavya_vpa)}
+        responses = [
+            npci.process_payment(self.rahul_vpa, self.kavya_vpa, 120.0, PaymentMethod.UPI_PUSH),
+            npci.process_payment(self.priya_vpa, self.kavya_vpa, 80.0, PaymentMethod.UPI_PUSH),
+            npci.process_payment(self.amit_vpa, self.kavya_vpa, 45.0, PaymentMethod.UPI_PUSH),
+            npci.process_payment(self.rahul_vpa, self.kavya_vpa, 60.0, PaymentMethod.UPI_PUSH),
+        ]
+        print(f"Acknowledged by ledger: {[response.status for response in responses]}")
+        print(f"Balances unchanged until settlement: {all(self.upi_app.check_balance(vpa) == balance for vpa, balance in before.items())}")
+        print(f"Open bank positions: {npci.settlement_engine.get_open_positions()}")
+
+        report = npci.settle_netted_payments()
+        print(f"Settled {report['payments']} payments (₹{report['gross_amount']}) with {report['postings']} postings: {report['bilateral_positions']}")
+        print(f"Status of first payment: {npci.settlement_engine.get_payment_status(responses[0].transaction_id)}")
+        print(f"Kavya ₹{before[self.kavya_vpa]} → ₹{self.upi_app.check_balance(self.kavya_vpa)}")
+        npci.disable_netted_settlement(self.kavya_vpa)
+
     def run_complete_realistic_demo(self):
         """Run the complete realistic demo"""
         print("🏦 UPI PAYMENT SYSTEM DEMO")
@@ -301,6 +315,7 @@ class RealisticUPIDemo:
         self.demo_comprehensive_scenario()
         self.demo_npci_integration()
         self.demo_concurrent_transactions()
+        self.demo_netted_settlement()
 
         print("\n🎉 DEMO COMPLETED!")
         print("✅ All design patterns working with real money transfers")